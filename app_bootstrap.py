@@ -57,6 +57,10 @@ def shutdown_services() -> None:
 		from worker_pool import shutdown_worker_pool
 		shutdown_worker_pool()
 		
+		# Shutdown TilePool (Worker-Prozesse für das Speichern)
+		from tile_pool import shutdown_tile_pool
+		shutdown_tile_pool()
+		
 		# Shutdown Service Registry
 		registry = get_service_registry()
 		registry.clear()
@@ -4,13 +4,13 @@
 # OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
 ###
 
-from typing import Protocol, Any, Dict, List, Optional, Tuple
+from typing import Protocol, Any, Dict, List, MutableSequence, Optional, Tuple
 from PIL.Image import Image as PILImage
 
 # Type Aliases für bessere Lesbarkeit und Wiederverwendbarkeit
 
 # Effekt-Typen
-EffectConfig = Dict[str, bool | float]  # z.B. {'grayscale': True, 'sharpen_value': 2.5}
+# (EffectConfig ist ein unveränderlicher Dataclass in texture_engine.py)
 EffectOperations = Dict[str, bool | float]  # Alias für Effekt-Dictonaries
 
 # Farb-Typen
@@ -18,7 +18,7 @@ RGBAColor = Tuple[int, int, int, int]  # (Red, Green, Blue, Alpha)
 HexColor = str  # z.B. "#FFFFFF" oder "#FFFFFF80"
 
 # GIF/Texture-Daten
-GIFFrameList = List[PILImage]
+GIFFrameList = MutableSequence[PILImage]  # list oder frame_store.LazyGifFrames
 TextureData = PILImage
 
 # Konfigurationstypen
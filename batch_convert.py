@@ -0,0 +1,271 @@
+###
+# batch_convert.py
+# Headless batch conversion of GIF files to textures + notecards for OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Kommandozeilen-Modus ohne Tk-Fenster.
+
+Konvertiert ganze Verzeichnisse/Globs von GIFs parallel in Texturen
+(PNG/JPG/BMP) plus `<name>.notecard` – mit denselben Raster- und
+Effekt-Regeln wie die GUI (texture_engine).
+
+Beispiele:
+	python batch_convert.py gifs/ -o out/ --format PNG
+	python batch_convert.py "drop/**/*.gif" --recursive --width 1024 --height 1024 --jobs 8
+"""
+
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterator, List, Optional, Sequence
+import argparse
+import glob
+import os
+import sys
+import time
+from texture_engine import (
+	EffectConfig,
+	SheetSpec,
+	compose_sheet,
+	generate_lsl_notecard,
+	load_gif_frames,
+	parse_bg_color,
+	prepare_for_export,
+	scale_sheet,
+)
+from logging_config import get_logger
+
+if TYPE_CHECKING:
+	from tile_pool import TilePool
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("PNG", "JPG", "BMP")
+MOVEMENTS = ("SLIDE", "ROTATE", "SCALE")
+LSL_EFFECTS = ("LOOP", "SMOOTH", "REVERSE", "PING_PONG")
+
+@dataclass(frozen=True)
+class BatchJob:
+	"""Ein zu konvertierendes GIF mit allen Einstellungen (picklebar für Worker-Prozesse)."""
+	source: str
+	output_dir: Optional[str]
+	width: int
+	height: int
+	export_format: str
+	bg_rgba: tuple[int, int, int, int]
+	effects: EffectConfig
+	prefer_single_row_odd: bool = True
+	max_frames: Optional[int] = None
+
+	@property
+	def texture_path(self) -> str:
+		"""Zielpfad der Textur (Name des GIFs, ';' wie in der GUI ersetzt)"""
+		base = os.path.splitext(os.path.basename(self.source))[0].replace(";", "_")
+		directory = self.output_dir or os.path.dirname(os.path.abspath(self.source))
+		return os.path.join(directory, f"{base}.{self.export_format.lower()}")
+
+@dataclass
+class BatchResult:
+	"""Ergebnis eines BatchJobs inkl. Zeitmessung"""
+	source: str
+	texture_path: str = ""
+	frame_count: int = 0
+	tiles_x: int = 0
+	tiles_y: int = 0
+	size: tuple[int, int] = (0, 0)
+	seconds: float = 0.0
+	error: Optional[str] = None
+	timings: dict = field(default_factory=dict)
+
+def convert_gif(job: BatchJob, tile_pool: Optional["TilePool"] = None) -> BatchResult:
+	"""
+	Konvertiert ein GIF in eine Textur (läuft in einem Worker-Prozess).
+	Die Notecard schreibt der Hauptprozess, damit Worker ohne Tk-Module auskommen.
+
+	Args:
+		job: Zu konvertierendes GIF
+		tile_pool: Optionaler TilePool – die Kacheln werden dann auf dessen Prozesse verteilt
+	"""
+	started = time.perf_counter()
+	result = BatchResult(source=job.source, texture_path=job.texture_path)
+	try:
+		t0 = time.perf_counter()
+		frames = load_gif_frames(job.source, max_frames=job.max_frames)
+		if not frames:
+			raise ValueError("GIF enthält keine Frames")
+		t1 = time.perf_counter()
+		spec = SheetSpec.for_frames(frames, job.bg_rgba, prefer_single_row_odd=job.prefer_single_row_odd)
+		if tile_pool is not None:
+			sheet = tile_pool.compose(frames, spec, job.effects)
+		else:
+			sheet = compose_sheet(frames, spec, job.effects)
+		t2 = time.perf_counter()
+		sheet = scale_sheet(sheet, job.width, job.height)
+		t3 = time.perf_counter()
+		img, fmt = prepare_for_export(sheet, job.export_format)
+		os.makedirs(os.path.dirname(job.texture_path) or ".", exist_ok=True)
+		img.save(job.texture_path, format=fmt)
+		t4 = time.perf_counter()
+		result.frame_count = len(frames)
+		result.tiles_x, result.tiles_y = spec.tiles_x, spec.tiles_y
+		result.size = img.size
+		result.timings = {'decode': t1 - t0, 'compose': t2 - t1, 'resize': t3 - t2, 'encode': t4 - t3}
+	except Exception as e:
+		result.error = f"{type(e).__name__}: {e}"
+	result.seconds = time.perf_counter() - started
+	return result
+
+def collect_inputs(patterns: Sequence[str], recursive: bool = False) -> List[str]:
+	"""
+	Löst Dateien, Verzeichnisse und Glob-Muster zu einer sortierten GIF-Liste auf (ohne Duplikate).
+	"""
+	found: dict[str, None] = {}
+	for pattern in patterns:
+		if os.path.isdir(pattern):
+			sub = os.path.join(pattern, "**", "*") if recursive else os.path.join(pattern, "*")
+			candidates = glob.glob(sub, recursive=recursive)
+		elif glob.has_magic(pattern):
+			candidates = glob.glob(pattern, recursive=recursive)
+		else:
+			candidates = [pattern]
+		for path in sorted(candidates):
+			if path.lower().endswith('.gif') and os.path.isfile(path):
+				found.setdefault(os.path.normpath(path), None)
+	return list(found)
+
+def write_notecard(result: BatchResult, fps: float, effect_tokens: List[str], movement: str) -> str:
+	"""Schreibt `<texturname>.notecard` neben die Textur (gleicher Inhalt wie beim GUI-Export)."""
+	base = os.path.splitext(os.path.basename(result.texture_path))[0]
+	content = generate_lsl_notecard(base, result.tiles_x, result.tiles_y, fps, effect_tokens, movement)
+	notecard_file = os.path.join(os.path.dirname(result.texture_path), f"{base}.notecard")
+	with open(notecard_file, "w", encoding="utf-8") as f:
+		f.write(content)
+	return notecard_file
+
+def build_parser() -> argparse.ArgumentParser:
+	"""Argument-Parser; Defaults stammen aus der gespeicherten Konfiguration."""
+	from config_manager import get_config
+	config = get_config()
+	default_format = str(config.get('export_format')).upper()
+	if default_format not in EXPORT_FORMATS:
+		default_format = "PNG"
+
+	parser = argparse.ArgumentParser(
+		prog="batch_convert",
+		description="OSSL2Gif Batch: GIFs parallel in Texturen + Notecards umwandeln (ohne GUI).",
+	)
+	parser.add_argument("inputs", nargs="+", help="GIF-Dateien, Verzeichnisse oder Glob-Muster")
+	parser.add_argument("-o", "--output-dir", default=None, help="Zielverzeichnis (Standard: neben dem GIF)")
+	parser.add_argument("-r", "--recursive", action="store_true", help="Verzeichnisse/Globs rekursiv durchsuchen")
+	parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Anzahl Worker-Prozesse (Standard: alle Kerne)")
+	parser.add_argument("--width", type=int, default=config.get('width'), help="Texturbreite")
+	parser.add_argument("--height", type=int, default=config.get('height'), help="Texturhöhe")
+	parser.add_argument("--format", dest="export_format", type=str.upper, choices=EXPORT_FORMATS, default=default_format, help="Export-Format")
+	parser.add_argument("--bg-color", default=config.get('bg_color'), help="Hintergrundfarbe #RRGGBB oder #RRGGBBAA")
+	parser.add_argument("--fps", type=float, default=float(config.get('framerate')), help="Bildrate für die Notecard")
+	parser.add_argument("--max-frames", type=int, default=None, help="Maximale Anzahl Frames pro GIF")
+	parser.add_argument("--compact-odd", action="store_true", help="Ungerade Frame-Zahlen nicht einreihig anordnen")
+	parser.add_argument("--lsl-effects", default="LOOP", help=f"Notecard-Effekte, kommagetrennt ({', '.join(LSL_EFFECTS)})")
+	parser.add_argument("--movement", type=str.upper, choices=MOVEMENTS, default="SLIDE", help="Notecard-Bewegung")
+	# Textur-Effekte (gleiche Semantik wie die Textur-Einstellungen der GUI)
+	parser.add_argument("--grayscale", action="store_true", help="Graustufen")
+	parser.add_argument("--sharpen", type=float, default=None, metavar="FAKTOR", help="Schärfen mit Faktor")
+	parser.add_argument("--blur", type=float, default=None, metavar="RADIUS", help="Weichzeichnen mit Radius")
+	parser.add_argument("--transparency", type=float, default=None, metavar="WERT", help="Alpha mit Wert 0.0-1.0 skalieren")
+	parser.add_argument("--color-intensity", type=float, default=None, metavar="WERT", help="Farbintensität 0.0-1.0 (0.5 = unverändert)")
+	return parser
+
+def _effects_from_args(args: argparse.Namespace) -> EffectConfig:
+	defaults = EffectConfig()
+	return EffectConfig(
+		grayscale=args.grayscale,
+		sharpen=args.sharpen is not None,
+		sharpen_value=args.sharpen if args.sharpen is not None else defaults.sharpen_value,
+		blur=args.blur is not None,
+		blur_value=args.blur if args.blur is not None else defaults.blur_value,
+		transparency=args.transparency is not None,
+		transparency_value=args.transparency if args.transparency is not None else defaults.transparency_value,
+		colorintensity_active=args.color_intensity is not None,
+		colorintensity=args.color_intensity if args.color_intensity is not None else defaults.colorintensity,
+	)
+
+def run_jobs(jobs: Sequence[BatchJob], workers: int) -> Iterator[BatchResult]:
+	"""
+	Führt die Jobs aus und liefert Ergebnisse in Fertigstellungsreihenfolge.
+
+	Genug GIFs für alle Kerne: ein GIF pro Worker-Prozess. Weniger GIFs als
+	Kerne (z.B. ein einzelnes großes GIF): die GIFs nacheinander, deren Kacheln
+	aber verteilt über einen TilePool mit `workers` Prozessen.
+	"""
+	if len(jobs) < workers:
+		from tile_pool import TilePool
+		pool = TilePool(max_workers=workers)
+		try:
+			for job in jobs:
+				yield convert_gif(job, pool)
+		finally:
+			pool.shutdown()
+		return
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = [executor.submit(convert_gif, job) for job in jobs]
+		for future in as_completed(futures):
+			yield future.result()
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""
+	Einstiegspunkt des Batch-Modus.
+
+	Returns:
+		0 wenn alle Dateien konvertiert wurden, 1 bei Fehlern, 2 wenn keine Eingaben gefunden
+	"""
+	args = build_parser().parse_args(argv)
+	sources = collect_inputs(args.inputs, recursive=args.recursive)
+	if not sources:
+		print("Keine GIF-Dateien gefunden.", file=sys.stderr)
+		return 2
+
+	effect_tokens = [t.strip().upper() for t in args.lsl_effects.split(",") if t.strip().upper() in LSL_EFFECTS]
+	jobs = [
+		BatchJob(
+			source=src,
+			output_dir=args.output_dir,
+			width=args.width,
+			height=args.height,
+			export_format=args.export_format,
+			bg_rgba=parse_bg_color(args.bg_color),
+			effects=_effects_from_args(args),
+			prefer_single_row_odd=not args.compact_odd,
+			max_frames=args.max_frames,
+		)
+		for src in sources
+	]
+	workers = max(1, args.jobs)
+	if len(jobs) < workers:
+		print(f"{len(jobs)} GIF(s), {workers} Prozess(e) für die Kacheln")
+	else:
+		print(f"{len(jobs)} GIF(s), {workers} Worker-Prozess(e)")
+
+	started = time.perf_counter()
+	failures = 0
+	for done, result in enumerate(run_jobs(jobs, workers), start=1):
+		prefix = f"[{done}/{len(jobs)}] {os.path.basename(result.source)}"
+		if result.error is not None:
+			failures += 1
+			logger.error(f"Batch conversion failed for {result.source}: {result.error}")
+			print(f"{prefix}: FEHLER {result.error} ({result.seconds:.2f}s)", flush=True)
+			continue
+		write_notecard(result, args.fps, effect_tokens, args.movement)
+		print(
+			f"{prefix} -> {os.path.basename(result.texture_path)} "
+			f"({result.frame_count} Frames, {result.tiles_x}x{result.tiles_y}, "
+			f"{result.size[0]}x{result.size[1]}) {result.seconds:.2f}s",
+			flush=True,
+		)
+
+	elapsed = time.perf_counter() - started
+	print(f"Fertig: {len(jobs) - failures}/{len(jobs)} in {elapsed:.2f}s")
+	return 1 if failures else 0
+
+if __name__ == "__main__":
+	sys.exit(main())
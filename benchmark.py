@@ -0,0 +1,391 @@
+###
+# benchmark.py
+# Reproducible benchmark suite for sheet generation, effects and export in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Benchmark-Suite ohne Tk-Fenster.
+
+Erzeugt synthetische GIF-Frames (fester Seed, mit/ohne Alpha) und misst die
+Funktionen der GUI-Pipeline: `calculate_optimal_grid`, `apply_effects` pro
+Effekt-Kombination, GIF-Dekodierung, `create_smart_scaled_texture` (Vorschau
+und Speichern), Textur-Encoding wie in `save_texture` und den ZIP-Export.
+Jeder Fall läuft standardmäßig in einem eigenen Prozess, damit der gemeldete
+Spitzen-RSS zu genau diesem Fall gehört.
+
+Ergebnis ist maschinenlesbares JSON; mit `--baseline` werden Regressionen
+gegenüber einem früheren Lauf gemeldet (Exit-Code 1).
+
+Beispiele:
+	python benchmark.py --suite quick --json bench.json
+	python benchmark.py --suite full --repeat 5 --baseline bench_2.0.8.json --tolerance 0.15
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from io import BytesIO
+from typing import Any, Callable, Iterator, List, Optional, Sequence, cast
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import numpy as np
+from PIL import Image
+from app_types import ModernAppProtocol
+from texture_engine import EffectConfig, calculate_optimal_grid, load_gif_frames, parse_bg_color, prepare_for_export
+
+SCHEMA_VERSION = 1
+
+# Effekt-Kombinationen für apply_effects (Name → EffectConfig)
+EFFECT_COMBINATIONS = {
+	'identity': EffectConfig(),
+	'grayscale': EffectConfig(grayscale=True),
+	'sharpen': EffectConfig(sharpen=True),
+	'blur': EffectConfig(blur=True),
+	'transparency': EffectConfig(transparency=True),
+	'colorintensity': EffectConfig(colorintensity_active=True, colorintensity=0.8),
+	'pointwise': EffectConfig(grayscale=True, transparency=True, colorintensity_active=True, colorintensity=0.8),
+	'all': EffectConfig(grayscale=True, sharpen=True, blur=True, transparency=True, colorintensity_active=True, colorintensity=0.8),
+}
+
+# Suiten: Frame-Anzahlen und Kantenlängen (quadratische Frames)
+SUITES = {
+	'quick': {'frame_counts': (1, 16, 64), 'sizes': (64, 256), 'effect_sizes': (256,)},
+	'full': {'frame_counts': (1, 16, 64, 256), 'sizes': (64, 256, 1024, 2048), 'effect_sizes': (64, 512, 2048)},
+}
+
+@dataclass(frozen=True)
+class BenchCase:
+	"""Ein Messfall (picklebar für den Mess-Prozess)"""
+	name: str
+	frame_count: int = 1
+	size: int = 64
+	alpha: bool = False
+	variant: str = ""
+
+	@property
+	def case_id(self) -> str:
+		"""Stabiler Schlüssel für den Vergleich mit einer Baseline"""
+		parts = [self.name, f"n{self.frame_count}", f"{self.size}px", "rgba" if self.alpha else "rgb"]
+		if self.variant:
+			parts.append(self.variant)
+		return "/".join(parts)
+
+	@property
+	def input_bytes(self) -> int:
+		"""Speicherbedarf der RGBA-Eingangsframes"""
+		return self.frame_count * self.size * self.size * 4
+
+@dataclass
+class BenchResult:
+	"""Messergebnis eines Falls"""
+	case_id: str
+	name: str
+	params: dict
+	repeat: int
+	seconds_min: float
+	seconds_median: float
+	seconds_max: float
+	frames_per_second: float
+	megapixels_per_second: float
+	peak_rss_bytes: Optional[int]
+	extra: dict = field(default_factory=dict)
+
+def synthetic_frames(count: int, size: int, alpha: bool, seed: int = 0) -> list[Image.Image]:
+	"""
+	Reproduzierbare RGBA-Frames: Farbverlauf, Rauschen und ein wandernder Kreis.
+	Mit `alpha` ist der Hintergrund transparent und der Kreis hat einen weichen Rand.
+	"""
+	rng = np.random.default_rng(seed)
+	y, x = np.mgrid[0:size, 0:size].astype(np.float32) / max(1, size - 1)
+	frames = []
+	for i in range(count):
+		phase = i / max(1, count)
+		arr = np.empty((size, size, 4), dtype=np.uint8)
+		arr[..., 0] = (x * 255).astype(np.uint8)
+		arr[..., 1] = (y * 255).astype(np.uint8)
+		arr[..., 2] = rng.integers(0, 256, (size, size), dtype=np.uint8)
+		cx, cy = 0.5 + 0.3 * np.cos(2 * np.pi * phase), 0.5 + 0.3 * np.sin(2 * np.pi * phase)
+		dist = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+		if alpha:
+			arr[..., 3] = np.clip((0.25 - dist) * 1024, 0, 255).astype(np.uint8)
+		else:
+			arr[..., 3] = 255
+			arr[dist < 0.2, :3] = (255, 255, 255)
+		frames.append(Image.fromarray(arr, "RGBA"))
+	return frames
+
+def synthetic_gif(count: int, size: int, alpha: bool, seed: int = 0) -> bytes:
+	"""Die synthetischen Frames als GIF-Datei (Palette, Transparenz bei `alpha`)"""
+	frames = []
+	for frame in synthetic_frames(count, size, alpha, seed):
+		paletted = frame.convert("RGB").quantize(255)
+		if alpha:
+			palette = paletted.getpalette()
+			mask = np.asarray(frame)[..., 3] < 128
+			indices = np.asarray(paletted).copy()
+			indices[mask] = 255
+			paletted = Image.fromarray(indices, "P")
+			if palette is not None:
+				paletted.putpalette(palette)
+			paletted.info['transparency'] = 255
+		frames.append(paletted)
+	buffer = BytesIO()
+	frames[0].save(buffer, format="GIF", save_all=True, append_images=frames[1:], loop=0, duration=100, disposal=2)
+	return buffer.getvalue()
+
+class _Value:
+	"""Ersatz für eine Tk-Variable (nur get/set)"""
+
+	def __init__(self, value: Any):
+		self.value = value
+
+	def get(self) -> Any:
+		return self.value
+
+	def set(self, value: Any) -> None:
+		self.value = value
+
+class HeadlessApp:
+	"""Minimaler App-Zustand, mit dem die GUI-Funktionen ohne Tk laufen"""
+
+	def __init__(self, frames: Sequence[Image.Image], effects: EffectConfig = EffectConfig(), width: int = 2048, height: int = 2048):
+		self.gif_frames = list(frames)
+		self.width_var = _Value(width)
+		self.height_var = _Value(height)
+		self.bg_color = "#00000000"
+		self.odd_frames_single_row_var = _Value(True)
+		for prefix in ("gif", "texture"):
+			self.set_effects(prefix, effects)
+
+	def set_effects(self, prefix: str, effects: EffectConfig) -> None:
+		for f in fields(EffectConfig):
+			setattr(self, f"{prefix}_{f.name}", _Value(getattr(effects, f.name)))
+
+def peak_rss_bytes() -> Optional[int]:
+	"""Spitzen-RSS des aktuellen Prozesses (None, wenn die Plattform ihn nicht liefert)"""
+	try:
+		import resource
+	except ImportError:
+		return None
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	# Linux meldet KiB, macOS Bytes
+	return peak if sys.platform == "darwin" else peak * 1024
+
+def _prepare(case: BenchCase, workdir: str) -> Callable[[], Any]:
+	"""
+	Baut die Eingaben eines Falls und liefert die zu messende Funktion (Aufbau wird nicht gemessen).
+
+	Args:
+		case: Der Benchmark-Fall
+		workdir: Temporäres Verzeichnis für Eingabedateien (vom Aufrufer nach dem Messen gelöscht)
+	"""
+	from effect_cache import clear_effect_cache
+	if case.name == "calculate_optimal_grid":
+		return lambda: [calculate_optimal_grid(n, prefer_single_row_odd=odd) for n in range(1, case.frame_count + 1) for odd in (True, False)]
+	if case.name == "decode":
+		path = os.path.join(workdir, "decode.gif")
+		with open(path, "wb") as handle:
+			handle.write(synthetic_gif(case.frame_count, case.size, case.alpha))
+		return lambda: load_gif_frames(path)
+	frames = synthetic_frames(case.frame_count, case.size, case.alpha)
+	if case.name == "apply_effects":
+		from image_processing import apply_effects
+		app = HeadlessApp(frames, EFFECT_COMBINATIONS[case.variant])
+		return lambda: [apply_effects(app, frame, "texture") for frame in frames]
+	if case.name in ("sheet_preview", "sheet_save"):
+		from image_processing import create_smart_scaled_texture
+		bg_rgba = parse_bg_color("#00000000")
+		preview = case.name == "sheet_preview"
+
+		def compose() -> Image.Image:
+			# Jede Wiederholung ohne Cache-Treffer und mit frischem Compositor
+			clear_effect_cache()
+			app = cast(ModernAppProtocol, HeadlessApp(frames, EFFECT_COMBINATIONS['pointwise']))
+			return create_smart_scaled_texture(app, 2048, 2048, bg_rgba, preview_mode=preview, display_size=(512, 512) if preview else None)
+		return compose
+	if case.name == "encode":
+		from image_processing import create_smart_scaled_texture
+		clear_effect_cache()
+		sheet = create_smart_scaled_texture(cast(ModernAppProtocol, HeadlessApp(frames)), 2048, 2048, parse_bg_color("#00000000"), preview_mode=False)
+
+		def encode() -> int:
+			img, fmt = prepare_for_export(sheet, case.variant)
+			buffer = BytesIO()
+			img.save(buffer, format=fmt)
+			return buffer.tell()
+		return encode
+	if case.name == "zip_export":
+		from file_ops import write_frames_zip
+		effects = EFFECT_COMBINATIONS['pointwise']
+		return lambda: write_frames_zip(frames, (case.size, case.size), effects, BytesIO())
+	raise ValueError(f"Unknown benchmark: {case.name}")
+
+def run_case(case: BenchCase, repeat: int) -> BenchResult:
+	"""Misst einen Fall `repeat` Mal (nach einem Aufwärmlauf)"""
+	times = []
+	with tempfile.TemporaryDirectory(prefix="ossl2gif_bench_") as workdir:
+		func = _prepare(case, workdir)
+		func()  # Aufwärmen: Imports, LUTs, erste Allokationen
+		for _ in range(max(1, repeat)):
+			start = time.perf_counter()
+			func()
+			times.append(time.perf_counter() - start)
+	best = min(times)
+	pixels = case.frame_count * case.size * case.size
+	return BenchResult(
+		case_id=case.case_id,
+		name=case.name,
+		params={k: v for k, v in asdict(case).items() if k != 'name'},
+		repeat=len(times),
+		seconds_min=best,
+		seconds_median=statistics.median(times),
+		seconds_max=max(times),
+		frames_per_second=case.frame_count / best if best > 0 else 0.0,
+		megapixels_per_second=pixels / 1e6 / best if best > 0 else 0.0,
+		peak_rss_bytes=peak_rss_bytes(),
+	)
+
+def build_cases(suite: str, max_input_mb: int) -> tuple[list[BenchCase], list[BenchCase]]:
+	"""
+	Alle Fälle einer Suite.
+
+	Returns:
+		(auszuführende Fälle, wegen `max_input_mb` übersprungene Fälle)
+	"""
+	config = SUITES[suite]
+	cases: list[BenchCase] = [BenchCase("calculate_optimal_grid", frame_count=max(config['frame_counts']))]
+	for size in config['effect_sizes']:
+		for alpha in (False, True):
+			for variant in EFFECT_COMBINATIONS:
+				cases.append(BenchCase("apply_effects", 1, size, alpha, variant))
+	for count in config['frame_counts']:
+		for size in config['sizes']:
+			for alpha in (False, True):
+				cases.append(BenchCase("decode", count, size, alpha))
+				cases.append(BenchCase("sheet_preview", count, size, alpha))
+				cases.append(BenchCase("sheet_save", count, size, alpha))
+				cases.append(BenchCase("zip_export", count, size, alpha))
+				for fmt in ("PNG", "JPG"):
+					cases.append(BenchCase("encode", count, size, alpha, fmt))
+	limit = max_input_mb * 1024 * 1024
+	return [c for c in cases if c.input_bytes <= limit], [c for c in cases if c.input_bytes > limit]
+
+def run_cases(cases: Sequence[BenchCase], repeat: int, isolate: bool = True) -> Iterator[BenchResult]:
+	"""Führt die Fälle nacheinander aus – mit `isolate` jeden in einem frischen Prozess"""
+	context = multiprocessing.get_context("spawn")
+	for case in cases:
+		if not isolate:
+			yield run_case(case, repeat)
+			continue
+		with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+			yield executor.submit(run_case, case, repeat).result()
+
+def environment() -> dict[str, Any]:
+	"""Versionen und Rechner-Eckdaten für die Vergleichbarkeit der Läufe"""
+	import PIL
+	return {
+		'python': platform.python_version(),
+		'implementation': platform.python_implementation(),
+		'pillow': PIL.__version__,
+		'numpy': np.__version__,
+		'platform': platform.platform(),
+		'machine': platform.machine(),
+		'cpu_count': os.cpu_count(),
+	}
+
+def compare(results: Sequence[dict], baseline: dict, tolerance: float) -> list[str]:
+	"""
+	Vergleicht `seconds_min` pro case_id mit einer Baseline.
+
+	Returns:
+		Beschreibungen aller Fälle, die um mehr als `tolerance` (relativ) langsamer sind
+	"""
+	previous = {r['case_id']: r for r in baseline.get('results', [])}
+	regressions = []
+	for result in results:
+		old = previous.get(result['case_id'])
+		if old is None or old['seconds_min'] <= 0:
+			continue
+		ratio = result['seconds_min'] / old['seconds_min']
+		if ratio > 1.0 + tolerance:
+			regressions.append(f"{result['case_id']}: {old['seconds_min'] * 1000:.2f} ms -> {result['seconds_min'] * 1000:.2f} ms (+{(ratio - 1) * 100:.0f}%)")
+	return regressions
+
+def build_parser() -> argparse.ArgumentParser:
+	parser = argparse.ArgumentParser(
+		description="OSSL2Gif Benchmark-Suite (Raster, Effekte, Sheet-Aufbau, Export)",
+	)
+	parser.add_argument("--suite", choices=sorted(SUITES), default="quick", help="Umfang der Suite")
+	parser.add_argument("--repeat", type=int, default=3, help="Messungen pro Fall (nach einem Aufwärmlauf)")
+	parser.add_argument("--only", default=None, help="Nur Benchmarks mit diesen Namen, kommagetrennt")
+	parser.add_argument("--max-input-mb", type=int, default=1024, help="Fälle mit größeren Eingangsframes überspringen")
+	parser.add_argument("--in-process", action="store_true", help="Alle Fälle im selben Prozess (schneller, RSS nicht pro Fall)")
+	parser.add_argument("--json", dest="json_path", default=None, help="Ergebnis als JSON in diese Datei ('-' = stdout)")
+	parser.add_argument("--baseline", default=None, help="Früheres JSON-Ergebnis zum Vergleich")
+	parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte relative Verlangsamung gegenüber der Baseline")
+	return parser
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+	"""
+	Einstiegspunkt der Benchmark-Suite.
+
+	Returns:
+		0 ohne Regressionen, 1 wenn Fälle langsamer als die Baseline (+Toleranz) sind
+	"""
+	args = build_parser().parse_args(argv)
+	cases, skipped = build_cases(args.suite, args.max_input_mb)
+	if args.only:
+		names = {n.strip() for n in args.only.split(",") if n.strip()}
+		cases = [c for c in cases if c.name in names]
+		skipped = [c for c in skipped if c.name in names]
+	# Tabelle auf stderr, falls das JSON auf stdout geht
+	out = sys.stderr if args.json_path == "-" else sys.stdout
+	print(f"{len(cases)} Fälle ({args.suite}), {len(skipped)} übersprungen, {args.repeat} Wiederholungen", file=out)
+
+	results: List[dict] = []
+	for done, result in enumerate(run_cases(cases, args.repeat, isolate=not args.in_process), start=1):
+		results.append(asdict(result))
+		rss = f"{result.peak_rss_bytes / 1024 / 1024:.0f} MB" if result.peak_rss_bytes else "n/a"
+		print(
+			f"[{done}/{len(cases)}] {result.case_id}: {result.seconds_min * 1000:.2f} ms "
+			f"({result.megapixels_per_second:.1f} MP/s, {result.frames_per_second:.1f} Frames/s, RSS {rss})",
+			file=out, flush=True,
+		)
+
+	report = {
+		'schema': SCHEMA_VERSION,
+		'suite': args.suite,
+		'repeat': args.repeat,
+		'isolated': not args.in_process,
+		'created': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+		'environment': environment(),
+		'results': results,
+		'skipped': [c.case_id for c in skipped],
+	}
+	if args.json_path == "-":
+		json.dump(report, sys.stdout, indent=2)
+		print()
+	elif args.json_path:
+		with open(args.json_path, "w", encoding="utf-8") as f:
+			json.dump(report, f, indent=2)
+		print(f"JSON: {args.json_path}", file=out)
+
+	if args.baseline:
+		with open(args.baseline, encoding="utf-8") as f:
+			regressions = compare(results, json.load(f), args.tolerance)
+		for line in regressions:
+			print(f"REGRESSION {line}", file=out)
+		if regressions:
+			return 1
+		print("Keine Regressionen gegenüber der Baseline.", file=out)
+	return 0
+
+if __name__ == "__main__":
+	sys.exit(main())
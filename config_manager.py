@@ -81,6 +81,23 @@ class ConfigManager:
 		'checkerboard_size': (32, int, 8, 64),
 		'checkerboard_checker_size': (4, int, 2, 16),
 		
+		# Caches
+		'effect_cache_mb': (256, int, 16, 4096),  # Speicherbudget für bearbeitete Frames
+		'display_cache_mb': (64, int, 8, 2048),  # Speicherbudget für fertige Anzeigebilder der GIF-Vorschau
+		'decoded_frame_window': (32, int, 2, 1024),  # Max. gleichzeitig dekodierte GIF-Frames
+		'frame_prefetch': (8, int, 0, 64),  # Frames, die vor dem Abspielkopf vorgeladen werden
+		'memory_budget_mb': (2048, int, 128, 65536),  # Gesamtbudget für Frames, Caches und Texturen
+		'frame_spill_mb': (512, int, 0, 65536),  # GIFs ab dieser dekodierten Größe in eine Mapped-Datei auslagern (0 = immer)
+		'frame_spill_dir': ('', str, None, None),  # Verzeichnis der Auslagerungsdateien ('' = System-Temp)
+		'disk_cache_enabled': (True, bool, None, None),  # Dekodierte GIFs und fertige Sheets auf der Festplatte cachen
+		'disk_cache_dir': ('', str, None, None),  # Cache-Verzeichnis ('' = Plattform-Standard, z.B. ~/.cache/ossl2gif)
+		'disk_cache_mb': (2048, int, 64, 262144),  # Größenbudget des Festplatten-Caches (älteste Einträge werden gelöscht)
+		'tile_workers': (0, int, 0, 256),  # Prozesse für die Kacheln beim Speichern (0 = alle Kerne, 1 = im eigenen Prozess)
+		
+		# Performance-Tracing
+		'perf_tracing': (True, bool, None, None),  # Spans für das Profiler-Tab aufzeichnen
+		'perf_span_capacity': (2048, int, 64, 65536),  # Größe des Span-Ringpuffers
+		
 		# Sprache und Farbe
 		'language': ('de', str, None, None),
 		'lang': ('de', str, None, None),  # Alias für language
@@ -185,6 +202,10 @@ class ConfigManager:
 				data = json.load(f)
 			
 			for key, value in data.items():
+				if key not in self._values:
+					# Veraltete Einträge älterer Versionen (z.B. 'borderless') – kein Programmierfehler
+					logger.debug(f"Ignoring obsolete config key: {key}")
+					continue
 				self.set(key, value)
 			
 			logger.info(f"Configuration loaded from {self._config_file}")
@@ -0,0 +1,272 @@
+###
+# disk_cache.py
+# Content-addressed on-disk cache for decoded GIF frames and finished sheets in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Persistenter Cache auf der Festplatte.
+
+Einträge sind inhaltsadressiert: der Schlüssel ist ein Hash über den
+Dateiinhalt (bzw. die Frames) und die Einstellungen, nie über Pfad oder
+Zeitstempel. Gespeichert werden
+
+- dekodierte GIFs (`frames-…`): alle RGBA-Frames hintereinander mit fester
+  Schrittweite – dasselbe Format wie `MappedFrameFile`, ein Treffer wird
+  direkt gemappt statt dekodiert
+- fertige Sheets (`sheet-…`): rohes RGBA in Zielgröße
+
+Jeder Eintrag besteht aus `<key>.bin` (Daten) und `<key>.json` (Metadaten).
+Die JSON-Datei wird zuletzt geschrieben und markiert den Eintrag als
+vollständig; ihre Änderungszeit dient als LRU-Zeitstempel. Über dem
+Größenbudget (config 'disk_cache_mb') werden die ältesten Einträge gelöscht.
+"""
+
+from typing import Any, BinaryIO, Callable, Optional, Sequence
+from PIL import Image
+import hashlib
+import json
+import os
+import sys
+import threading
+import numpy as np
+from texture_engine import EffectConfig, SheetSpec
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Erhöhen, wenn sich Dekodierung oder Sheet-Aufbau ändern – alte Einträge werden dann nie mehr getroffen
+CACHE_FORMAT_VERSION = 1
+
+def default_cache_dir() -> str:
+	"""Plattformübliches Cache-Verzeichnis (LOCALAPPDATA, ~/Library/Caches, XDG_CACHE_HOME)"""
+	if sys.platform == "win32":
+		base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+		return os.path.join(base, "OSSL2Gif", "cache")
+	if sys.platform == "darwin":
+		return os.path.join(os.path.expanduser("~/Library/Caches"), "OSSL2Gif")
+	base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+	return os.path.join(base, "ossl2gif")
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+	"""SHA-256 des Dateiinhalts (hex)"""
+	digest = hashlib.sha256()
+	with open(path, "rb") as f:
+		for chunk in iter(lambda: f.read(chunk_size), b""):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+def frames_key(content_hash: str) -> str:
+	"""Schlüssel der dekodierten Frames einer Datei"""
+	return f"frames-{CACHE_FORMAT_VERSION}-{content_hash}"
+
+def frames_digest(frames: Sequence[Image.Image]) -> str:
+	"""
+	Hash über die Frame-Folge. Frames aus einer gehashten Datei zählen als
+	(Datei-Hash, Index) und werden dafür nicht dekodiert; alle anderen über ihre Pixel.
+	"""
+	digest = hashlib.sha256()
+	tokens = frames.tokens() if hasattr(frames, 'tokens') else list(frames)
+	for token in tokens:
+		img = token
+		if not isinstance(img, Image.Image):
+			# FrameRef (frame_store): aus einer gehashten Datei nur (Hash, Index), sonst die Pixel
+			content_hash = getattr(img.source, 'content_hash', None)
+			if content_hash is not None and img.image is None:
+				digest.update(f"{content_hash}:{img.index};".encode())
+				continue
+			img = img.load()
+		digest.update(f"{img.mode}:{img.width}x{img.height}:".encode())
+		digest.update(img.tobytes())
+	return digest.hexdigest()
+
+def sheet_key(frames_hash: str, spec: SheetSpec, effects: EffectConfig, target_size: tuple[int, int]) -> str:
+	"""Schlüssel eines fertigen Sheets: Frames + Raster/Hintergrund + normalisierte Effekte + Zielgröße"""
+	settings = repr((spec, effects.normalized(), tuple(target_size)))
+	digest = hashlib.sha256(f"{frames_hash}|{settings}".encode()).hexdigest()
+	return f"sheet-{CACHE_FORMAT_VERSION}-{digest}"
+
+class DiskCache:
+	"""
+	Inhaltsadressierter Blob-Cache mit Größenbudget (LRU über die Änderungszeit).
+
+	Nutzung:
+		cache = get_disk_cache()
+		hit = cache.lookup(key)             # (Pfad der Daten, Metadaten) oder None
+		cache.store(key, {'size': [w, h]}, lambda f: f.write(data))
+	"""
+
+	def __init__(self, directory: str, max_bytes: int):
+		"""
+		Args:
+			directory: Cache-Verzeichnis (wird bei Bedarf angelegt)
+			max_bytes: Maximale Gesamtgröße aller Einträge
+		"""
+		self.directory = directory
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+		os.makedirs(directory, exist_ok=True)
+
+	def _paths(self, key: str) -> tuple[str, str]:
+		base = os.path.join(self.directory, key)
+		return base + ".bin", base + ".json"
+
+	def lookup(self, key: str) -> Optional[tuple[str, dict[str, Any]]]:
+		"""Liefert (Datenpfad, Metadaten) eines vollständigen Eintrags und markiert ihn als benutzt."""
+		blob, meta_path = self._paths(key)
+		try:
+			with open(meta_path, "r", encoding="utf-8") as f:
+				meta = json.load(f)
+			if os.path.getsize(blob) != meta.get('nbytes'):
+				raise ValueError("size mismatch")
+			os.utime(meta_path)
+		except FileNotFoundError:
+			self.misses += 1
+			return None
+		except (OSError, ValueError) as e:
+			logger.warning(f"Dropping damaged disk cache entry {key}: {type(e).__name__}: {e}")
+			self._remove(key)
+			self.misses += 1
+			return None
+		self.hits += 1
+		return blob, meta
+
+	def store(self, key: str, meta: dict[str, Any], write: Callable[[BinaryIO], object]) -> Optional[str]:
+		"""
+		Schreibt einen Eintrag atomar (temporäre Datei + Umbenennen) und räumt danach auf.
+
+		Args:
+			meta: JSON-fähige Metadaten (Größe der Daten wird ergänzt)
+			write: Schreibt die Daten in die übergebene Binärdatei
+
+		Returns:
+			Pfad der Daten oder None bei Fehlern
+		"""
+		blob, meta_path = self._paths(key)
+		tmp = f"{blob}.{os.getpid()}.{threading.get_ident()}.tmp"
+		try:
+			with open(tmp, "wb") as f:
+				write(f)
+			nbytes = os.path.getsize(tmp)
+			if nbytes > self.max_bytes:
+				os.remove(tmp)
+				return None
+			os.replace(tmp, blob)
+			meta = dict(meta, nbytes=nbytes, version=CACHE_FORMAT_VERSION)
+			with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+				json.dump(meta, f)
+			os.replace(meta_path + ".tmp", meta_path)
+		except (OSError, ValueError) as e:
+			logger.warning(f"Could not write disk cache entry {key}: {type(e).__name__}: {e}")
+			for path in (tmp, meta_path + ".tmp"):
+				if os.path.exists(path):
+					try:
+						os.remove(path)
+					except OSError:
+						pass
+			return None
+		logger.debug(f"Disk cache stored {key} ({nbytes / 1048576:.1f} MB)")
+		self.evict()
+		return blob
+
+	def _entries(self) -> list[tuple[float, int, str]]:
+		"""(Zuletzt benutzt, Bytes, Schlüssel) aller vollständigen Einträge"""
+		entries = []
+		for name in os.listdir(self.directory):
+			if not name.endswith(".json"):
+				continue
+			key = name[:-5]
+			blob, meta_path = self._paths(key)
+			try:
+				entries.append((os.path.getmtime(meta_path), os.path.getsize(blob), key))
+			except OSError:
+				continue
+		return entries
+
+	def _remove(self, key: str) -> bool:
+		"""Löscht einen Eintrag (Metadaten zuerst). False, wenn die Daten noch gesperrt sind (Windows, gemappt)."""
+		removed = True
+		for path in reversed(self._paths(key)):
+			try:
+				os.remove(path)
+			except FileNotFoundError:
+				pass
+			except OSError as e:
+				logger.debug(f"Could not remove {path}: {type(e).__name__}: {e}")
+				removed = False
+		return removed
+
+	def evict(self) -> int:
+		"""Löscht die am längsten unbenutzten Einträge, bis das Budget eingehalten ist; liefert die freigegebenen Bytes"""
+		with self._lock:
+			entries = sorted(self._entries())
+			total = sum(nbytes for _, nbytes, _ in entries)
+			freed = 0
+			for _, nbytes, key in entries:
+				if total - freed <= self.max_bytes:
+					break
+				if self._remove(key):
+					freed += nbytes
+			if freed:
+				logger.info(f"Disk cache evicted {freed / 1048576:.1f} MB")
+			return freed
+
+	def clear(self) -> None:
+		"""Löscht alle Einträge"""
+		with self._lock:
+			for _, _, key in self._entries():
+				self._remove(key)
+
+	def stats(self) -> dict[str, Any]:
+		"""Zähler und Füllstand für Logging/Dashboard"""
+		entries = self._entries()
+		total = self.hits + self.misses
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'hit_rate': self.hits / total if total else 0.0,
+			'entries': len(entries),
+			'bytes': sum(nbytes for _, nbytes, _ in entries),
+			'max_bytes': self.max_bytes,
+			'directory': self.directory,
+		}
+
+def load_sheet(cache: DiskCache, key: str) -> Optional[Image.Image]:
+	"""Liest ein gecachtes Sheet (rohes RGBA) oder None"""
+	hit = cache.lookup(key)
+	if hit is None:
+		return None
+	blob, meta = hit
+	width, height = meta['size']
+	data = np.fromfile(blob, dtype=np.uint8)
+	if data.size != width * height * 4:
+		cache._remove(key)
+		return None
+	return Image.fromarray(data.reshape(height, width, 4), "RGBA")
+
+def store_sheet(cache: DiskCache, key: str, sheet: Image.Image) -> None:
+	"""Speichert ein fertiges Sheet als rohes RGBA"""
+	rgba = sheet if sheet.mode == "RGBA" else sheet.convert("RGBA")
+	cache.store(key, {'kind': 'sheet', 'size': list(rgba.size)}, lambda f: f.write(rgba.tobytes()))
+
+# Global singleton instance (False = per Konfiguration abgeschaltet)
+_disk_cache_instance: Any = None
+
+def get_disk_cache() -> Optional[DiskCache]:
+	"""Gibt den globalen DiskCache zurück (config 'disk_cache_enabled', 'disk_cache_dir', 'disk_cache_mb') oder None"""
+	global _disk_cache_instance
+	if _disk_cache_instance is None:
+		from config_manager import get_config
+		config = get_config()
+		_disk_cache_instance = False
+		if config.get('disk_cache_enabled'):
+			directory = config.get('disk_cache_dir') or default_cache_dir()
+			max_mb = int(config.get('disk_cache_mb'))
+			try:
+				_disk_cache_instance = DiskCache(directory, max_bytes=max_mb * 1024 * 1024)
+				logger.info(f"DiskCache initialized in {directory} with {max_mb} MB budget")
+			except OSError as e:
+				logger.warning(f"Disk cache disabled, cannot use {directory}: {type(e).__name__}: {e}")
+	return _disk_cache_instance or None
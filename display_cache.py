@@ -0,0 +1,136 @@
+###
+# display_cache.py
+# Byte-bounded cache of display-ready PhotoImages for the GIF preview in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Cache fertiger Anzeigebilder (PhotoImage) der GIF-Vorschau.
+
+Schlüssel: Frame-Identität (`frame_token`) + Variante (Anzeigegröße, normalisierte
+Effekte). Es gibt immer nur eine gültige Variante – ändert sich die Canvas-Größe
+oder ein Effekt, leert der nächste `get` den Cache. Verspätete `put`s einer
+veralteten Variante (z.B. Worker-Ergebnisse nach einer Größenänderung) werden
+nicht gespeichert und leeren den Cache nicht. Wiederholtes Abspielen zeigt dann nur
+noch gecachte Bilder an (kein Skalieren, keine Effekte, kein PhotoImage-Aufbau).
+
+Nur im Tk-Thread verwenden (PhotoImages sind an den Tcl-Interpreter gebunden).
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from PIL import Image
+import weakref
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+def _default_factory(img: Image.Image) -> Any:
+	from PIL import ImageTk
+	return ImageTk.PhotoImage(img)
+
+class DisplayCache:
+	"""
+	LRU-Cache für PhotoImages mit Byte-Budget.
+
+	Nutzung:
+		photo = cache.get(token, variant)
+		if photo is None:
+			photo = cache.put(token, variant, rendered_image)
+	"""
+
+	def __init__(self, max_bytes: int, factory: Callable[[Image.Image], Any] = _default_factory):
+		"""
+		Args:
+			max_bytes: Maximale Gesamtgröße aller Anzeigebilder (4 Bytes pro Pixel)
+			factory: Erzeugt das Anzeigeobjekt aus einem PIL-Image (Standard: ImageTk.PhotoImage)
+		"""
+		self.max_bytes = max_bytes
+		self.factory = factory
+		self.hits = 0
+		self.misses = 0
+		self.variant: Hashable = None
+		self._bytes = 0
+		# id(token) -> (weakref auf Token, PhotoImage, Bytes)
+		self._entries: "OrderedDict[int, tuple[weakref.ref, Any, int]]" = OrderedDict()
+
+	def _use_variant(self, variant: Hashable) -> None:
+		if variant != self.variant:
+			if self._entries:
+				logger.debug(f"Display cache invalidated ({len(self._entries)} entries)")
+			self.clear()
+			self.variant = variant
+
+	def get(self, token: Any, variant: Hashable) -> Optional[Any]:
+		"""Liefert das gecachte Anzeigebild oder None (andere Variante leert den Cache)."""
+		self._use_variant(variant)
+		entry = self._entries.get(id(token))
+		if entry is not None and entry[0]() is token:
+			self._entries.move_to_end(id(token))
+			self.hits += 1
+			return entry[1]
+		if entry is not None:
+			# id() wurde für ein neues Objekt wiederverwendet – veralteter Eintrag
+			self._drop(id(token))
+		self.misses += 1
+		return None
+
+	def contains(self, token: Any, variant: Hashable) -> bool:
+		"""True wenn für `token` in dieser Variante ein Anzeigebild vorliegt (zählt nicht)."""
+		if variant != self.variant:
+			return False
+		entry = self._entries.get(id(token))
+		return entry is not None and entry[0]() is token
+
+	def put(self, token: Any, variant: Hashable, img: Image.Image) -> Any:
+		"""
+		Erzeugt das Anzeigebild für `img`, speichert es und verdrängt bei Bedarf die ältesten.
+
+		Returns:
+			Das Anzeigebild (auch wenn es das Budget allein übersteigt oder zu einer
+			veralteten Variante gehört und deshalb nicht gespeichert wird)
+		"""
+		photo = self.factory(img)
+		if self.variant is None:
+			self.variant = variant
+		elif variant != self.variant:
+			# Verspätetes Ergebnis einer alten Variante: anzeigen lassen, aber nicht cachen
+			return photo
+		nbytes = img.width * img.height * 4
+		if nbytes > self.max_bytes:
+			return photo
+		if id(token) in self._entries:
+			self._drop(id(token))
+		self._entries[id(token)] = (weakref.ref(token), photo, nbytes)
+		self._bytes += nbytes
+		while self._bytes > self.max_bytes and self._entries:
+			self._drop(next(iter(self._entries)))
+		return photo
+
+	def _drop(self, key: int) -> None:
+		_, _, nbytes = self._entries.pop(key)
+		self._bytes -= nbytes
+
+	def nbytes(self) -> int:
+		"""Aktuell belegte Bytes (für den MemoryAccountant)"""
+		return self._bytes
+
+	def clear(self) -> None:
+		"""Verwirft alle Anzeigebilder (z.B. nach dem Laden eines neuen GIFs)"""
+		self._entries.clear()
+		self._bytes = 0
+
+	def stats(self) -> dict[str, Any]:
+		"""Zähler und Füllstand für Logging/Dashboard"""
+		total = self.hits + self.misses
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'hit_rate': self.hits / total if total else 0.0,
+			'entries': len(self._entries),
+			'bytes': self._bytes,
+			'max_bytes': self.max_bytes,
+		}
+
+	def __len__(self) -> int:
+		return len(self._entries)
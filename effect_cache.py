@@ -0,0 +1,158 @@
+###
+# effect_cache.py
+# Memory-bounded LRU cache for effect-processed frames in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+LRU-Cache für bearbeitete Frames.
+
+Schlüssel: Identität des Quell-Frames + normalisierte EffectConfig + optionale
+Variante (z.B. Vorschaugröße). Unveränderte Frames werden so nie erneut
+bearbeitet – auch nicht, wenn sich nur die Hintergrundfarbe ändert.
+
+Gecachte Bilder werden geteilt und dürfen vom Aufrufer nicht verändert werden.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from PIL import Image
+import threading
+import weakref
+from texture_engine import EffectConfig
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+def image_nbytes(img: Image.Image) -> int:
+	"""Ungefährer Speicherbedarf eines Bildes in Bytes"""
+	return img.width * img.height * len(img.getbands())
+
+class EffectCache:
+	"""
+	Thread-sicherer LRU-Cache mit Byte-Budget und Hit/Miss-Zählern.
+
+	Nutzung:
+		cache = get_effect_cache()
+		img = cache.get_or_compute(frame, effects, lambda: apply_effect_config(frame, effects))
+	"""
+
+	def __init__(self, max_bytes: int):
+		"""
+		Args:
+			max_bytes: Maximale Gesamtgröße aller gecachten Bilder
+		"""
+		self.max_bytes = max_bytes
+		self.hits = 0
+		self.misses = 0
+		self._bytes = 0
+		# key -> (weakref auf Quell-Frame, Ergebnis, Bytes)
+		self._entries: "OrderedDict[tuple, tuple[weakref.ref, Image.Image, int]]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def _key(frame: Image.Image, effects: EffectConfig, variant: Hashable) -> tuple:
+		# PIL-Images sind nicht hashbar – Identität über id(), abgesichert per weakref
+		return (id(frame), effects.normalized(), variant)
+
+	def get(self, frame: Image.Image, effects: EffectConfig, variant: Hashable = None) -> Optional[Image.Image]:
+		"""Liefert das gecachte Ergebnis oder None (zählt Hit/Miss)."""
+		key = self._key(frame, effects, variant)
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is not None and entry[0]() is frame:
+				self._entries.move_to_end(key)
+				self.hits += 1
+				return entry[1]
+			if entry is not None:
+				# id() wurde für ein neues Objekt wiederverwendet – veralteter Eintrag
+				self._drop(key)
+			self.misses += 1
+			return None
+
+	def put(self, frame: Image.Image, effects: EffectConfig, result: Image.Image, variant: Hashable = None) -> None:
+		"""Speichert ein Ergebnis und verdrängt bei Bedarf die ältesten Einträge."""
+		nbytes = image_nbytes(result)
+		if nbytes > self.max_bytes:
+			return
+		key = self._key(frame, effects, variant)
+		with self._lock:
+			if key in self._entries:
+				self._drop(key)
+			self._entries[key] = (weakref.ref(frame), result, nbytes)
+			self._bytes += nbytes
+			while self._bytes > self.max_bytes and self._entries:
+				oldest = next(iter(self._entries))
+				self._drop(oldest)
+
+	def get_or_compute(self, frame: Image.Image, effects: EffectConfig, compute: Callable[[], Image.Image], variant: Hashable = None) -> Image.Image:
+		"""Cache-Abfrage; bei Miss wird `compute()` (außerhalb des Locks) ausgeführt und gespeichert."""
+		cached = self.get(frame, effects, variant)
+		if cached is not None:
+			return cached
+		result = compute()
+		self.put(frame, effects, result, variant)
+		return result
+
+	def _drop(self, key: tuple) -> None:
+		"""Entfernt einen Eintrag (Lock muss gehalten werden)"""
+		_, _, nbytes = self._entries.pop(key)
+		self._bytes -= nbytes
+
+	def nbytes(self) -> int:
+		"""Aktuell belegte Bytes (für den MemoryAccountant)"""
+		return self._bytes
+
+	def shrink(self, nbytes: int) -> int:
+		"""Verdrängt die ältesten Einträge, bis mindestens `nbytes` frei sind; liefert die freigegebenen Bytes"""
+		freed = 0
+		with self._lock:
+			while freed < nbytes and self._entries:
+				oldest = next(iter(self._entries))
+				freed += self._entries[oldest][2]
+				self._drop(oldest)
+		return freed
+
+	def clear(self) -> None:
+		"""Leert den Cache (z.B. nach dem Laden eines neuen GIFs)"""
+		with self._lock:
+			self._entries.clear()
+			self._bytes = 0
+
+	def stats(self) -> dict[str, Any]:
+		"""Zähler und Füllstand für Logging/Dashboard"""
+		with self._lock:
+			total = self.hits + self.misses
+			return {
+				'hits': self.hits,
+				'misses': self.misses,
+				'hit_rate': self.hits / total if total else 0.0,
+				'entries': len(self._entries),
+				'bytes': self._bytes,
+				'max_bytes': self.max_bytes,
+			}
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+# Global singleton instance
+_cache_instance: Optional[EffectCache] = None
+
+def get_effect_cache() -> EffectCache:
+	"""Gibt die globale EffectCache-Instanz zurück (Größe aus config 'effect_cache_mb')"""
+	global _cache_instance
+	if _cache_instance is None:
+		from config_manager import get_config
+		max_mb = int(get_config().get('effect_cache_mb'))
+		_cache_instance = EffectCache(max_bytes=max_mb * 1024 * 1024)
+		logger.info(f"EffectCache initialized with {max_mb} MB budget")
+		# Bearbeitete Frames sind am billigsten wiederherzustellen – zuerst verdrängen
+		from memory_budget import get_memory_accountant
+		get_memory_accountant().register("effect_cache", _cache_instance.nbytes, _cache_instance.shrink, priority=10)
+	return _cache_instance
+
+def clear_effect_cache() -> None:
+	"""Leert den globalen Cache, falls vorhanden"""
+	if _cache_instance is not None:
+		logger.debug(f"Clearing effect cache: {_cache_instance.stats()}")
+		_cache_instance.clear()
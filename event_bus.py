@@ -4,9 +4,12 @@
 # OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
 ###
 
-from typing import Callable, Optional, Any, Dict, List
+from typing import Callable, Optional, Any, Deque, Dict, List, Tuple
+from collections import deque
 from enum import Enum
+from functools import partial
 import logging
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 
@@ -45,10 +48,23 @@ class Event:
 	source: str = "system"
 	timestamp: datetime = field(default_factory=datetime.now)
 
+# Führt einen parameterlosen Aufruf aus – sofort oder in einem anderen Thread
+# (z.B. UiDispatcher.call_soon für den Tk-Thread, ThreadPoolExecutor.submit)
+Executor = Callable[[Callable[[], Any]], Any]
+
+@dataclass(frozen=True)
+class _Subscription:
+	callback: Callable[[Event], None]
+	executor: Optional[Executor] = None
+
 class EventBus:
 	"""
 	Zentrale Event-Bus für Publish-Subscribe Kommunikation.
 	Ersetzt Queue-basierte Kommunikation durch flexibleres Event-System.
+
+	Thread-sicher: `publish` darf aus jedem Thread aufgerufen werden. Subscriber
+	ohne Executor laufen synchron im publizierenden Thread; mit Executor wird der
+	Aufruf dorthin weitergereicht (asynchron, z.B. in den Tk-Thread).
 	
 	Nutzung:
 		bus = EventBus()
@@ -57,6 +73,9 @@ class EventBus:
 		def on_texture_generated(event: Event):
 			print(f"Texture generated: {event.data}")
 		bus.subscribe(EventType.TEXTURE_GENERATED, on_texture_generated)
+
+		# Subscriber, der die GUI anfasst: im Tk-Thread ausführen
+		bus.subscribe(EventType.TEXTURE_GENERATED, on_texture_generated, executor=dispatcher.call_soon)
 		
 		# Event publishen
 		bus.publish(
@@ -66,29 +85,31 @@ class EventBus:
 		)
 	"""
 	
-	def __init__(self):
-		self._subscribers: Dict[str, List[Callable]] = {}
-		self._event_history: List[Event] = []
-		self._max_history = 100
+	def __init__(self, max_history: int = 100):
+		# Copy-on-write: Änderungen ersetzen das Tupel unter Lock, publish liest ohne Lock
+		self._subscribers: Dict[str, Tuple[_Subscription, ...]] = {}
+		self._event_history: Deque[Event] = deque(maxlen=max_history)
+		self._max_history = max_history
+		self._lock = threading.Lock()
 		logger.info("EventBus initialized")
 	
-	def subscribe(self, event_type: EventType | str, callback: Callable[[Event], None]) -> Callable[[], None]:
+	def subscribe(self, event_type: EventType | str, callback: Callable[[Event], None], executor: Optional[Executor] = None) -> Callable[[], None]:
 		"""
 		Subscribtet einen Callback für einen Event-Typ.
 		
 		Args:
 			event_type: Zu überwachender Event-Typ
 			callback: Funktion, die bei Event aufgerufen wird
+			executor: Optional – führt den Aufruf aus (asynchron, z.B. im Tk-Thread);
+				None = synchron im publizierenden Thread
 		
 		Returns:
 			Unsubscribe-Funktion
 		"""
 		event_key = str(event_type)
 		
-		if event_key not in self._subscribers:
-			self._subscribers[event_key] = []
-		
-		self._subscribers[event_key].append(callback)
+		with self._lock:
+			self._subscribers[event_key] = self._subscribers.get(event_key, ()) + (_Subscription(callback, executor),)
 		logger.debug(f"Subscribed to {event_key}")
 		
 		# Convenience: Return unsubscribe function
@@ -106,15 +127,14 @@ class EventBus:
 		"""
 		event_key = str(event_type)
 		
-		if event_key not in self._subscribers:
-			return False
-		
-		try:
-			self._subscribers[event_key].remove(callback)
-			logger.debug(f"Unsubscribed from {event_key}")
-			return True
-		except ValueError:
-			return False
+		with self._lock:
+			subscriptions = self._subscribers.get(event_key, ())
+			for index, subscription in enumerate(subscriptions):
+				if subscription.callback == callback:
+					self._subscribers[event_key] = subscriptions[:index] + subscriptions[index + 1:]
+					logger.debug(f"Unsubscribed from {event_key}")
+					return True
+		return False
 	
 	def publish(
 		self,
@@ -123,7 +143,7 @@ class EventBus:
 		source: str = "system"
 	) -> None:
 		"""
-		Publishet einen Event an alle Subscriber.
+		Publishet einen Event an alle Subscriber (Thread-sicher).
 		
 		Args:
 			event_type: Event-Typ
@@ -139,19 +159,25 @@ class EventBus:
 		
 		# Log event
 		logger.debug(f"Publishing event {event_key} from {source}")
+		# deque.append ist atomar; maxlen verwirft die ältesten Einträge
 		self._event_history.append(event)
 		
-		# Trim history
-		if len(self._event_history) > self._max_history:
-			self._event_history = self._event_history[-self._max_history:]
-		
-		# Call subscribers
-		if event_key in self._subscribers:
-			for callback in self._subscribers[event_key]:
-				try:
-					callback(event)
-				except Exception as e:
-					logger.error(f"Error in event subscriber: {type(e).__name__}: {e}", exc_info=False)
+		# Call subscribers (Snapshot: Subscribe/Unsubscribe während des Aufrufs wirken erst beim nächsten Event)
+		for subscription in self._subscribers.get(event_key, ()):
+			if subscription.executor is None:
+				self._invoke(subscription.callback, event)
+				continue
+			try:
+				subscription.executor(partial(self._invoke, subscription.callback, event))
+			except Exception as e:
+				logger.error(f"Could not dispatch event {event_key}: {type(e).__name__}: {e}", exc_info=False)
+
+	@staticmethod
+	def _invoke(callback: Callable[[Event], None], event: Event) -> None:
+		try:
+			callback(event)
+		except Exception as e:
+			logger.error(f"Error in event subscriber: {type(e).__name__}: {e}", exc_info=False)
 	
 	def get_history(self, event_type: Optional[EventType | str] = None, limit: int = 10) -> List[Event]:
 		"""
@@ -164,7 +190,7 @@ class EventBus:
 		Returns:
 			Liste von Events
 		"""
-		history = self._event_history[-limit:]
+		history = list(self._event_history)[-limit:]
 		
 		if event_type:
 			event_key = str(event_type)
@@ -178,15 +204,16 @@ class EventBus:
 	
 	def get_subscriber_count(self, event_type: Optional[EventType | str] = None) -> int:
 		"""Gibt Anzahl der Subscriber zurück"""
+		subscribers = self._subscribers
 		if event_type:
 			event_key = str(event_type)
-			return len(self._subscribers.get(event_key, []))
+			return len(subscribers.get(event_key, ()))
 		else:
-			return sum(len(subs) for subs in self._subscribers.values())
+			return sum(len(subs) for subs in list(subscribers.values()))
 	
 	def list_subscriptions(self) -> Dict[str, int]:
 		"""Gibt Übersicht aller Subscriptions aus"""
-		return {key: len(subs) for key, subs in self._subscribers.items() if subs}
+		return {key: len(subs) for key, subs in list(self._subscribers.items()) if subs}
 
 # Global singleton instance
 _event_bus_instance: Optional[EventBus] = None
@@ -5,14 +5,19 @@
 ###
 from tkinter import messagebox, colorchooser, ttk
 import tkinter as tk
-from PIL import Image
 from translations import tr
 from image_processing import show_gif_frame
 from logging_config import get_logger
-import threading
+from threading_utils import ChangeCoalescer
+from effect_cache import image_nbytes
+from memory_budget import format_usage, get_memory_accountant
+from worker_pool import TaskPriority, get_worker_pool
 
 logger = get_logger(__name__)
 
+# Aktualisierungsintervall der Speicheranzeige in der Statusleiste
+MEMORY_STATUS_MS = 1000
+
 def _clamp_int(value, min_value, max_value, default_value):
 	try:
 		parsed = int(round(float(value)))
@@ -20,27 +25,96 @@ def _clamp_int(value, min_value, max_value, default_value):
 		parsed = default_value
 	return max(min_value, min(max_value, parsed))
 
-def _cancel_background_preview_update(self):
-	after_id = getattr(self, '_bg_preview_after_id', None)
-	if after_id and hasattr(self, 'root') and self.root is not None:
+def _get_change_coalescer(self):
+	"""
+	Gibt den ChangeCoalescer der App zurück (wird beim ersten Aufruf im Tk-Thread angelegt).
+	Ziele: "gif" (GIF-Vorschau) und "texture" (Textur-Vorschau).
+	"""
+	coalescer = getattr(self, '_change_coalescer', None)
+	if coalescer is None:
+		coalescer = ChangeCoalescer(self.root)
+		coalescer.register("gif", lambda: show_gif_frame(self) if self.gif_frames else None)
+		coalescer.register("texture", lambda: self.show_texture())
+		self._change_coalescer = coalescer
+	return coalescer
+
+def _frames_memory_bytes(self):
+	"""Bytes der GIF-Frames, die nur im Speicher liegen (Dateiframes meldet ihr Frame-Store selbst)"""
+	frames = getattr(self, 'gif_frames', None) or []
+	memory_bytes = getattr(frames, 'memory_bytes', None)
+	if memory_bytes is not None:
+		return memory_bytes()
+	return sum(image_nbytes(frame) for frame in list(frames))
+
+def _texture_memory_bytes(self):
+	"""Bytes von texture_image und texture_source_image (ein gemeinsames Bild zählt einmal)"""
+	images = {id(img): img for img in (getattr(self, 'texture_image', None), getattr(self, 'texture_source_image', None)) if img is not None}
+	return sum(image_nbytes(img) for img in images.values())
+
+def _preview_memory_bytes(self):
+	"""Bytes der aktuell angezeigten Vorschau-PhotoImages (4 Bytes pro Pixel, nur im Tk-Thread)"""
+	total = 0
+	for photo in (getattr(self, '_gif_img_ref', None), getattr(self, '_texture_img_ref', None)):
+		if photo is None:
+			continue
 		try:
-			self.root.after_cancel(after_id)
+			total += photo.width() * photo.height() * 4
 		except Exception:
 			pass
-	self._bg_preview_after_id = None
+	return total
 
-def _schedule_background_preview_update(self, delay_ms=90):
-	if not hasattr(self, 'root') or self.root is None:
-		update_previews(self)
+def start_memory_status(self):
+	"""
+	Meldet Frames, Texturen und Vorschaubilder der App beim MemoryAccountant an und
+	zeigt die Belegung in der Statusleiste (Tooltip: Aufteilung pro Subsystem).
+	Messen und Durchsetzen des Budgets laufen als Hintergrund-Task; die Statusleiste
+	zeigt nur die zuletzt gemessenen Werte.
+	"""
+	if getattr(self, '_memory_status_started', False):
 		return
+	self._memory_status_started = True
+	self._preview_bytes = 0
+	accountant = get_memory_accountant()
+	accountant.register("frames", lambda: _frames_memory_bytes(self))
+	accountant.register("texture", lambda: _texture_memory_bytes(self))
+	# PhotoImages nur im Tk-Thread abfragen – der Worker liest den zuletzt gemessenen Wert
+	accountant.register("preview", lambda: self._preview_bytes)
+	_refresh_memory_status(self)
 
-	_cancel_background_preview_update(self)
+def _enforce_memory_budget():
+	"""Hintergrund-Task: Budget durchsetzen und Füllstand für die Statusleiste messen"""
+	accountant = get_memory_accountant()
+	accountant.ensure()
+	accountant.stats()
 
-	def _run():
-		self._bg_preview_after_id = None
-		update_previews(self)
+def _refresh_memory_status(self):
+	accountant = get_memory_accountant()
+	try:
+		# Probes und Freigaben warten auf Frame-Locks (laufendes Dekodieren) – nie im Tk-Thread
+		self._preview_bytes = _preview_memory_bytes(self)
+		get_worker_pool().submit("memory_budget", _enforce_memory_budget, priority=TaskPriority.BACKGROUND, replace=False)
+		stats = accountant.last_stats
+		if stats is not None and getattr(self, 'memory_label', None) is not None:
+			label, details = format_usage(stats)
+			self.memory_label.config(text=label)
+			tooltip = getattr(self, 'tooltips', {}).get('memory_label')
+			if tooltip is not None:
+				tooltip.text = details
+	except Exception as e:
+		logger.debug(f"Memory status update failed: {type(e).__name__}: {e}")
+	if getattr(self, 'root', None) is not None:
+		self.root.after(MEMORY_STATUS_MS, lambda: _refresh_memory_status(self))
 
-	self._bg_preview_after_id = self.root.after(delay_ms, _run)
+def _cancel_background_preview_update(self):
+	coalescer = getattr(self, '_change_coalescer', None)
+	if coalescer is not None:
+		coalescer.discard("gif", "texture")
+
+def _schedule_background_preview_update(self):
+	if not hasattr(self, 'root') or self.root is None:
+		update_previews(self)
+		return
+	_get_change_coalescer(self).mark("gif", "texture")
 
 def _apply_background_state(self, color_hex=None, transparency_percent=None, refresh_previews=True, sync_slider=False):
 	"""Zentralisiert Hintergrundfarbe + Transparenz (0-100%, 100 = voll transparent)."""
@@ -120,13 +194,8 @@ def reset_settings(self):
 	if self.gif_image and hasattr(self.gif_image, 'filename'):
 		file = self.gif_image.filename
 		try:
-			self.gif_image = Image.open(file)
-			self.gif_frames = []
-			while True:
-				self.gif_frames.append(self.gif_image.copy())
-				self.gif_image.seek(len(self.gif_frames))
-		except EOFError:
-			pass  # Normal: End of GIF reached
+			# Gleicher (lazy) Ladeweg wie beim Öffnen einer Datei
+			self._load_gif_frames(file)
 		except Exception as e:
 			logger.warning(f"Error reloading GIF during reset: {type(e).__name__}: {e}", exc_info=False)
 			self.gif_frames = []
@@ -184,45 +253,44 @@ def set_transparent_bg(self):
 	_apply_background_state(self, color_hex="#000000", transparency_percent=100, refresh_previews=True, sync_slider=True)
 
 def add_selected_frame_to_texture(self):
-	import threading
-	def do_add():
-		idx = self.frame_select_var.get()
-		if not self.gif_frames or idx < 0 or idx >= len(self.gif_frames):
-			messagebox.showerror("Fehler", "Ungültige Bildnummer.")
-			return
-		max_frames = self.maxframes_var.get()
-		if len(self.gif_frames) >= max_frames:
-			messagebox.showerror("Fehler", f"Maximale Bildanzahl ({max_frames}) erreicht.")
-			return
-		frame = self.gif_frames[idx].copy()
-		self.gif_frames.append(frame)
-		self.frame_count = len(self.gif_frames)
-		value = self.frame_select_var.get()
-		self.frame_select_spin.config(to=max(0, self.frame_count-1))
-		self.frame_select_var.set(value)
-		self.status.config(text=f"Bild {idx} hinzugefügt. Gesamt: {self.frame_count}")
-		update_previews(self)
-	threading.Thread(target=do_add).start()
+	"""
+	Hängt das gewählte Bild an (im Tk-Thread). Den Neuaufbau der Vorschauen
+	übernimmt der ChangeCoalescer über den WorkerPool.
+	"""
+	idx = self.frame_select_var.get()
+	if not self.gif_frames or idx < 0 or idx >= len(self.gif_frames):
+		messagebox.showerror("Fehler", "Ungültige Bildnummer.")
+		return
+	max_frames = self.maxframes_var.get()
+	if len(self.gif_frames) >= max_frames:
+		messagebox.showerror("Fehler", f"Maximale Bildanzahl ({max_frames}) erreicht.")
+		return
+	frame = self.gif_frames[idx].copy()
+	self.gif_frames.append(frame)
+	self.frame_count = len(self.gif_frames)
+	value = self.frame_select_var.get()
+	self.frame_select_spin.config(to=max(0, self.frame_count-1))
+	self.frame_select_var.set(value)
+	self.status.config(text=f"Bild {idx} hinzugefügt. Gesamt: {self.frame_count}")
+	_schedule_background_preview_update(self)
 
 def remove_selected_frame_from_texture(self):
-	import threading
-	def do_remove():
-		idx = self.frame_select_var.get()
-		if not self.gif_frames or idx < 0 or idx >= len(self.gif_frames):
-			messagebox.showerror("Fehler", "Ungültige Bildnummer.")
-			return
-		if len(self.gif_frames) <= 1:
-			messagebox.showerror("Fehler", "Mindestens ein Bild muss erhalten bleiben.")
-			return
-		del self.gif_frames[idx]
-		self.frame_count = len(self.gif_frames)
-		# ACHTUNG: maxframes_var NICHT verändern, damit kein weiteres Bild entfernt wird!
-		value = min(self.frame_select_var.get(), self.frame_count-1)
-		self.frame_select_spin.config(to=max(0, self.frame_count-1))
-		self.frame_select_var.set(value)
-		self.status.config(text=f"Bild {idx} entfernt. Gesamt: {self.frame_count}")
-		update_previews(self)
-	threading.Thread(target=do_remove).start()
+	"""Entfernt das gewählte Bild (im Tk-Thread); Neuaufbau wie bei add_selected_frame_to_texture"""
+	idx = self.frame_select_var.get()
+	if not self.gif_frames or idx < 0 or idx >= len(self.gif_frames):
+		messagebox.showerror("Fehler", "Ungültige Bildnummer.")
+		return
+	if len(self.gif_frames) <= 1:
+		messagebox.showerror("Fehler", "Mindestens ein Bild muss erhalten bleiben.")
+		return
+	del self.gif_frames[idx]
+	self.frame_count = len(self.gif_frames)
+	# ACHTUNG: maxframes_var NICHT verändern, damit kein weiteres Bild entfernt wird!
+	value = min(self.frame_select_var.get(), self.frame_count-1)
+	self.frame_select_spin.config(to=max(0, self.frame_count-1))
+	self.frame_select_var.set(value)
+	self.status.config(text=f"Bild {idx} entfernt. Gesamt: {self.frame_count}")
+	_schedule_background_preview_update(self)
 
 def change_language(self, event=None):
 	self.lang = self.lang_var.get()
@@ -121,3 +121,15 @@ class ValidationError(OSSL2GifError):
 	- Type mismatch in parameters
 	"""
 	pass
+
+
+class TaskCancelledError(ThreadingError):
+	"""
+	Raised inside a worker task when its cancellation token was triggered.
+	
+	Common causes:
+	- A newer task with the same name replaced this one (latest wins)
+	- The task was cancelled explicitly via WorkerPool.cancel()
+	- The pool is shutting down
+	"""
+	pass
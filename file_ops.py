@@ -10,15 +10,25 @@ from datetime import datetime
 import tkinter as tk
 from io import BytesIO
 import glob
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 from tkinter import filedialog, ttk, simpledialog
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse
 from urllib.request import Request, urlopen
 from PIL import Image
 from translations import tr
-from image_processing import apply_effects, calculate_optimal_grid
+from image_processing import _get_ui_dispatcher, calculate_optimal_grid, create_smart_scaled_texture
+from texture_engine import EffectConfig, apply_effect_config, generate_lsl_notecard, parse_bg_color, prepare_for_export
+from effect_cache import clear_effect_cache
+from frame_store import LazyGifFrames
+from memory_budget import get_memory_accountant
+from disk_cache import get_disk_cache
+from gif_decoder import decode_gif
+from config_manager import get_config
 from logging_config import get_logger
+from event_bus import EventType, get_event_bus
+from worker_pool import TaskPriority, get_worker_pool
+from perf import NULL_TIMER, StageTimer, span
 from exceptions import (
 	ImageLoadError,
 	FileOperationError,
@@ -205,7 +215,8 @@ def load_gif_from_clipboard(self: Any) -> None:
 			return
 
 	if isinstance(clipboard_data, Image.Image):
-		frame = clipboard_data.convert('RGBA')
+		self.gif_frames = []
+		frame = get_memory_accountant().fit_frames([clipboard_data.convert('RGBA')])[0]
 		self.gif_image = frame.copy()
 		self.gif_frames = [frame]
 		self.frame_count = 1
@@ -248,10 +259,14 @@ def load_gif_from_url(self: Any, image_url: Optional[str] = None) -> None:
 			_set_status(self, "Die angegebene Grafikadresse liefert keine Daten.")
 			return
 
-		image = Image.open(BytesIO(image_data))
-		while True:
-			frames.append(image.copy().convert('RGBA'))
-			image.seek(len(frames))
+		if image_data[:3] == b"GIF":
+			# GIF: eigene Dekodierstufe liefert fertige RGBA-Frames
+			frames = decode_gif(image_data)
+		else:
+			image = Image.open(BytesIO(image_data))
+			while True:
+				frames.append(image.convert('RGBA'))
+				image.seek(len(frames))
 	except EOFError:
 		pass
 	except HTTPError as e:
@@ -271,6 +286,9 @@ def load_gif_from_url(self: Any, image_url: Optional[str] = None) -> None:
 		_set_status(self, "Die Grafikadresse enthält kein lesbares Bild.")
 		return
 
+	# Alte Frames freigeben, dann die neuen (nur im Speicher vorhandenen) ins Budget einpassen
+	self.gif_frames = []
+	frames = get_memory_accountant().fit_frames(frames)
 	self.gif_image = frames[0].copy()
 	self.gif_frames = frames
 	self.frame_count = len(frames)
@@ -286,13 +304,26 @@ def _load_gif_frames(self: Any, file: str) -> None:
 	# Bei GIF-Ladevorgang auf GIF-Frames umschalten
 	self.texture_use_source_image = False
 	self.texture_source_image = None
-	frames = []
+	# Bearbeitete Frames und Anzeigebilder des alten GIFs werden nicht mehr gebraucht
+	clear_effect_cache()
+	display_cache = getattr(self, '_display_cache', None)
+	if display_cache is not None:
+		display_cache.clear()
+	frames: Any = []
 	logger.info(f"Loading GIF file: {file}")
 	try:
-		self.gif_image = Image.open(file)
-		while True:
-			frames.append(self.gif_image.copy())
-			self.gif_image.seek(len(frames))
+		with span("gif.open", file=os.path.basename(file)):
+			self.gif_image = Image.open(file)
+			# Nur indexieren – Frames werden erst beim Zugriff dekodiert
+			config = get_config()
+			frames = LazyGifFrames.open(
+				file,
+				max_decoded=int(config.get('decoded_frame_window')),
+				prefetch_count=int(config.get('frame_prefetch')),
+				spill_mb=int(config.get('frame_spill_mb')),
+				spill_dir=config.get('frame_spill_dir') or None,
+				disk_cache=get_disk_cache(),
+			)
 	except FileNotFoundError as e:
 		error_msg = f"File not found: {file}"
 		logger.error(error_msg, exc_info=True)
@@ -317,7 +348,7 @@ def _load_gif_frames(self: Any, file: str) -> None:
 	
 	logger.info(f"Successfully loaded GIF with {len(frames)} frames from {file}")
 	
-	# Schließe die GIF-Datei, um Ressourcen freizugeben (Frames sind bereits im Speicher kopiert)
+	# Schließe die GIF-Datei (der Frame-Store hält einen eigenen Handle)
 	if hasattr(self, 'gif_image') and self.gif_image is not None:
 		try:
 			self.gif_image.close()
@@ -404,7 +435,9 @@ def save_gif(self: Any) -> None:
 		return
 	logger.info(f"Saving GIF to: {file}")
 	try:
-		frames = [apply_effects(self, f.resize((self.width_var.get(), self.height_var.get())), "gif") for f in self.gif_frames]
+		size = (self.width_var.get(), self.height_var.get())
+		effects = EffectConfig.from_app(self, "gif")
+		frames = [apply_effect_config(f.resize(size), effects) for f in self.gif_frames]
 		duration = self.framerate_var.get()
 		frames[0].save(file, save_all=True, append_images=frames[1:], loop=0, duration=duration)
 		logger.info(f"GIF saved successfully with {len(frames)} frames: {file}")
@@ -446,11 +479,15 @@ def load_texture(self: Any) -> None:
 	
 	try:
 		logger.info(f"Loading texture from: {file}")
-		img = Image.open(file)
+		img: Image.Image = Image.open(file)
 		
 		# Konvertiere zu RGBA
 		if img.mode != 'RGBA':
 			img = img.convert('RGBA')
+		# Vorherige Textur freigeben; zu große Texturen werden ins Speicherbudget verkleinert
+		self.texture_source_image = None
+		self.texture_image = None
+		img = get_memory_accountant().fit_frames([img])[0]
 		
 		# Speichere als Textur-Quelle und nutze sie für Vorschau/Export (ohne GIF-Frames zu überschreiben)
 		self.texture_source_image = img
@@ -473,6 +510,26 @@ def load_texture(self: Any) -> None:
 				text=f"{tr('error_loading_texture', self.lang) or 'Fehler beim Laden der Textur'}: {str(e)}"
 			)
 
+def write_frames_zip(frames: Any, size: tuple[int, int], effects: EffectConfig, target: Any, timer: StageTimer = NULL_TIMER) -> None:
+	"""
+	Schreibt alle Frames (skaliert, mit Effekten) als PNG-Einzelbilder in ein ZIP.
+
+	Args:
+		target: Dateipfad oder beschreibbares Datei-Objekt
+		timer: Optional – misst die Stufen "resize", "effects" und "encode"
+	"""
+	import zipfile
+	with zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED) as zipf:
+		for idx, frame in enumerate(frames):
+			with timer.stage("resize"):
+				resized = frame.resize(size)
+			with timer.stage("effects"):
+				img = apply_effect_config(resized, effects)
+			with timer.stage("encode"):
+				img_bytes = BytesIO()
+				img.save(img_bytes, format="PNG")
+				zipf.writestr(f"frame_{idx+1:03d}.png", img_bytes.getvalue())
+
 def save_texture(self: Any) -> None:
 	"""Speichert die aktuell generierte Texture."""
 	if not hasattr(self, 'texture_image') or self.texture_image is None:
@@ -485,12 +542,6 @@ def save_texture(self: Any) -> None:
 	tex_w = self.width_var.get() if self.width_var.get() > 0 else 2048
 	tex_h = self.height_var.get() if self.height_var.get() > 0 else 2048
 	
-	# Skaliere das Arbeitsbild auf die Zielgröße (nur beim Speichern!)
-	if self.texture_image.size != (tex_w, tex_h):
-		logger.info(f"Scaling texture from {self.texture_image.size} to {tex_w}x{tex_h} for save")
-		sheet = self.texture_image.resize((tex_w, tex_h), Image.Resampling.LANCZOS)
-	else:
-		sheet = self.texture_image
 	
 	# Extrahiere Metadaten
 	name = "texture"
@@ -520,48 +571,92 @@ def save_texture(self: Any) -> None:
 		return
 	
 	fmt = self.export_format_var.get().upper()
+	pool = get_worker_pool(max_workers=2)
+	# Ergebnisse (Status, Events) kommen per UiDispatcher in den Tk-Thread zurück
+	_get_ui_dispatcher(self)
 	
 	# ZIP-Export: Speichere Einzelbilder
 	if fmt == "ZIP":
-		import zipfile
-		try:
-			with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-				for idx, frame in enumerate(self.gif_frames):
-					img = apply_effects(self, frame.resize((self.width_var.get(), self.height_var.get())), "gif")
-					from io import BytesIO
-					img_bytes = BytesIO()
-					img.save(img_bytes, format="PNG")
-					img_bytes.seek(0)
-					zipf.writestr(f"frame_{idx+1:03d}.png", img_bytes.read())
-			logger.info(f"ZIP export saved successfully with {len(self.gif_frames)} frames: {file}")
-			if hasattr(self, 'status') and self.status:
-				self.status.config(text=tr('status_zip_saved', _lang(self)) or "GIF-Einzelbilder als ZIP gespeichert.")
-		except Exception as e:
-			logger.error(f"Error exporting ZIP: {e}", exc_info=True)
-			_set_status(self, f"ZIP-Export fehlgeschlagen: {e}")
+		size = (self.width_var.get(), self.height_var.get())
+		effects = EffectConfig.from_app(self, "gif")
+		_set_status(self, f"Speichere {os.path.basename(file)} …")
+		pool.submit(f"texture_save:{file}", _save_zip_task, self, file, size, effects, priority=TaskPriority.BACKGROUND, replace=False)
 		return
 	
-	# PNG/JPG/BMP-Export: Speichere optimierte Textur
-	if fmt == "JPG":
-		fmt = "JPEG"
-	
+	# PNG/JPG/BMP-Export: alle Einstellungen hier im Tk-Thread lesen, Sheet bauen und
+	# kodieren im Hintergrund (die GUI bleibt während des Exports bedienbar)
+	texture_base_name = os.path.splitext(os.path.basename(file))[0]
+	notecard_content = generate_lsl_notecard(
+		texture_base_name,
+		tiles_x,
+		tiles_y,
+		float(self.framerate_var.get()) if hasattr(self, 'framerate_var') else 10.0,
+		_get_lsl_default_effect_tokens(self),
+		_get_lsl_default_movement(self),
+	)
+	# Ohne GIF-Frames bzw. bei direkt geladener Textur wird das vorhandene Bild gespeichert
+	source = None if not getattr(self, 'texture_use_source_image', False) and self.gif_frames else self.texture_image
+	frame_count = len(self.gif_frames) if self.gif_frames else 0
+	get_event_bus().publish(
+		EventType.TEXTURE_GENERATION_STARTED,
+		data={'frame_count': frame_count, 'target_size': (tex_w, tex_h), 'preview': False},
+		source='file_ops',
+	)
+	_set_status(self, f"Speichere {os.path.basename(file)} …")
+	pool.submit(
+		f"texture_save:{file}",
+		_save_texture_task,
+		self, file, fmt, (tex_w, tex_h), parse_bg_color(getattr(self, 'bg_color', '#00000000')), source, notecard_content, frame_count,
+		priority=TaskPriority.BACKGROUND,
+		replace=False,
+	)
+
+def _in_ui(self: Any, func: Callable[..., Any], *args: Any) -> None:
+	"""Führt `func(*args)` im Tk-Thread aus (über den UiDispatcher der App)"""
+	dispatcher = getattr(self, '_ui_dispatcher', None)
+	if dispatcher is not None:
+		dispatcher.call_soon(lambda: func(*args))
+
+def _save_zip_task(self: Any, file: str, size: tuple[int, int], effects: EffectConfig) -> None:
+	"""Hintergrund-Task: schreibt die Einzelbilder als ZIP (Status über den UiDispatcher)"""
 	try:
-		img = sheet
+		zip_timer = StageTimer("texture.zip_export")
+		write_frames_zip(self.gif_frames, size, effects, file, timer=zip_timer)
+		zip_timer.record(frames=len(self.gif_frames))
+		logger.info(f"ZIP export saved successfully with {len(self.gif_frames)} frames: {file}")
+		_in_ui(self, _set_status, self, tr('status_zip_saved', _lang(self)) or "GIF-Einzelbilder als ZIP gespeichert.")
+	except Exception as e:
+		logger.error(f"Error exporting ZIP: {e}", exc_info=True)
+		_in_ui(self, _set_status, self, f"ZIP-Export fehlgeschlagen: {e}")
+
+def _publish(event_type: EventType, data: dict[str, Any]) -> None:
+	get_event_bus().publish(event_type, data=data, source='file_ops')
+
+def _save_texture_task(self: Any, file: str, fmt: str, size: tuple[int, int], bg_rgba: tuple[int, int, int, int], source: Optional[Image.Image], notecard_content: str, frame_count: int) -> None:
+	"""
+	Hintergrund-Task von `save_texture`: baut das volle Sheet (bzw. skaliert `source`),
+	kodiert und schreibt Textur und Notecard. Status und Events gehen über den
+	UiDispatcher an den Tk-Thread.
+	"""
+	tex_w, tex_h = size
+	timer = StageTimer("texture.save")
+	try:
+		if source is None:
+			# Die Vorschau ist nur in Anzeigegröße gesetzt – volles Sheet erst jetzt bauen
+			sheet = create_smart_scaled_texture(self, tex_w, tex_h, bg_rgba, preview_mode=False, timer=timer, use_disk_cache=True)
+		elif source.size != (tex_w, tex_h):
+			# Skaliere das Arbeitsbild auf die Zielgröße (nur beim Speichern!)
+			logger.info(f"Scaling texture from {source.size} to {tex_w}x{tex_h} for save")
+			with timer.stage("resize"):
+				sheet = source.resize((tex_w, tex_h), Image.Resampling.LANCZOS)
+		else:
+			sheet = source
+		
+		# Format-Vorbereitung (JPEG: weißer Hintergrund, PNG: RGBA) – identisch zum Batch-Modus
+		with timer.stage("encode"):
+			img, fmt = prepare_for_export(sheet, fmt)
 		
-		# JPG-Konvertierung (keine Transparenz möglich)
-		if fmt == "JPEG":
-			if img.mode == 'RGBA':
-				# Erstelle weiß-Hintergrund für JPEG
-				background = Image.new('RGB', img.size, (255, 255, 255))
-				background.paste(img, mask=img.split()[3] if len(img.split()) > 3 else None)
-				img = background
-			else:
-				img = img.convert('RGB')
-		elif fmt == "PNG":
-			# PNG: Stelle sicher RGBA Mode (für Alpha-Kanal)
-			if img.mode != 'RGBA':
-				img = img.convert('RGBA')
-			
+		if fmt == "PNG":
 			# Warnung: Prüfe ob Alpha-Kanal zu transparent ist
 			import numpy as np
 			try:
@@ -574,42 +669,42 @@ def save_texture(self: Any) -> None:
 					
 					if transparency_ratio > 0.9:  # Mehr als 90% transparent
 						logger.warning(f"Texture has very high transparency: {transparency_ratio*100:.1f}% fully transparent pixels")
-						_set_status(self, f"Warnung: Textur ist zu {transparency_ratio*100:.1f}% durchsichtig.")
+						_in_ui(self, _set_status, self, f"Warnung: Textur ist zu {transparency_ratio*100:.1f}% durchsichtig.")
 			except Exception as e:
 				logger.debug(f"Could not check alpha channel: {e}")
 		
-		img.save(file, format=fmt)
+		with timer.stage("encode"):
+			img.save(file, format=fmt)
 		logger.info(f"Texture saved successfully: {file} ({img.size})")
+		timer.record(frames=frame_count, format=fmt, size=f"{img.width}x{img.height}")
 
 		texture_base_name = os.path.splitext(os.path.basename(file))[0]
-		notecard_content = generate_lsl_notecard(
-			texture_base_name,
-			tiles_x,
-			tiles_y,
-			float(self.framerate_var.get()) if hasattr(self, 'framerate_var') else 10.0,
-			_get_lsl_default_effect_tokens(self),
-			_get_lsl_default_movement(self),
-		)
 		notecard_file = os.path.join(os.path.dirname(file), f"{texture_base_name}.notecard")
 		with open(notecard_file, "w", encoding="utf-8") as f:
 			f.write(notecard_content)
 		
-		if hasattr(self, 'status') and self.status:
-			self.status.config(text=(tr('status_saved', _lang(self)) or "Textur gespeichert") + f": {os.path.basename(file)} | Notecard: {texture_base_name}.notecard")
-
-	
+		_in_ui(self, _publish, EventType.TEXTURE_GENERATED, {
+			'frame_count': frame_count,
+			'sheet_size': img.size,
+			'target_size': (tex_w, tex_h),
+			'preview': False,
+			'file': file,
+			'durations_ms': timer.as_ms(),
+			'total_ms': timer.elapsed_ms(),
+		})
+		_in_ui(self, _set_status, self, (tr('status_saved', _lang(self)) or "Textur gespeichert") + f": {os.path.basename(file)} | Notecard: {texture_base_name}.notecard")
 	except FileNotFoundError as e:
 		logger.error(f"File not found when saving texture: {e}")
-		_set_status(self, f"Textur-Speichern fehlgeschlagen: Speicherort nicht gefunden: {e}")
-		return
+		_in_ui(self, _publish, EventType.TEXTURE_ERROR, {'error': f"{type(e).__name__}: {e}", 'file': file})
+		_in_ui(self, _set_status, self, f"Textur-Speichern fehlgeschlagen: Speicherort nicht gefunden: {e}")
 	except PermissionError as e:
 		logger.error(f"Permission denied when saving texture: {e}")
-		_set_status(self, f"Textur-Speichern fehlgeschlagen: Berechtigung verweigert: {e}")
-		return
+		_in_ui(self, _publish, EventType.TEXTURE_ERROR, {'error': f"{type(e).__name__}: {e}", 'file': file})
+		_in_ui(self, _set_status, self, f"Textur-Speichern fehlgeschlagen: Berechtigung verweigert: {e}")
 	except Exception as e:
 		logger.error(f"Error saving texture: {e}", exc_info=True)
-		_set_status(self, f"Textur-Speichern fehlgeschlagen: {e}")
-		return
+		_in_ui(self, _publish, EventType.TEXTURE_ERROR, {'error': f"{type(e).__name__}: {e}", 'file': file})
+		_in_ui(self, _set_status, self, f"Textur-Speichern fehlgeschlagen: {e}")
 
 def export_lsl(self: Any) -> None:
 	"""Exportiert ein LSL (Linden Scripting Language) Script für Texture-Animation in Second Life/OpenSim."""
@@ -673,26 +768,6 @@ def generate_lsl_script(self: Any, name: str, tiles_x: int, tiles_y: int, speed:
 	"""Kompatibilitäts-Wrapper: liefert das universelle Notecard-LSL-Script."""
 	return generate_lsl_script_v2(self, name, tiles_x, tiles_y, speed)
 
-def generate_lsl_notecard(name: str, tiles_x: int, tiles_y: int, speed: float, effect_tokens: list[str], movement_token: str) -> str:
-	version = _get_app_version()
-	created_at = datetime.now().strftime("%Y-%m-%d")
-	effects = ", ".join(effect_tokens) if effect_tokens else "LOOP"
-	movement = movement_token if movement_token in {"SLIDE", "ROTATE", "SCALE"} else "SLIDE"
-	return f'''# OSSL2Gif {version}
-# Copyright (c) 2026 Manfred Zainhofer
-# Generated: {created_at}
-# Texture Notecard: {name}.notecard
-
-columns={tiles_x}
-rows={tiles_y}
-fps={speed}
-start=0.0
-effects={effects}
-movement={movement}
-face=ALL_SIDES
-animOn=TRUE
-'''
-
 def _get_lsl_default_effect_tokens(self: Any) -> list[str]:
 	effects: list[str] = []
 	if not hasattr(self, 'lsl_effect_loop_var') or self.lsl_effect_loop_var.get():
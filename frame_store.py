@@ -0,0 +1,502 @@
+###
+# frame_store.py
+# Lazy, on-demand GIF frame storage for OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Lazy Frame-Store für GIFs.
+
+Beim Laden wird nur die Frame-Anzahl ermittelt (Header-Scan ohne Dekodieren).
+Frames werden erst beim Zugriff dekodiert; nur ein begrenztes Fenster
+dekodierter Frames bleibt im Speicher, Frames vor dem Abspielkopf werden im
+Hintergrund vorgeladen. Das Fenster ist zusätzlich durch das Speicherbudget
+begrenzt und wird bei Speicherknappheit verkleinert (siehe memory_budget.py).
+
+Sehr lange GIFs (config 'frame_spill_mb') werden beim Dekodieren in eine
+memory-mapped Datei mit fester Schrittweite pro Frame geschrieben
+(`MappedFrameFile`). Jeder Frame wird so nur einmal dekodiert; die Bilder sind
+Null-Kopie-Sichten auf die Datei, das Betriebssystem entscheidet über die
+Residenz im Speicher.
+
+Mit einem `DiskCache` wird die Datei im Hintergrund gehasht: bei einem
+Treffer kommen alle Frames ab dann aus dem gemappten `frames-…`-Eintrag (ohne
+Dekodieren). Ausgelagerte GIFs werden, sobald ihr letzter Frame dekodiert ist,
+aus der Auslagerungsdatei als solcher Eintrag abgelegt.
+
+`LazyGifFrames` verhält sich wie die bisherige Frame-Liste (`gif_frames`):
+len(), Index-Zugriff, Slicing, Iteration, append/insert/del.
+"""
+
+from collections import OrderedDict
+from collections.abc import MutableSequence
+from typing import BinaryIO, Iterable, Optional, Union, overload
+from PIL import Image
+import mmap
+import numpy as np
+import tempfile
+import threading
+from effect_cache import image_nbytes
+from disk_cache import DiskCache, file_digest, frames_key
+from gif_decoder import GifDecoder, GifFormatError
+from logging_config import get_logger
+from memory_budget import get_memory_accountant
+from worker_pool import TaskPriority, current_token, get_worker_pool
+
+logger = get_logger(__name__)
+
+class FrameRef:
+	"""
+	Stabile Identität eines Frames im Store.
+	Verweist entweder auf einen Index der Quelldatei oder auf ein Bild im Speicher.
+	Dient Caches (EffectCache, SheetCompositor) als Schlüssel, auch wenn der
+	dekodierte Frame zwischenzeitlich verworfen und neu dekodiert wurde.
+	"""
+	__slots__ = ('source', 'index', 'image', '__weakref__')
+
+	def __init__(self, source: Optional["GifFrameSource"] = None, index: int = -1, image: Optional[Image.Image] = None):
+		self.source = source
+		self.index = index
+		self.image = image
+
+	def load(self) -> Image.Image:
+		"""Gibt das Bild zurück (dekodiert bei Bedarf)"""
+		if self.image is not None:
+			return self.image
+		assert self.source is not None
+		return self.source.frame(self.index)
+
+	@property
+	def size(self) -> tuple[int, int]:
+		"""Bildgröße (ohne zu dekodieren – Dateiframes haben die Canvas-Größe der Quelle)"""
+		if self.image is not None:
+			return self.image.size
+		assert self.source is not None
+		return self.source.size
+
+	def __repr__(self) -> str:
+		if self.image is not None:
+			return f"FrameRef(image={self.image.size})"
+		return f"FrameRef(index={self.index})"
+
+class MappedFrameFile:
+	"""
+	Dekodierte RGBA-Frames in einer memory-mapped Temporärdatei (Frame i ab Byte i * stride).
+
+	Nutzung:
+		spill = MappedFrameFile((w, h), count)
+		decoder.frame_into(i, spill.view(i)); spill.mark_written(i)
+		img = spill.image(i)    # Null-Kopie, nur lesbar
+	"""
+
+	def __init__(self, size: tuple[int, int], count: int, directory: Optional[str] = None, path: Optional[str] = None):
+		"""
+		Args:
+			size: (Breite, Höhe) aller Frames
+			count: Anzahl der Frames (Dateigröße = count * stride, auf Linux sparse)
+			directory: Verzeichnis der Temporärdatei (None = System-Temp)
+			path: Vorhandene, vollständige Datei nur lesend mappen (z.B. DiskCache-Eintrag)
+		"""
+		self.size = size
+		self.count = max(1, count)
+		width, height = size
+		self.stride = width * height * 4
+		self.readonly = path is not None
+		self._file: BinaryIO
+		if path is not None:
+			self._file = open(path, "rb")
+		else:
+			# Anonyme Temporärdatei – verschwindet beim Schließen bzw. Prozessende
+			self._file = tempfile.TemporaryFile(prefix="ossl2gif_frames_", suffix=".rgba", dir=directory or None)
+		try:
+			if path is None:
+				self._file.truncate(self.stride * self.count)
+			access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+			self._mmap: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), self.stride * self.count, access=access)
+		except Exception:
+			self._file.close()
+			raise
+		self._frames: Optional[np.ndarray] = np.frombuffer(self._mmap, dtype=np.uint8).reshape(self.count, height, width, 4)
+		self._written = np.full(self.count, self.readonly, dtype=bool)
+		self._written_count = self.count if self.readonly else 0
+
+	def view(self, index: int) -> np.ndarray:
+		"""Beschreibbare Sicht (H, W, 4) auf Frame `index`"""
+		if self._frames is None:
+			raise ValueError("MappedFrameFile is closed")
+		frame: np.ndarray = self._frames[index]
+		return frame
+
+	def is_written(self, index: int) -> bool:
+		return bool(self._written[index])
+
+	def mark_written(self, index: int) -> None:
+		if not self._written[index]:
+			self._written[index] = True
+			self._written_count += 1
+
+	def write(self, index: int, img: Image.Image) -> None:
+		"""Kopiert ein RGBA-Bild in den Slot `index`"""
+		np.copyto(self.view(index), np.asarray(img.convert("RGBA")))
+		self.mark_written(index)
+
+	def image(self, index: int) -> Image.Image:
+		"""Frame `index` als nur lesbares Bild direkt auf dem Mapping (Pillow kopiert erst beim Verändern)"""
+		return Image.frombuffer("RGBA", self.size, self.view(index), "raw", "RGBA", 0, 1)
+
+	@property
+	def written_count(self) -> int:
+		return self._written_count
+
+	def write_to(self, f: BinaryIO) -> None:
+		"""Schreibt alle Frames hintereinander in eine Binärdatei (Format des DiskCache-Eintrags)"""
+		for index in range(self.count):
+			f.write(self.view(index))
+
+	def close(self) -> None:
+		"""Gibt Mapping und Datei frei (solange noch Bilder darauf zeigen, erledigt das der GC)"""
+		self._frames = None
+		if self._mmap is not None:
+			try:
+				self._mmap.close()
+			except BufferError:
+				logger.debug("Mapped frames still referenced; mapping is released with the last image")
+			self._mmap = None
+		try:
+			self._file.close()
+		except Exception as e:
+			logger.debug(f"Error closing spill file: {type(e).__name__}: {e}", exc_info=False)
+
+class GifFrameSource:
+	"""
+	Thread-sicherer Zugriff auf die Frames einer GIF-Datei mit LRU-Fenster dekodierter Frames.
+	GIFs laufen über den GifDecoder (fertige RGBA-Frames, vorwärts inkrementell),
+	andere Formate über Pillows seek/copy. Sequenzieller Zugriff (Abspielen,
+	Sheet-Aufbau) ist dadurch billig.
+
+	Mit `spill()` landet jeder dekodierte Frame in einer `MappedFrameFile`
+	und wird danach nie erneut dekodiert. `attach_cache()` verbindet die Quelle
+	mit dem DiskCache.
+	"""
+
+	def __init__(self, path: str, max_decoded: int = 32):
+		"""
+		Args:
+			path: Pfad zur GIF-Datei
+			max_decoded: Maximale Anzahl gleichzeitig dekodierter Frames
+		"""
+		self.path = path
+		self.max_decoded = max(1, max_decoded)
+		self._lock = threading.Lock()
+		self._window: "OrderedDict[int, Image.Image]" = OrderedDict()
+		self._gif: Optional[Image.Image] = None
+		self._decoder: Optional[GifDecoder] = None
+		self._spill: Optional[MappedFrameFile] = None
+		# DiskCache, in den die Auslagerungsdatei nach dem letzten Frame geschrieben wird
+		self._cache: Optional[DiskCache] = None
+		self._closed = False
+		# SHA-256 des Dateiinhalts, sobald attach_cache() gelaufen ist
+		self.content_hash: Optional[str] = None
+		try:
+			# Nur die Blockstruktur indexieren, ohne Pixel zu dekodieren
+			self._decoder = GifDecoder.from_file(path)
+			self.n_frames = self._decoder.n_frames
+			self.size = self._decoder.size
+			return
+		except GifFormatError as e:
+			logger.debug(f"{path} not handled by GifDecoder ({e}), using Pillow")
+		self._gif = Image.open(path)
+		try:
+			self.n_frames = int(getattr(self._gif, 'n_frames', 1))
+			self.size = self._gif.size
+		except Exception:
+			self.close()
+			raise
+
+	def attach_cache(self, cache: DiskCache) -> None:
+		"""
+		Hasht die Datei und schlägt ihre Frames im DiskCache nach (Hintergrund-Task,
+		liest die ganze Datei). Bei einem Treffer kommen alle Frames ab jetzt aus dem
+		gemappten Eintrag; eine vollständig ausgelagerte Quelle wird dort abgelegt,
+		sobald ihr letzter Frame dekodiert ist.
+		"""
+		try:
+			self.content_hash = file_digest(self.path)
+		except OSError as e:
+			logger.debug(f"Cannot hash {self.path} for the disk cache: {type(e).__name__}: {e}")
+			return
+		hit = cache.lookup(frames_key(self.content_hash))
+		if hit is not None and self._adopt(*hit):
+			return
+		with self._lock:
+			spill = self._spill
+			# Nur GIFs über der Auslagerungsschwelle, vollständig und im Cache-Budget
+			if self._closed or spill is None or spill.readonly or spill.count != self.n_frames or spill.count * self.frame_nbytes > cache.max_bytes:
+				return
+			if spill.written_count < spill.count:
+				self._cache = cache
+				return
+		self.persist(cache)
+
+	def _adopt(self, blob: str, meta: dict) -> bool:
+		"""Ersetzt Dekodierung bzw. Auslagerungsdatei durch den gemappten DiskCache-Eintrag"""
+		try:
+			if tuple(meta['size']) != tuple(self.size) or int(meta['count']) != self.n_frames:
+				return False
+			mapped = MappedFrameFile(self.size, self.n_frames, path=blob)
+		except (OSError, ValueError, KeyError, TypeError) as e:
+			logger.warning(f"Cannot map cached frames for {self.path}: {type(e).__name__}: {e}")
+			return False
+		with self._lock:
+			if self._closed:
+				mapped.close()
+				return True
+			previous, self._spill = self._spill, mapped
+			self._window.clear()
+		if previous is not None:
+			previous.close()
+		logger.debug(f"Mapped {self.n_frames} cached frames for {self.path}")
+		return True
+
+	def persist(self, cache: DiskCache) -> None:
+		"""Legt die vollständig ausgelagerten Frames als `frames-…`-Eintrag im DiskCache ab"""
+		spill = self._spill
+		if spill is None or self.content_hash is None or spill.readonly or spill.written_count < spill.count:
+			return
+		cache.store(frames_key(self.content_hash), {'kind': 'frames', 'size': list(self.size), 'count': spill.count}, spill.write_to)
+
+	def spill(self, count: int, directory: Optional[str] = None) -> None:
+		"""Lagert die ersten `count` Frames ab jetzt in eine memory-mapped Datei aus"""
+		with self._lock:
+			if self._spill is None:
+				self._spill = MappedFrameFile(self.size, count, directory)
+				self._window.clear()
+
+	@property
+	def spilled(self) -> bool:
+		return self._spill is not None
+
+	def _decode(self, index: int) -> Image.Image:
+		"""Dekodiert Frame `index` (Lock muss gehalten werden)"""
+		spill = self._spill
+		if spill is not None and index < spill.count:
+			if not spill.is_written(index):
+				if self._decoder is not None:
+					# Direkt in die Datei dekodieren, ohne Zwischenbild
+					self._decoder.frame_into(index, spill.view(index))
+					spill.mark_written(index)
+				else:
+					spill.write(index, self._pillow_frame(index))
+				if self._cache is not None and spill.written_count == spill.count:
+					# Letzter fehlender Frame: die Datei ist vollständig und kann in den DiskCache
+					cache, self._cache = self._cache, None
+					get_worker_pool().submit(f"frame_persist_{id(self)}", self.persist, cache, priority=TaskPriority.BACKGROUND)
+			return spill.image(index)
+		if self._decoder is not None:
+			return self._decoder.frame(index)
+		return self._pillow_frame(index)
+
+	def _pillow_frame(self, index: int) -> Image.Image:
+		if self._gif is None:
+			self._gif = Image.open(self.path)
+		self._gif.seek(index)
+		return self._gif.convert("RGBA")
+
+	def frame(self, index: int) -> Image.Image:
+		"""Dekodiert Frame `index` (oder liefert ihn aus dem Fenster bzw. der Mapped-Datei)"""
+		with self._lock:
+			cached = self._window.get(index)
+			if cached is not None:
+				self._window.move_to_end(index)
+				return cached
+			img = self._decode(index)
+			self._window[index] = img
+			while len(self._window) > self.max_decoded:
+				self._window.popitem(last=False)
+			return img
+
+	def is_decoded(self, index: int) -> bool:
+		"""True wenn Frame `index` im Fenster oder in der Mapped-Datei liegt"""
+		spill = self._spill
+		if spill is not None and index < spill.count and spill.is_written(index):
+			return True
+		return index in self._window
+
+	def decode_many(self, indices: Iterable[int]) -> None:
+		"""Dekodiert mehrere Frames (für Prefetch im Hintergrund, abbrechbar zwischen Frames)"""
+		token = current_token()
+		for index in indices:
+			if token.cancelled:
+				return
+			if not self.is_decoded(index):
+				self.frame(index)
+
+	@property
+	def decoded_count(self) -> int:
+		return len(self._window)
+
+	@property
+	def frame_nbytes(self) -> int:
+		"""Bytes eines dekodierten RGBA-Frames"""
+		return self.size[0] * self.size[1] * 4
+
+	def decoded_bytes(self) -> int:
+		"""
+		Belegte Bytes aller dekodierten Frames im Fenster (für den MemoryAccountant).
+		Ausgelagerte Frames zählen nicht – ihre Seiten verwaltet das Betriebssystem.
+		"""
+		with self._lock:
+			if self._spill is not None:
+				return 0
+			return sum(image_nbytes(img) for img in self._window.values())
+
+	def trim(self, nbytes: int) -> int:
+		"""
+		Verwirft die ältesten dekodierten Frames (der zuletzt benutzte bleibt), bis `nbytes`
+		frei sind, und verkleinert das Fenster entsprechend. Verworfene Frames werden
+		beim nächsten Zugriff erneut dekodiert.
+
+		Returns:
+			Freigegebene Bytes
+		"""
+		freed = 0
+		with self._lock:
+			if self._spill is not None:
+				return 0
+			while freed < nbytes and len(self._window) > 1:
+				_, img = self._window.popitem(last=False)
+				freed += image_nbytes(img)
+			if freed:
+				self.max_decoded = max(2, len(self._window))
+				logger.debug(f"Trimmed decoded window of {self.path} to {self.max_decoded} frames")
+		return freed
+
+	def close(self) -> None:
+		"""Schließt die Datei und verwirft alle dekodierten Frames"""
+		with self._lock:
+			self._closed = True
+			self._cache = None
+			self._window.clear()
+			if self._spill is not None:
+				self._spill.close()
+				self._spill = None
+			if self._gif is not None:
+				try:
+					self._gif.close()
+				except Exception as e:
+					logger.debug(f"Error closing GIF source: {type(e).__name__}: {e}", exc_info=False)
+				self._gif = None
+
+	def __del__(self) -> None:
+		try:
+			self.close()
+		except Exception:
+			pass
+
+class LazyGifFrames(MutableSequence):
+	"""
+	Frame-Liste mit Lazy-Dekodierung – Drop-in-Ersatz für `gif_frames`.
+
+	Nutzung:
+		frames = LazyGifFrames.open("anim.gif", max_decoded=32)
+		frames[10]          # dekodiert Frame 10
+		frames[:64]         # neuer Store mit denselben FrameRefs (nichts wird dekodiert)
+		frames.append(img)  # Bilder im Speicher können beliebig gemischt werden
+	"""
+
+	def __init__(self, refs: Optional[Iterable[FrameRef]] = None, prefetch_count: int = 8):
+		self._refs: list[FrameRef] = list(refs) if refs is not None else []
+		self.prefetch_count = prefetch_count
+
+	@classmethod
+	def open(cls, path: str, max_decoded: int = 32, prefetch_count: int = 8, max_frames: Optional[int] = None, spill_mb: Optional[int] = None, spill_dir: Optional[str] = None, disk_cache: Optional[DiskCache] = None) -> "LazyGifFrames":
+		"""
+		Indexiert eine GIF-Datei (ohne Frames zu dekodieren).
+		Das Fenster dekodierter Frames wird auf das freie Speicherbudget begrenzt.
+
+		Args:
+			spill_mb: Ab dieser dekodierten Gesamtgröße werden die Frames in eine
+				memory-mapped Datei ausgelagert (0 = immer, None = nie)
+			spill_dir: Verzeichnis der Auslagerungsdatei (None = System-Temp)
+			disk_cache: Dekodierte Frames über den Inhalts-Hash der Datei wiederverwenden
+				bzw. ausgelagerte Frames dort ablegen (Hashen im Hintergrund, siehe
+				`GifFrameSource.attach_cache`)
+		"""
+		source = GifFrameSource(path, max_decoded=max_decoded)
+		count = source.n_frames if max_frames is None else min(source.n_frames, max_frames)
+		if spill_mb is not None and count * source.frame_nbytes >= spill_mb * 1024 * 1024:
+			source.spill(count, spill_dir)
+		else:
+			accountant = get_memory_accountant()
+			source.max_decoded = accountant.frame_window(source.frame_nbytes, source.max_decoded)
+			accountant.register("frames", source.decoded_bytes, source.trim, priority=20)
+		if disk_cache is not None:
+			# Hashen liest die ganze Datei – nicht im aufrufenden (Tk-)Thread
+			get_worker_pool().submit(f"frame_cache_{id(source)}", source.attach_cache, disk_cache, priority=TaskPriority.BACKGROUND)
+		logger.debug(f"Indexed {count} frames from {path} (window {source.max_decoded}, spilled {source.spilled})")
+		return cls((FrameRef(source, i) for i in range(count)), prefetch_count=prefetch_count)
+
+	@staticmethod
+	def _ref_for(value: Union[Image.Image, FrameRef]) -> FrameRef:
+		return value if isinstance(value, FrameRef) else FrameRef(image=value)
+
+	def __len__(self) -> int:
+		return len(self._refs)
+
+	@overload
+	def __getitem__(self, index: int) -> Image.Image: ...
+	@overload
+	def __getitem__(self, index: slice) -> "LazyGifFrames": ...
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return LazyGifFrames(self._refs[index], prefetch_count=self.prefetch_count)
+		return self._refs[index].load()
+
+	def __setitem__(self, index, value) -> None:
+		if isinstance(index, slice):
+			self._refs[index] = [self._ref_for(v) for v in value]
+		else:
+			self._refs[index] = self._ref_for(value)
+
+	def __delitem__(self, index) -> None:
+		del self._refs[index]
+
+	def insert(self, index: int, value: Union[Image.Image, FrameRef]) -> None:
+		self._refs.insert(index, self._ref_for(value))
+
+	def token(self, index: int) -> FrameRef:
+		"""Stabile Identität von Frame `index` (ohne zu dekodieren)"""
+		return self._refs[index]
+
+	def tokens(self) -> list[FrameRef]:
+		return list(self._refs)
+
+	def frame_size(self, index: int) -> tuple[int, int]:
+		"""Größe von Frame `index` (ohne zu dekodieren)"""
+		return self._refs[index].size
+
+	def memory_bytes(self) -> int:
+		"""Bytes der Frames, die nur im Speicher liegen (dekodierte Dateiframes zählt ihre Quelle)"""
+		return sum(image_nbytes(ref.image) for ref in self._refs if ref.image is not None)
+
+	def prefetch(self, start: int, count: Optional[int] = None) -> None:
+		"""
+		Dekodiert die nächsten `count` Frames ab `start` im Worker-Pool vor (mit Wrap-around).
+		Ein neuer Prefetch ersetzt den vorherigen (neuer Abspielkopf gewinnt).
+		"""
+		count = self.prefetch_count if count is None else count
+		if count <= 0 or not self._refs:
+			return
+		pending: dict[GifFrameSource, list[int]] = {}
+		for offset in range(count):
+			ref = self._refs[(start + offset) % len(self._refs)]
+			if ref.source is not None and not ref.source.is_decoded(ref.index):
+				pending.setdefault(ref.source, []).append(ref.index)
+		if not pending:
+			return
+		pool = get_worker_pool()
+		for source, indices in pending.items():
+			pool.submit(f"frame_prefetch_{id(source)}", source.decode_many, indices, priority=TaskPriority.BACKGROUND)
+
+	def __repr__(self) -> str:
+		return f"LazyGifFrames({len(self._refs)} frames)"
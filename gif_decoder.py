@@ -0,0 +1,289 @@
+###
+# gif_decoder.py
+# GIF decoding stage with disposal-aware RGBA compositing for OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Eigene GIF-Dekodierstufe.
+
+Die Blockstruktur (Logical Screen, Paletten, Graphic Control Extension,
+Image Descriptor) wird einmal indexiert. Die LZW-Daten eines Frames
+dekodiert Pillows C-Decoder direkt in ein P-Bild in Frame-Größe; das
+Zusammensetzen übernimmt diese Stufe selbst: jeder Frame wird genau einmal
+über eine RGBA-Paletten-LUT in eine wiederverwendbare RGBA-Leinwand
+geschrieben, Disposal-Methoden werden wie in Browsern angewendet:
+
+	0/1  Frame bleibt stehen
+	2    Frame-Bereich wird transparent gelöscht
+	3    Frame-Bereich wird auf den Zustand davor zurückgesetzt
+
+Ausgabe sind fertige RGBA-Frames in voller Größe – nachgelagerte Stufen
+brauchen keine Modus-Konvertierungen mehr.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Optional
+from PIL import Image
+import numpy as np
+from exceptions import ImageLoadError
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DISPOSAL_NONE = 1
+DISPOSAL_BACKGROUND = 2
+DISPOSAL_PREVIOUS = 3
+
+class GifFormatError(ImageLoadError):
+	"""Datei ist kein (lesbares) GIF"""
+	pass
+
+@dataclass(frozen=True)
+class GifFrameInfo:
+	"""Index-Eintrag eines Frames (ohne Pixeldaten)"""
+	index: int
+	left: int
+	top: int
+	width: int
+	height: int
+	data_start: int
+	data_end: int
+	lzw_bits: int
+	interlace: bool
+	palette: np.ndarray
+	transparency: Optional[int]
+	disposal: int
+	duration: int
+
+def _read_palette(data: bytes, pos: int, packed: int) -> tuple[np.ndarray, int]:
+	"""Liest eine Farbtabelle als (N, 3) uint8-Array"""
+	count = 2 << (packed & 0x07)
+	end = pos + 3 * count
+	if end > len(data):
+		raise GifFormatError("Truncated color table")
+	return np.frombuffer(data, dtype=np.uint8, count=3 * count, offset=pos).reshape(count, 3), end
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+	"""Überspringt Daten-Unterblöcke bis zum Terminator und gibt die Position danach zurück"""
+	while pos < len(data):
+		size = data[pos]
+		pos += 1
+		if size == 0:
+			return pos
+		pos += size
+	return pos
+
+def _parse(data: bytes) -> tuple[tuple[int, int], list[GifFrameInfo], Optional[int]]:
+	"""Indexiert alle Frames: ((Breite, Höhe), Frames, Loop-Anzahl)"""
+	if len(data) < 13 or data[:6] not in (b"GIF87a", b"GIF89a"):
+		raise GifFormatError("Not a GIF file")
+	width = int.from_bytes(data[6:8], "little")
+	height = int.from_bytes(data[8:10], "little")
+	packed = data[10]
+	pos = 13
+	global_palette: Optional[np.ndarray] = None
+	if packed & 0x80:
+		global_palette, pos = _read_palette(data, pos, packed)
+
+	frames: list[GifFrameInfo] = []
+	loop: Optional[int] = None
+	transparency: Optional[int] = None
+	disposal = 0
+	duration = 0
+	while pos < len(data):
+		block = data[pos]
+		pos += 1
+		if block == 0x3B:  # Trailer
+			break
+		if block == 0x21:  # Extension
+			label = data[pos] if pos < len(data) else 0
+			pos += 1
+			if label == 0xF9 and pos + 5 <= len(data) and data[pos] >= 4:
+				gce = data[pos + 1]
+				disposal = (gce >> 2) & 0x07
+				duration = int.from_bytes(data[pos + 2:pos + 4], "little") * 10
+				transparency = data[pos + 4] if gce & 0x01 else None
+			elif label == 0xFF and data[pos:pos + 12] == b"\x0bNETSCAPE2.0" and pos + 16 <= len(data):
+				loop = int.from_bytes(data[pos + 14:pos + 16], "little")
+			pos = _skip_sub_blocks(data, pos)
+			continue
+		if block != 0x2C:
+			# Unbekannter Block: wie Browser das Lesen beenden
+			logger.debug(f"Unexpected GIF block 0x{block:02x} at {pos - 1}, stopping")
+			break
+		if pos + 9 > len(data):
+			break
+		left, top, w, h = (int.from_bytes(data[pos + 2 * i:pos + 2 * i + 2], "little") for i in range(4))
+		fpacked = data[pos + 8]
+		pos += 9
+		palette = global_palette
+		if fpacked & 0x80:
+			palette, pos = _read_palette(data, pos, fpacked)
+		if palette is None:
+			# Ohne Farbtabelle: Graustufen (wie Pillow)
+			palette = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+		if pos >= len(data):
+			break
+		lzw_bits = data[pos]
+		data_start = pos + 1
+		pos = _skip_sub_blocks(data, data_start)
+		frames.append(GifFrameInfo(
+			index=len(frames), left=left, top=top, width=w, height=h,
+			data_start=data_start, data_end=pos, lzw_bits=lzw_bits,
+			interlace=bool(fpacked & 0x40), palette=palette,
+			transparency=transparency, disposal=disposal, duration=duration,
+		))
+		# GCE gilt nur für den nächsten Frame
+		transparency, disposal, duration = None, 0, 0
+	if not frames:
+		raise GifFormatError("GIF contains no frames")
+	return (width, height), frames, loop
+
+class GifDecoder:
+	"""
+	Dekodiert GIF-Frames zu fertigen RGBA-Bildern (volle Leinwandgröße).
+
+	Sequenzieller Zugriff setzt auf dem aktuellen Leinwand-Zustand auf; bei
+	Rücksprüngen wird ab dem nächsten Keyframe davor neu zusammengesetzt.
+	Nicht thread-sicher – Aufrufer (z.B. GifFrameSource) serialisieren.
+	"""
+
+	def __init__(self, data: bytes):
+		"""
+		Args:
+			data: Kompletter Dateiinhalt (komprimiert, daher klein)
+
+		Raises:
+			GifFormatError: Wenn die Daten kein lesbares GIF sind
+		"""
+		self._data = data
+		self.size, self.frames, self.loop = _parse(data)
+		width, height = self.size
+		self._canvas = np.zeros((height, width, 4), dtype=np.uint8)
+		# Gleiche Leinwand als ein uint32 pro Pixel – ein Pixel = ein LUT-Eintrag
+		self._canvas32 = self._canvas.view(np.uint32).reshape(height, width)
+		# Index des zuletzt gezeichneten Frames (-1 = leere Leinwand)
+		self._position = -1
+		self._restore: Optional[np.ndarray] = None
+		self._luts: dict[int, np.ndarray] = {}
+		# Keyframes: deckend über die ganze Leinwand, ohne "restore previous" –
+		# ab dort lässt sich ohne Vorgänger weiterdekodieren
+		self._keyframes = [
+			f.index for f in self.frames
+			if f.transparency is None and f.left == 0 and f.top == 0
+			and f.width >= width and f.height >= height and f.disposal != DISPOSAL_PREVIOUS
+		]
+
+	@classmethod
+	def from_file(cls, path: str) -> "GifDecoder":
+		"""Liest eine GIF-Datei ein und indexiert sie"""
+		with open(path, "rb") as f:
+			return cls(f.read())
+
+	@property
+	def n_frames(self) -> int:
+		return len(self.frames)
+
+	def _lut(self, info: GifFrameInfo) -> np.ndarray:
+		"""RGBA-Paletten-LUT (256 gepackte uint32-Einträge), pro Farbtabelle gecacht"""
+		key = id(info.palette)
+		lut = self._luts.get(key)
+		if lut is None:
+			rgba = np.zeros((256, 4), dtype=np.uint8)
+			count = min(256, len(info.palette))
+			rgba[:count, :3] = info.palette[:count]
+			rgba[:count, 3] = 255
+			lut = rgba.view(np.uint32).reshape(256)
+			self._luts[key] = lut
+		return lut
+
+	def _decode_indices(self, info: GifFrameInfo) -> np.ndarray:
+		"""LZW-Daten eines Frames über Pillows C-Decoder zu Palettenindizes (H, W)"""
+		if info.width == 0 or info.height == 0:
+			return np.zeros((0, 0), dtype=np.uint8)
+		raw = self._data[info.data_start:info.data_end]
+		try:
+			img = Image.frombytes("P", (info.width, info.height), raw, "gif", info.lzw_bits, info.interlace)
+		except ValueError:
+			# Abgeschnittene Frame-Daten: dekodierten Teil behalten, Rest bleibt Index 0
+			decoder = Image._getdecoder("P", "gif", (info.lzw_bits, info.interlace))
+			img = Image.new("P", (info.width, info.height), 0)
+			decoder.setimage(img.im, (0, 0, info.width, info.height))
+			decoder.decode(raw)
+			logger.debug(f"GIF frame {info.index} is truncated")
+		return np.asarray(img)
+
+	def _dispose(self, info: GifFrameInfo) -> None:
+		"""Wendet die Disposal-Methode des zuletzt gezeichneten Frames an"""
+		region = self._region(info)
+		if region is None:
+			return
+		if info.disposal == DISPOSAL_BACKGROUND:
+			self._canvas[region] = 0
+		elif info.disposal == DISPOSAL_PREVIOUS and self._restore is not None:
+			self._canvas[region] = self._restore
+		self._restore = None
+
+	def _region(self, info: GifFrameInfo) -> Optional[tuple[slice, slice]]:
+		"""Auf die Leinwand geclippter Frame-Bereich"""
+		width, height = self.size
+		x0, y0 = min(info.left, width), min(info.top, height)
+		x1, y1 = min(info.left + info.width, width), min(info.top + info.height, height)
+		if x0 >= x1 or y0 >= y1:
+			return None
+		return (slice(y0, y1), slice(x0, x1))
+
+	def _draw(self, info: GifFrameInfo) -> None:
+		"""Zeichnet einen Frame in die Leinwand (einmalige RGBA-Umsetzung per LUT)"""
+		region = self._region(info)
+		if region is None:
+			return
+		if info.disposal == DISPOSAL_PREVIOUS:
+			self._restore = self._canvas[region].copy()
+		h = region[0].stop - region[0].start
+		w = region[1].stop - region[1].start
+		indices = self._decode_indices(info)[:h, :w]
+		target = self._canvas32[region]
+		if info.transparency is None:
+			np.take(self._lut(info), indices, out=target)
+		else:
+			# Transparente Indizes lassen die Leinwand unverändert
+			np.copyto(target, np.take(self._lut(info), indices), where=indices != info.transparency)
+
+	def _advance_to(self, index: int) -> None:
+		if index < self._position or self._position < 0:
+			# Rücksprung: vom nächsten Keyframe davor neu aufbauen
+			start = max((k for k in self._keyframes if k <= index), default=0)
+			self._canvas[...] = 0
+			self._restore = None
+			self._position = start - 1
+		while self._position < index:
+			if self._position >= 0:
+				self._dispose(self.frames[self._position])
+			self._position += 1
+			self._draw(self.frames[self._position])
+
+	def frame(self, index: int) -> Image.Image:
+		"""Liefert Frame `index` als eigenständiges RGBA-Bild"""
+		if not 0 <= index < len(self.frames):
+			raise IndexError(f"GIF frame {index} out of range (0-{len(self.frames) - 1})")
+		self._advance_to(index)
+		return Image.fromarray(self._canvas.copy())
+
+	def frame_into(self, index: int, out: np.ndarray) -> None:
+		"""Schreibt Frame `index` direkt in `out` (H, W, 4 uint8) – ohne Zwischenbild, z.B. in eine Mapped-Datei"""
+		if not 0 <= index < len(self.frames):
+			raise IndexError(f"GIF frame {index} out of range (0-{len(self.frames) - 1})")
+		self._advance_to(index)
+		np.copyto(out, self._canvas)
+
+	def __iter__(self) -> Iterator[Image.Image]:
+		for index in range(len(self.frames)):
+			yield self.frame(index)
+
+def decode_gif(data: bytes, max_frames: Optional[int] = None) -> list[Image.Image]:
+	"""Dekodiert alle (bzw. max_frames) Frames eines GIFs zu RGBA-Bildern"""
+	decoder = GifDecoder(data)
+	count = decoder.n_frames if max_frames is None else min(decoder.n_frames, max_frames)
+	return [decoder.frame(i) for i in range(count)]
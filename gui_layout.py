@@ -5,13 +5,14 @@
 ###
 
 import re
+from functools import lru_cache
 import tkinter as tk
 from tkinter import ttk
-from PIL import Image, ImageDraw, ImageTk
+from PIL import Image, ImageTk
 from translations import tr
 from tooltip import ToolTip
 from logging_config import get_logger
-from events import reset_settings
+from events import _get_change_coalescer, reset_settings, start_memory_status
 
 logger = get_logger(__name__)
 
@@ -238,18 +239,10 @@ def create_menubar(self):
 	return menubar
 
 # === Hilfsfunktion für Transparenz-Anzeige ===
-def create_checkerboard_with_color(hex_color, alpha=255, size=24, checker_size=4):
-	"""
-	Erstellt ein Schachbrett-Muster mit einer Farbe, die Transparenz anzeigt.
-	hex_color: z.B. "#FF0000"
-	alpha: 0-255 (0=transparent, 255=undurchsichtig)
-	size: Größe des Bildes in Pixeln
-	checker_size: Größe der Schachbrett-Quadrate
-	"""
-	# Schachbrett-Farben (grau/weiß)
-	checker_light = (200, 200, 200)
-	checker_dark = (100, 100, 100)
-	
+@lru_cache(maxsize=32)
+def _checkerboard_swatch(hex_color, alpha, size, checker_size):
+	"""Farbfeld über Schachbrett als PIL-Image (gecacht, nicht verändern)"""
+	from image_processing import checkerboard_image
 	# Farbe parsen
 	try:
 		r = int(hex_color[1:3], 16)
@@ -257,25 +250,21 @@ def create_checkerboard_with_color(hex_color, alpha=255, size=24, checker_size=4
 		b = int(hex_color[5:7], 16)
 	except:
 		r, g, b = 0, 0, 0
-	
-	# Bild mit RGBA-Modus erstellen
-	img = Image.new("RGBA", (size, size), (255, 255, 255, 0))
-	draw = ImageDraw.Draw(img)
-	
-	# Schachbrett zeichnen
-	for y in range(0, size, checker_size):
-		for x in range(0, size, checker_size):
-			if ((x // checker_size) + (y // checker_size)) % 2 == 0:
-				color = checker_light
-			else:
-				color = checker_dark
-			draw.rectangle([x, y, x + checker_size, y + checker_size], fill=color + (255,))
-	
+	# Schachbrett-Farben (grau/dunkelgrau)
+	img = checkerboard_image((size, size), checker_size, (200, 200, 200), (100, 100, 100))
 	# Farbe mit Alpha über Schachbrett legen
 	overlay = Image.new("RGBA", (size, size), (r, g, b, alpha))
-	img = Image.alpha_composite(img, overlay)
-	
-	return ImageTk.PhotoImage(img)
+	return Image.alpha_composite(img, overlay)
+
+def create_checkerboard_with_color(hex_color, alpha=255, size=24, checker_size=4):
+	"""
+	Erstellt ein Schachbrett-Muster mit einer Farbe, die Transparenz anzeigt.
+	hex_color: z.B. "#FF0000"
+	alpha: 0-255 (0=transparent, 255=undurchsichtig)
+	size: Größe des Bildes in Pixeln
+	checker_size: Größe der Schachbrett-Quadrate
+	"""
+	return ImageTk.PhotoImage(_checkerboard_swatch(hex_color, int(alpha), int(size), int(checker_size)))
 
 def create_effects_panel(self, parent, prefix):
 	settings_icon = "⚙"
@@ -651,14 +640,10 @@ def build_layout(self):
 	self.size_preset_combo.pack(side=tk.LEFT, padx=(6, 0))
 	self.tooltips['size_preset_combo'] = ToolTip(self.size_preset_combo, tr('tt_size_preset_combo', self.lang))
 
-	# Preview auch bei manueller Eingabe aktualisieren
+	# Preview auch bei manueller Eingabe aktualisieren (gebündelt: Tippen löst einen Neuaufbau aus)
 	def _update_preview_if_gif_loaded(*args):
 		if hasattr(self, 'gif_image') and self.gif_image is not None:
-			try:
-				from image_processing import show_texture
-				show_texture(self)
-			except Exception as e:
-				logger.debug(f"Failed to update texture preview: {type(e).__name__}: {e}", exc_info=False)
+			_get_change_coalescer(self).mark("texture")
 	self.width_var.trace_add('write', _update_preview_if_gif_loaded)
 	self.height_var.trace_add('write', _update_preview_if_gif_loaded)
 
@@ -860,8 +845,12 @@ def build_layout(self):
 	# --- Status-Gruppe ---
 	self.status_group = ttk.LabelFrame(main_inner, text=f"📋 {tr('status', self.lang) or 'Status'}")
 	self.status_group.pack(fill=tk.X, padx=10, pady=(5,5))
+	self.memory_label = ttk.Label(self.status_group, text="", anchor="e")
+	self.memory_label.pack(side=tk.RIGHT, padx=(8, 0))
+	self.tooltips['memory_label'] = ToolTip(self.memory_label, "")
 	self.status = ttk.Label(self.status_group, text=tr('ready', self.lang) or "Bereit", anchor="w")
 	self.status.pack(fill=tk.X)
+	start_memory_status(self)
 
 	# Übersetzung für Randlos-Label und Tooltip erfolgt ausschließlich in update_language für Konsistenz
 
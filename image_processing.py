@@ -6,82 +6,87 @@
 
 
 from typing import Any, List, Optional, Literal, Tuple
+from functools import lru_cache
 from PIL import Image, ImageTk
-from PIL import ImageColor, ImageEnhance, ImageFilter
-import math
-import os
-import threading
-import queue
-from threading_utils import gif_queue, texture_queue
+from PIL import ImageEnhance, ImageFilter
+import numpy as np
+from threading_utils import UiDispatcher
 from logging_config import get_logger
-from exceptions import ImageProcessingError, TextureGenerationError, ThreadingError
-from app_types import RGBAColor, EffectConfig, GIFFrameList, TextureData, ModernAppProtocol
-from worker_pool import get_worker_pool
+from exceptions import ImageProcessingError, TaskCancelledError, TextureGenerationError
+from app_types import RGBAColor, GIFFrameList, ModernAppProtocol
+from texture_engine import (
+	EffectConfig,
+	SheetCompositor,
+	SheetSpec,
+	apply_effect_config,
+	calculate_optimal_grid,
+	frame_token,
+	parse_bg_color,
+	scale_sheet,
+)
+from worker_pool import TaskPriority, current_token, get_worker_pool
+from effect_cache import get_effect_cache
+from display_cache import DisplayCache
+from memory_budget import get_memory_accountant
+from tile_pool import get_tile_pool
+from disk_cache import frames_digest, get_disk_cache, load_sheet, sheet_key, store_sheet
 from event_bus import get_event_bus, EventType
+from perf import NULL_TIMER, StageTimer, traced
 
 logger = get_logger(__name__)
 
-def calculate_optimal_grid(frame_count: int, prefer_single_row_odd: bool = True) -> tuple[int, int]:
+def _get_sheet_compositor(self: Any, draft: bool = False) -> SheetCompositor:
+	"""Gibt den SheetCompositor der App zurück (Entwurf oder genau; wird beim ersten Aufruf angelegt)."""
+	attr = '_draft_compositor' if draft else '_sheet_compositor'
+	compositor = getattr(self, attr, None)
+	if compositor is None:
+		compositor = SheetCompositor(cache=get_effect_cache(), draft=draft)
+		setattr(self, attr, compositor)
+	return compositor
+
+def _get_display_cache(self: Any) -> DisplayCache:
+	"""Gibt den DisplayCache der App zurück (Budget aus config 'display_cache_mb', Tk-Thread)."""
+	cache = getattr(self, '_display_cache', None)
+	if cache is None:
+		from config_manager import get_config
+		max_mb = int(get_config().get('display_cache_mb'))
+		cache = DisplayCache(max_bytes=max_mb * 1024 * 1024)
+		self._display_cache = cache
+		# Nur messen: PhotoImages dürfen nur im Tk-Thread verworfen werden
+		get_memory_accountant().register("display_cache", cache.nbytes)
+	return cache
+
+def gif_display_variant(self: Any) -> Tuple[int, int, EffectConfig]:
 	"""
-	Berechnet optimale Raster-Aufteilung für Frames.
-	Bevorzugt Layouts ohne Verschwendung (leere Zellen) und möglichst quadratische Form.
-	
-	Beispiele:
-	- 10 Frames: 5x2 (besser als 4x3 mit 2 leeren Zellen)
-	- 16 Frames: 4x4 (perfekt quadratisch)
-	- 15 Frames: 5x3 (besser als 4x4 mit 1 leerer Zelle)
-	
-	Returns:
-		(tiles_x, tiles_y) - Anzahl Spalten und Zeilen
+	Variante der GIF-Anzeige im Tk-Thread: (max_w, max_h, normalisierte Effekte).
+	Schlüssel des DisplayCache und Eingabe für `render_gif_preview`.
 	"""
-	if frame_count <= 0:
-		return (1, 1)
-	if frame_count == 1:
-		return (1, 1)
-	
-	# Finde beste Faktorisierung
-	best_x, best_y = 1, frame_count
-	best_waste = frame_count - 1  # Maximal mögliche Verschwendung
-	best_ratio = float('inf')
-	
-	# Prüfe alle möglichen Aufteilungen bis sqrt(frame_count)
-	# Wir müssen nur bis sqrt prüfen, da darüber hinaus die Faktoren sich wiederholen
-	max_check = int(math.sqrt(frame_count * 2)) + 1  # Etwas Puffer für nicht-perfekte Quadrate
-	
-	for x in range(1, max_check + 1):
-		y = math.ceil(frame_count / x)
-		total_cells = x * y
-		waste = total_cells - frame_count
-		ratio = max(x, y) / min(x, y)  # Seitenverhältnis (>=1)
-		
-		# Entscheidungskriterien (Priorität absteigend):
-		# 1. Minimiere Verschwendung (leere Zellen)
-		# 2. Bei gleicher Verschwendung: bevorzuge quadratischere Form
-		is_better = False
-		if waste < best_waste:
-			is_better = True
-		elif waste == best_waste and ratio < best_ratio:
-			is_better = True
-		
-		if is_better:
-			best_x, best_y = x, y
-			best_waste = waste
-			best_ratio = ratio
-	
-	# Optional: Bei ungerader Frame-Zahl nicht einreihig anordnen.
-	# Beispiel: 5 Frames -> 3x2 statt 5x1
-	if not prefer_single_row_odd and frame_count > 3 and frame_count % 2 == 1 and min(best_x, best_y) == 1:
-		compact_x = math.ceil(math.sqrt(frame_count))
-		compact_y = math.ceil(frame_count / compact_x)
-		best_x, best_y = compact_x, compact_y
-
-	# Stelle sicher, dass tiles_x >= tiles_y (mehr Spalten als Zeilen)
-	if best_x < best_y:
-		best_x, best_y = best_y, best_x
-	
-	return (best_x, best_y)
+	max_w, max_h = gif_preview_box(
+		self.gif_canvas.winfo_width(), self.gif_canvas.winfo_height(),
+		self.texture_canvas.winfo_width(), self.texture_canvas.winfo_height(),
+	)
+	return max_w, max_h, EffectConfig.from_app(self, "gif").normalized()
 
-def create_smart_scaled_texture(self: ModernAppProtocol, target_w: int, target_h: int, bg_rgba: RGBAColor, preview_mode: bool = True) -> Image.Image:
+def _get_ui_dispatcher(self: Any) -> UiDispatcher:
+	"""
+	Gibt den UiDispatcher der App zurück (wird beim ersten Aufruf im Tk-Thread angelegt).
+	Kanäle: "gif_frame" (GIF-Vorschau) und "texture_preview" (Textur-Vorschau).
+	"""
+	dispatcher = getattr(self, '_ui_dispatcher', None)
+	if dispatcher is None:
+		dispatcher = UiDispatcher(self.root)
+		dispatcher.register("gif_frame", lambda frame: _display_gif_frame(self, frame))
+		dispatcher.register("texture_preview", lambda preview: _display_texture_preview(self, preview))
+		self._ui_dispatcher = dispatcher
+	return dispatcher
+
+def _deliver(self: Any, channel: str, value: Any) -> None:
+	"""Übergibt ein Worker-Ergebnis an den Tk-Thread (neuestes Ergebnis pro Kanal gewinnt)"""
+	dispatcher = getattr(self, '_ui_dispatcher', None)
+	if dispatcher is not None:
+		dispatcher.post(channel, value)
+
+def create_smart_scaled_texture(self: ModernAppProtocol, target_w: int, target_h: int, bg_rgba: RGBAColor, preview_mode: bool = True, display_size: Optional[Tuple[int, int]] = None, draft: bool = False, timer: StageTimer = NULL_TIMER, use_disk_cache: bool = False) -> Image.Image:
 	"""
 	Erstellt eine Texture mit intelligenter Skalierung:
 	1. Berechnet optimale Größe basierend auf Frame-Größen
@@ -94,12 +99,20 @@ def create_smart_scaled_texture(self: ModernAppProtocol, target_w: int, target_h
 		target_h: Zielhöhe
 		bg_rgba: Hintergrundfarbe
 		preview_mode: True = nur Arbeitsbild (schnell), False = auf Zielgröße skalieren
+		display_size: Nur Vorschau – Sheet direkt höchstens in dieser Größe aus
+			verkleinerten Kacheln setzen (statt in voller Größe)
+		draft: Nur Vorschau – schneller Entwurf (BOX statt LANCZOS, gecachte Kacheln bevorzugt)
+		timer: Optional – misst decode/effects/compose/resize für Event-Payloads
+		use_disk_cache: Nur Speichern – fertiges Sheet bei unveränderten Frames und
+			Einstellungen aus dem DiskCache lesen bzw. dort ablegen
 	
 	Returns:
 		Arbeitsbild (preview_mode=True) oder skalierte Texture (preview_mode=False)
+	
+	Raises:
+		TextureGenerationError: Nur beim Speichern (preview_mode=False) – keine leere Ersatz-Textur
 	"""
 	try:
-		frame_count = self.frame_count
 		prefer_single_row_odd = True
 		odd_row_var = getattr(self, 'odd_frames_single_row_var', None)
 		if odd_row_var is not None:
@@ -107,61 +120,89 @@ def create_smart_scaled_texture(self: ModernAppProtocol, target_w: int, target_h
 				prefer_single_row_odd = bool(odd_row_var.get())
 			except Exception:
 				prefer_single_row_odd = True
-		tiles_x, tiles_y = calculate_optimal_grid(frame_count, prefer_single_row_odd=prefer_single_row_odd)
-		
-		# Ermittle durchschnittliche Frame-Größe
-		if self.gif_frames:
-			first_frame = self.gif_frames[0]
-			frame_w, frame_h = first_frame.size
-		else:
-			frame_w, frame_h = 256, 256
 		
-		# STEP 1: Berechne optimale Texture-Größe (ohne Ränder)
-		optimal_w = tiles_x * frame_w
-		optimal_h = tiles_y * frame_h
+		# Einstellungen EINMAL aus den Tk-Variablen lesen, danach läuft alles headless
+		spec = SheetSpec.for_frames(self.gif_frames, bg_rgba, prefer_single_row_odd=prefer_single_row_odd)
+		effects = EffectConfig.from_app(self, "texture")
+		optimal_w, optimal_h = spec.size
 		
 		if preview_mode:
 			logger.info(f"Smart scale (preview): Optimal size {optimal_w}x{optimal_h}")
 		else:
 			logger.info(f"Smart scale (save): Optimal size {optimal_w}x{optimal_h} → Target size {target_w}x{target_h}")
 		
-		# STEP 2: Erstelle Texture in optimaler Größe
-		optimal_sheet = Image.new("RGBA", (optimal_w, optimal_h), bg_rgba)
-		
-		for idx, frame in enumerate(self.gif_frames):
-			tx = idx % tiles_x
-			ty = idx // tiles_x
-			
-			# Frame mit Effekten, aber in Original-Größe
-			f = apply_effects(self, frame, prefix="texture")
-			
-			# Stelle sicher dass f RGBA ist
-			if f.mode != "RGBA":
-				f = f.convert("RGBA")
-			
-			# Position berechnen
-			x = tx * frame_w
-			y = ty * frame_h
-			
-			# Frame direkt platzieren (ohne Resize)
-			sheet_patch = optimal_sheet.crop((x, y, x + frame_w, y + frame_h))
-			blended_patch = Image.alpha_composite(sheet_patch, f)
-			optimal_sheet.paste(blended_patch, (x, y))
+		# STEP 1+2: Texture in optimaler Größe (Frames mit Effekten, ohne Resize)
+		if preview_mode:
+			# Der Compositor setzt nur geänderte Kacheln neu (z.B. Bild hinzufügen/entfernen),
+			# mit display_size direkt in Anzeigegröße
+			compositor = _get_sheet_compositor(self, draft=draft)
+			optimal_sheet = compositor.compose(self.gif_frames, spec, effects, check_cancelled=current_token().raise_if_cancelled, display_size=display_size, timer=timer)
+			logger.debug(f"Sheet composed at {optimal_sheet.size} ({compositor.last_dirty_cells} dirty cells)")
+			return optimal_sheet
+
+		# Volles Sheet nur zum Speichern; der Vorschau-Zustand des Compositors bleibt erhalten
+		disk_cache = get_disk_cache() if use_disk_cache else None
+		key = None
+		if disk_cache is not None:
+			try:
+				with timer.stage("cache"):
+					key = sheet_key(frames_digest(self.gif_frames), spec, effects, (target_w, target_h))
+					cached_sheet = load_sheet(disk_cache, key)
+			except Exception as e:
+				# Der Cache darf das Speichern nie verhindern
+				logger.warning(f"Disk cache lookup failed: {type(e).__name__}: {e}")
+				key = cached_sheet = None
+			if cached_sheet is not None:
+				logger.info(f"Smart scale (save): {target_w}x{target_h} sheet from disk cache")
+				return cached_sheet
+		# Vorher Platz für Frame-Block, Atlas samt Kopie und skalierte Kopie schaffen (Caches/Frame-Fenster verkleinern)
+		get_memory_accountant().ensure((3 * optimal_w * optimal_h + target_w * target_h) * 4)
+		# Kacheln parallel über alle Kerne (kleine Sheets bleiben im eigenen Prozess)
+		sheet = get_tile_pool().compose(self.gif_frames, spec, effects, cache=get_effect_cache(), timer=timer)
 		
-		# STEP 3: Skaliere auf Zielgröße (nur wenn nicht preview_mode)
-		if not preview_mode and (optimal_w, optimal_h) != (target_w, target_h):
-			scaled_sheet = optimal_sheet.resize((target_w, target_h), Image.Resampling.LANCZOS)
+		# STEP 3: Skaliere auf Zielgröße
+		if (optimal_w, optimal_h) != (target_w, target_h):
 			logger.debug(f"Scaled from {optimal_w}x{optimal_h} to {target_w}x{target_h}")
-			return scaled_sheet
-		else:
-			return optimal_sheet
+			with timer.stage("resize"):
+				sheet = scale_sheet(sheet, target_w, target_h)
+		if disk_cache is not None and key is not None:
+			with timer.stage("cache"):
+				store_sheet(disk_cache, key, sheet)
+		return sheet
 		
+	except TaskCancelledError:
+		raise
 	except Exception as e:
+		if not preview_mode:
+			# Beim Speichern nie eine leere Textur schreiben – save_texture meldet den Fehler
+			raise TextureGenerationError(f"Texture generation failed: {type(e).__name__}: {e}") from e
 		logger.error(f"Smart scale failed: {e}", exc_info=True)
 		# Fallback: Leere Textur zurückgeben
 		fallback_sheet = Image.new("RGBA", (target_w, target_h), bg_rgba)
 		return fallback_sheet
 
+@lru_cache(maxsize=8)
+def checkerboard_image(size: Tuple[int, int], square_size: int = 8, light: Tuple[int, int, int] = (200, 200, 200), dark: Tuple[int, int, int] = (255, 255, 255)) -> Image.Image:
+	"""
+	Opakes RGBA-Schachbrett, per NumPy erzeugt und pro (Größe, Quadratgröße, Farben) gecacht.
+	Das Bild wird geteilt und darf nicht verändert werden.
+
+	Args:
+		size: (width, height) des Bildes
+		square_size: Kantenlänge eines Quadrats in Pixeln
+		light: Farbe der Quadrate oben links (und jedes zweiten)
+		dark: Farbe der übrigen Quadrate
+	"""
+	width, height = size
+	square_size = max(1, square_size)
+	# Paritätsmaske: (x // s + y // s) % 2 als XOR der Zeilen-/Spaltenparität
+	cols = (np.arange(width) // square_size) & 1
+	rows = (np.arange(height) // square_size) & 1
+	parity = rows[:, None] ^ cols[None, :]
+	# Ein uint32 pro Pixel (gepacktes RGBA) statt vier Kanal-Zuweisungen
+	palette = np.array([light + (255,), dark + (255,)], dtype=np.uint8).view(np.uint32)[:, 0]
+	return Image.fromarray(palette[parity].view(np.uint8).reshape(height, width, 4))
+
 def _create_checkerboard_background(size: Tuple[int, int], square_size: int = 8) -> Image.Image:
 	"""
 	Creates a checkerboard pattern background for showing transparency.
@@ -171,30 +212,9 @@ def _create_checkerboard_background(size: Tuple[int, int], square_size: int = 8)
 		square_size: Size of each checkerboard square in pixels
 	
 	Returns:
-		Image with checkerboard pattern
+		Shared RGBA image with checkerboard pattern (hellgrau/weiß, do not modify)
 	"""
-	width, height = size
-	
-	# Erstelle Pixel-Liste für das Schachbrett
-	pixels = []
-	
-	for y in range(height):
-		for x in range(width):
-			# Berechne Position im Schachbrett
-			square_x = (x // square_size) % 2
-			square_y = (y // square_size) % 2
-			
-			# Alterniere zwischen grau und weiß
-			if (square_x + square_y) % 2 == 0:
-				pixels.append((200, 200, 200))  # Hellgrau
-			else:
-				pixels.append((255, 255, 255))  # Weiß
-	
-	# Erstelle und fülle das Bild
-	img = Image.new('RGB', size)
-	img.putdata(pixels)
-	
-	return img
+	return checkerboard_image(tuple(size), square_size)
 
 def _apply_bg_to_image_with_transparency(self: Any, img: Image.Image, show_transparency: bool = True) -> Image.Image:
 	"""
@@ -218,11 +238,9 @@ def _apply_bg_to_image_with_transparency(self: Any, img: Image.Image, show_trans
 		
 		# Wenn show_transparency, nutze Schachbrett statt Hintergrundfarbe
 		if show_transparency:
-			# Erstelle Schachbrett-Hintergrund als RGBA (muss gleicher Mode sein!)
+			# Gecachter RGBA-Schachbrett-Hintergrund (muss gleicher Mode sein!)
 			checkerboard = _create_checkerboard_background(img.size, square_size=8)
-			# Konvertiere zu RGBA für alpha_composite
-			checkerboard = checkerboard.convert('RGBA')
-			# Composite image über Schachbrett
+			# Composite image über Schachbrett (erzeugt ein neues Bild, Cache bleibt unverändert)
 			result = Image.alpha_composite(checkerboard, img)
 			# Zu RGB für Tkinter
 			return result.convert('RGB')
@@ -242,25 +260,7 @@ def _apply_bg_to_image(self: Any, img: Image.Image) -> Image.Image:
 	
 	try:
 		# Hintergrundfarbe parsen
-		bg_color = getattr(self, 'bg_color', '#00000000')
-		bg_rgba: tuple[int, int, int, int] = (0, 0, 0, 0)
-		
-		try:
-			if isinstance(bg_color, str) and len(bg_color) == 9 and bg_color.startswith('#'):
-				# Format: #RRGGBBAA
-				r = int(bg_color[1:3], 16)
-				g = int(bg_color[3:5], 16)
-				b = int(bg_color[5:7], 16)
-				a = int(bg_color[7:9], 16)
-				bg_rgba = (r, g, b, a)
-			elif isinstance(bg_color, str) and len(bg_color) == 7 and bg_color.startswith('#'):
-				# Format: #RRGGBB (vollständig undurchsichtig)
-				r = int(bg_color[1:3], 16)
-				g = int(bg_color[3:5], 16)
-				b = int(bg_color[5:7], 16)
-				bg_rgba = (r, g, b, 255)
-		except Exception:
-			bg_rgba = (0, 0, 0, 0)
+		bg_rgba = parse_bg_color(getattr(self, 'bg_color', '#00000000'))
 		
 		# Wenn Hintergrund vollständig transparent, nicht zusammenmischen
 		if bg_rgba[3] == 0:
@@ -324,51 +324,80 @@ def _resize_to_fit(img: Image.Image, target_w: int, target_h: int) -> Image.Imag
 	
 	return background
 
-def _process_gif_frame_worker(self: ModernAppProtocol, current_frame: int, canvas_w: int, canvas_h: int, texture_w: int, texture_h: int) -> None:
-	"""Worker-Thread für GIF-Frame-Verarbeitung"""
+def gif_preview_box(canvas_w: int, canvas_h: int, texture_w: int, texture_h: int) -> Tuple[int, int]:
+	"""Maximale Anzeigegröße der GIF-Vorschau (nicht größer als die Textur-Vorschau)"""
+	max_w = min(canvas_w, texture_w) if texture_w > 10 else canvas_w
+	max_h = min(canvas_h, texture_h) if texture_h > 10 else canvas_h
+	if max_w < 10 or max_h < 10:
+		max_w, max_h = 256, 256
+	return max_w, max_h
+
+def render_gif_preview(frames: GIFFrameList, index: int, max_w: int, max_h: int, effects: EffectConfig) -> Image.Image:
+	"""
+	Anzeigefertiger GIF-Frame: proportional skaliert mit Letterboxing, Effekte angewendet.
+	Bereits gesehene Frames (gleiche Größe + Effekte) kommen aus dem Cache,
+	dekodiert wird nur bei einem Cache-Miss. Läuft ohne Tk-Zugriffe (Worker-tauglich).
+
+	Veröffentlicht GIF_FRAME_LOADED mit den Stufenzeiten (leer bei einem Cache-Treffer).
+	"""
+	timer = StageTimer("gif.frame")
+
+	def render() -> Image.Image:
+		with timer.stage("decode"):
+			frame = frames[index]
+		with timer.stage("resize"):
+			resized = _resize_to_fit(frame, max_w, max_h)
+		with timer.stage("effects"):
+			return apply_effect_config(resized, effects)
+
+	image = get_effect_cache().get_or_compute(frame_token(frames, index), effects, render, variant=("gif_preview", max_w, max_h))
+	if timer.durations:
+		# Cache-Treffer nicht aufzeichnen – sie verzerren die Perzentile
+		timer.record(index=index)
+	get_event_bus().publish(
+		EventType.GIF_FRAME_LOADED,
+		data={
+			'index': index,
+			'frame_count': len(frames),
+			'display_size': image.size,
+			'cached': not timer.durations,
+			'durations_ms': timer.as_ms(),
+			'total_ms': timer.elapsed_ms(),
+		},
+		source='image_processing',
+	)
+	return image
+
+def _process_gif_frame_worker(self: ModernAppProtocol, frames: GIFFrameList, current_frame: int, variant: Tuple[int, int, EffectConfig]) -> None:
+	"""Worker-Thread für GIF-Frame-Verarbeitung (Variante wurde im Tk-Thread ermittelt)"""
 	try:
-		if not self.gif_frames or current_frame < 0 or current_frame >= len(self.gif_frames):
-			gif_queue.put((self, None))
+		if not frames or current_frame < 0 or current_frame >= len(frames):
 			return
 		
-		frame = self.gif_frames[current_frame]
-		max_w = min(canvas_w, texture_w) if texture_w > 10 else canvas_w
-		max_h = min(canvas_h, texture_h) if texture_h > 10 else canvas_h
-		if max_w < 10 or max_h < 10:
-			max_w, max_h = 256, 256
-		
-		# Skaliere mit proportionalem Seitenverhältnis und Letterboxing
-		frame = _resize_to_fit(frame, max_w, max_h)
-		frame = apply_effects(self, frame, prefix="gif")
-		gif_queue.put((self, frame))
+		max_w, max_h, effects = variant
+		frame = render_gif_preview(frames, current_frame, max_w, max_h, effects)
+		_deliver(self, "gif_frame", (frame_token(frames, current_frame), variant, frame))
+		# Lazy Frame-Store: nächste Frames vor dem Abspielkopf vorladen
+		prefetch = getattr(frames, 'prefetch', None)
+		if prefetch is not None:
+			prefetch(current_frame + 1)
 	except MemoryError as e:
 		logger.error(f"Memory error in GIF frame processing: {e}")
-		gif_queue.put((self, None))
 	except Exception as e:
 		logger.error(f"Error in GIF frame processing: {e}", exc_info=True)
-		gif_queue.put((self, None))
 
-def _check_gif_queue(self: ModernAppProtocol) -> None:
-	"""Prüft die GIF-Queue und aktualisiert die Canvas"""
-	try:
-		while True:
-			self_ref, processed_frame = gif_queue.get_nowait()
-			if self_ref is self:
-				if processed_frame is not None:
-					# GIF-Frame ohne Hintergrundfarbe anzeigen (transparent)
-					img = ImageTk.PhotoImage(processed_frame)
-					self._gif_img_ref = img
-					self.gif_canvas.config(image=img)
-				# Textur-Update NICHT bei jedem Frame (zu langsam)
-				# Wird nur bei Frame-Änderungen (Add/Remove) oder Einstellungsänderungen aufgerufen
-				return
-	except queue.Empty:
-		pass  # Kein Element in Queue
-	except Exception as e:
-		logger.error(f"Error processing GIF frame from queue: {type(e).__name__}: {e}", exc_info=False)
-	# Wiederholen
-	if hasattr(self, 'root') and self.root:
-		self.root.after(10, lambda: _check_gif_queue(self))
+def _show_gif_photo(self: ModernAppProtocol, photo: Any) -> None:
+	"""Setzt ein fertiges Anzeigebild in die GIF-Canvas (Tk-Thread)"""
+	# GIF-Frame ohne Hintergrundfarbe anzeigen (transparent)
+	self._gif_img_ref = photo
+	self.gif_canvas.config(image=photo)
+	# Textur-Update NICHT bei jedem Frame (zu langsam)
+	# Wird nur bei Frame-Änderungen (Add/Remove) oder Einstellungsänderungen aufgerufen
+
+def _display_gif_frame(self: ModernAppProtocol, payload: Tuple[Any, Tuple[int, int, EffectConfig], Image.Image]) -> None:
+	"""Zeigt einen fertig gerenderten GIF-Frame an und legt sein PhotoImage im DisplayCache ab (Tk-Thread)"""
+	token, variant, processed_frame = payload
+	_show_gif_photo(self, _get_display_cache(self).put(token, variant, processed_frame))
 
 def show_gif_frame(self: ModernAppProtocol) -> None:
 	"""Zeigt den aktuellen GIF-Frame mit Threading"""
@@ -378,56 +407,53 @@ def show_gif_frame(self: ModernAppProtocol) -> None:
 		return
 	
 	try:
-		canvas_w = self.gif_canvas.winfo_width()
-		canvas_h = self.gif_canvas.winfo_height()
-		texture_w = self.texture_canvas.winfo_width()
-		texture_h = self.texture_canvas.winfo_height()
+		frames = self.gif_frames
+		variant = gif_display_variant(self)
+		# Schon einmal angezeigt (gleiche Größe + Effekte): nur noch blitten
+		photo = _get_display_cache(self).get(frame_token(frames, self.current_frame), variant)
+		if photo is not None:
+			_show_gif_photo(self, photo)
+			return
 		
+		# Ergebnis kommt per UiDispatcher zurück (kein Polling)
+		_get_ui_dispatcher(self)
 		# Worker über Pool starten (nicht neuer Thread jedes Mal)
 		pool = get_worker_pool(max_workers=2)
 		task_name = f"gif_frame_{self.current_frame}"
 		pool.submit(
 			task_name,
 			_process_gif_frame_worker,
-			self, self.current_frame, canvas_w, canvas_h, texture_w, texture_h
+			self, frames, self.current_frame, variant,
+			priority=TaskPriority.INTERACTIVE,
 		)
-		
-		# Queue-Prüfung starten
-		_check_gif_queue(self)
 	except Exception as e:
 		from tkinter import messagebox
 		messagebox.showerror("Fehler", f"Fehler bei GIF-Vorschau: {e}")
 
-def _process_texture_worker(self: ModernAppProtocol) -> None:
-	"""Worker-Thread für Texture-Sheet-Verarbeitung"""
+def _texture_canvas_size(self: ModernAppProtocol) -> Tuple[int, int]:
+	"""Aktuelle Größe der Textur-Canvas (Tk-Thread; 256x256 solange sie noch nicht angezeigt wird)"""
+	canvas_w = self.texture_canvas.winfo_width()
+	canvas_h = self.texture_canvas.winfo_height()
+	if canvas_w < 10 or canvas_h < 10:
+		return 256, 256
+	return canvas_w, canvas_h
+
+def _process_texture_worker(self: ModernAppProtocol, canvas_size: Tuple[int, int]) -> None:
+	"""Worker-Thread für Texture-Sheet-Verarbeitung (canvas_size wird im Tk-Thread gelesen)"""
 	try:
-		from tkinter import messagebox
-		from PIL import ImageColor
-		
 		tex_w = self.width_var.get() if self.width_var.get() > 0 else 2048
 		tex_h = self.height_var.get() if self.height_var.get() > 0 else 2048
 		
 		# Hintergrundfarbe parsen - unterstützt #RRGGBBAA Format
-		bg_color = getattr(self, 'bg_color', '#00000000')
-		bg_rgba: tuple[int, int, int, int] = (0, 0, 0, 0)  # Default: transparent
-		try:
-			if isinstance(bg_color, str) and len(bg_color) == 9 and bg_color.startswith('#'):
-				# Format: #RRGGBBAA
-				r = int(bg_color[1:3], 16)
-				g = int(bg_color[3:5], 16)
-				b = int(bg_color[5:7], 16)
-				a = int(bg_color[7:9], 16)
-				bg_rgba = (r, g, b, a)
-			elif isinstance(bg_color, str) and len(bg_color) == 7 and bg_color.startswith('#'):
-				# Format: #RRGGBB (vollständig undurchsichtig)
-				color_result = ImageColor.getcolor(bg_color, "RGBA")
-				# Stelle sicher, dass wir ein 4er-Tupel haben
-				if isinstance(color_result, tuple) and len(color_result) >= 3:
-					bg_rgba = (int(color_result[0]), int(color_result[1]), int(color_result[2]), 255)
-			else:
-				bg_rgba = (0, 0, 0, 0)
-		except Exception:
-			bg_rgba = (0, 0, 0, 0)
+		bg_rgba = parse_bg_color(getattr(self, 'bg_color', '#00000000'))
+		frame_count = len(self.gif_frames) if self.gif_frames else 0
+		bus = get_event_bus()
+		timer = StageTimer("texture.preview")
+		bus.publish(
+			EventType.TEXTURE_GENERATION_STARTED,
+			data={'frame_count': frame_count, 'target_size': (tex_w, tex_h), 'preview': True},
+			source='image_processing',
+		)
 
 		# Sheet erzeugen
 		try:
@@ -438,80 +464,92 @@ def _process_texture_worker(self: ModernAppProtocol) -> None:
 				sheet = source_image
 				if sheet.mode != "RGBA":
 					sheet = sheet.convert("RGBA")
-				sheet = apply_effects(self, sheet, prefix="texture")
+				with timer.stage("effects"):
+					sheet = apply_effects(self, sheet, prefix="texture")
 			elif not self.gif_frames:
 				sheet = Image.new("RGBA", (tex_w, tex_h), bg_rgba)
 			else:
-				# INTELLIGENTE SKALIERUNG: Arbeitsbild für Vorschau (SCHNELL!)
-				sheet = create_smart_scaled_texture(self, tex_w, tex_h, bg_rgba, preview_mode=True)
+				# INTELLIGENTE SKALIERUNG: Arbeitsbild für Vorschau, direkt in Canvas-Größe
+				# gesetzt (volles Sheet erst beim Speichern). Zuerst ein Sofort-Entwurf,
+				# dann der genaue Durchgang, der ihn ersetzt (abbrechbar durch neuere Einstellungen)
+				with timer.stage("draft"):
+					draft = create_smart_scaled_texture(self, tex_w, tex_h, bg_rgba, preview_mode=True, display_size=canvas_size, draft=True)
+					_deliver_texture_preview(self, draft, canvas_size, Image.Resampling.NEAREST)
+				sheet = create_smart_scaled_texture(self, tex_w, tex_h, bg_rgba, preview_mode=True, display_size=canvas_size, timer=timer)
 			# WICHTIG: Sheet als aktuelle Textur speichern (Arbeitsbild, nicht skaliert)
 			self.texture_image = sheet
+		except TaskCancelledError:
+			# Neuere Einstellungen sind bereits eingereiht – deren Task liefert die Vorschau
+			logger.debug("Texture generation superseded")
+			return
 		except MemoryError as e:
 			logger.error(f"Memory error in texture generation: {e}")
+			bus.publish(EventType.TEXTURE_ERROR, data={'error': f"MemoryError: {e}"}, source='image_processing')
 			sheet = Image.new("RGBA", (tex_w, tex_h), bg_rgba)
 			self.texture_image = sheet
 		except Exception as e:
 			logger.error(f"Error in texture generation: {e}", exc_info=True)
+			bus.publish(EventType.TEXTURE_ERROR, data={'error': f"{type(e).__name__}: {e}"}, source='image_processing')
 			sheet = Image.new("RGBA", (tex_w, tex_h), bg_rgba)
 			self.texture_image = sheet
 
-		# Vorschau erzeugen
-		try:
-			canvas_w = self.texture_canvas.winfo_width()
-			canvas_h = self.texture_canvas.winfo_height()
-			if canvas_w < 10 or canvas_h < 10:
-				canvas_w, canvas_h = 256, 256
-			preview = self.texture_image.resize((canvas_w, canvas_h), Image.Resampling.LANCZOS)
-			texture_queue.put((self, preview))
-		except MemoryError as e:
-			logger.error(f"Memory error in texture preview generation: {e}")
-			texture_queue.put((self, None))
-		except Exception as e:
-			logger.error(f"Error in texture preview generation: {e}", exc_info=True)
-			texture_queue.put((self, None))
+		_deliver_texture_preview(self, self.texture_image, canvas_size, timer=timer)
+		timer.record(frames=frame_count, sheet=f"{sheet.width}x{sheet.height}")
+		bus.publish(
+			EventType.TEXTURE_GENERATED,
+			data={
+				'frame_count': frame_count,
+				'sheet_size': sheet.size,
+				'target_size': (tex_w, tex_h),
+				'preview': True,
+				'durations_ms': timer.as_ms(),
+				'total_ms': timer.elapsed_ms(),
+			},
+			source='image_processing',
+		)
 	except Exception as e:
 		logger.error(f"Fatal error in texture worker thread: {e}", exc_info=True)
-		texture_queue.put((self, None))
 
-def _check_texture_queue(self: ModernAppProtocol) -> None:
-	"""Prüft die Texture-Queue und aktualisiert die Canvas"""
+def _deliver_texture_preview(self: ModernAppProtocol, sheet: Image.Image, canvas_size: Tuple[int, int], resample: Image.Resampling = Image.Resampling.LANCZOS, timer: StageTimer = NULL_TIMER) -> None:
+	"""Bringt ein Sheet auf Canvas-Größe und übergibt es an den Tk-Thread (Vorschau-Sheets haben sie bereits)"""
 	try:
-		while True:
-			self_ref, preview_img = texture_queue.get_nowait()
-			if self_ref is self:
-				if preview_img is not None:
-					# Skaliere Texture proportional auf Canvas-Größe
-					canvas_w = self.texture_canvas.winfo_width()
-					canvas_h = self.texture_canvas.winfo_height()
-					if canvas_w > 10 and canvas_h > 10:
-						preview_img = _resize_to_fit(preview_img, canvas_w, canvas_h)
-					
-					# Zeige Transparenz mit Schachbrett-Muster an
-					display_img = _apply_bg_to_image_with_transparency(self, preview_img, show_transparency=True)
-					img = ImageTk.PhotoImage(display_img)
-					self._texture_img_ref = img
-					self.texture_canvas.config(image=img)
-				return
-	except queue.Empty:
-		pass  # Kein Element in Queue
+		canvas_w, canvas_h = canvas_size
+		preview = sheet
+		if preview.size != (canvas_w, canvas_h):
+			with timer.stage("resize"):
+				preview = preview.resize((canvas_w, canvas_h), resample)
+		_deliver(self, "texture_preview", preview)
+	except MemoryError as e:
+		logger.error(f"Memory error in texture preview generation: {e}")
 	except Exception as e:
-		logger.error(f"Error processing texture from queue: {type(e).__name__}: {e}", exc_info=False)
-	# Wiederholen
-	if hasattr(self, 'root') and self.root:
-		self.root.after(10, lambda: _check_texture_queue(self))
+		logger.error(f"Error in texture preview generation: {e}", exc_info=True)
+
+def _display_texture_preview(self: ModernAppProtocol, preview_img: Image.Image) -> None:
+	"""Zeigt die fertige Textur-Vorschau an (Tk-Thread, über den UiDispatcher)"""
+	# Der Worker liefert bereits in Canvas-Größe – kein zweites Skalieren
+	# Zeige Transparenz mit Schachbrett-Muster an
+	display_img = _apply_bg_to_image_with_transparency(self, preview_img, show_transparency=True)
+	img = ImageTk.PhotoImage(display_img)
+	self._texture_img_ref = img
+	self.texture_canvas.config(image=img)
 
 def show_texture(self: ModernAppProtocol) -> None:
 	"""Erzeugt und zeigt das Texture-Sheet mit Threading"""
+	# Ergebnis kommt per UiDispatcher zurück (kein Polling)
+	_get_ui_dispatcher(self)
 	# Worker über Pool starten (nicht neuer Thread jedes Mal)
 	pool = get_worker_pool(max_workers=2)
+	# Latest wins: eine noch wartende ältere Anfrage wird ersetzt, eine laufende abgebrochen
 	pool.submit(
 		"texture_preview",
 		_process_texture_worker,
-		self
+		self,
+		_texture_canvas_size(self),
+		priority=TaskPriority.INTERACTIVE,
 	)
-	_check_texture_queue(self)
 
 
+@traced("image.apply_effects")
 def apply_effects(self: Any, img: Image.Image, prefix: Literal["gif", "texture"]) -> Image.Image:
 	"""
 	Applies image effects (grayscale, sharpen, blur, transparency, color intensity) to an image.
@@ -520,51 +558,7 @@ def apply_effects(self: Any, img: Image.Image, prefix: Literal["gif", "texture"]
 		ImageProcessingError: If an error occurs during effect application
 	"""
 	try:
-		from PIL import ImageEnhance, ImageFilter
-		if self.__dict__[f'{prefix}_grayscale'].get():
-			# Stelle sicher RGBA
-			if img.mode != "RGBA":
-				img = img.convert("RGBA")
-			# Speichere Alpha-Kanal
-			alpha = img.split()[-1]
-			# Konvertiere RGB zu Graustufen
-			gray = img.convert("L")
-			# Wandle zu RGBA um
-			gray = gray.convert("RGBA")
-			# Stelle ursprüngliche Alpha wieder her
-			gray.putalpha(alpha)
-			img = gray
-		else:
-			if img.mode != "RGBA":
-				img = img.convert("RGBA")
-		if self.__dict__[f'{prefix}_sharpen'].get():
-			factor = self.__dict__[f'{prefix}_sharpen_value'].get()
-			img = ImageEnhance.Sharpness(img).enhance(factor)
-		if self.__dict__[f'{prefix}_blur'].get():
-			radius = self.__dict__[f'{prefix}_blur_value'].get()
-			if radius > 0:
-				img = img.filter(ImageFilter.GaussianBlur(radius))
-		if self.__dict__[f'{prefix}_transparency'].get():
-			value = self.__dict__[f'{prefix}_transparency_value'].get()
-			alpha = img.split()[-1].point(lambda p: int(p * value))
-			img.putalpha(alpha)
-		if self.__dict__[f'{prefix}_colorintensity_active'].get():
-			colorint = self.__dict__[f'{prefix}_colorintensity'].get()
-			if colorint != 0.5:
-				if colorint < 0.5:
-					import numpy as np
-					arr = np.array(img).astype(float)
-					factor = colorint * 2
-					arr[..., :3] = arr[..., :3] * factor + 255 * (1 - factor)
-					if img.mode == "RGBA" or (arr.shape[-1] == 4):
-						img = Image.fromarray(np.clip(arr, 0, 255).astype('uint8'), "RGBA")
-					else:
-						img = Image.fromarray(np.clip(arr, 0, 255).astype('uint8'), "RGB")
-				else:
-					from PIL import ImageEnhance
-					factor = 1.0 + (colorint - 0.5) * 2
-					img = ImageEnhance.Color(img).enhance(factor)
-		return img
+		return apply_effect_config(img, EffectConfig.from_app(self, prefix))
 	except MemoryError as e:
 		logger.error(f"Memory error applying effects to image: {e}")
 		raise ImageProcessingError(f"Memory error applying effects: {str(e)}") from e
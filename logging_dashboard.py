@@ -10,6 +10,10 @@ from typing import Any, Optional, List, Callable
 import logging
 from datetime import datetime
 from collections import deque
+from perf import get_span_recorder
+
+# Aktualisierungsintervall des Profiler-Tabs (ms)
+PROFILER_REFRESH_MS = 1000
 
 class LoggerHandler(logging.Handler):
 	"""Custom logging handler for GUI dashboard"""
@@ -53,6 +57,8 @@ class LoggingDashboard:
 	"""
 	Real-time logging dashboard for monitoring OSSL2Gif errors and warnings.
 	Shows error history, filtering, and search capabilities.
+	The profiler tab shows per-stage p50/p95 latency and the slowest recent
+	operations from the SpanRecorder (perf.py).
 	"""
 	
 	def __init__(self, parent_app: Any):
@@ -76,6 +82,8 @@ class LoggingDashboard:
 		self.text_widget: Optional[tk.Text] = None
 		self.filter_var: Optional[tk.StringVar] = None
 		self.level_var: Optional[tk.StringVar] = None
+		self.stage_tree: Optional[ttk.Treeview] = None
+		self.slowest_tree: Optional[ttk.Treeview] = None
 	
 	def show(self) -> None:
 		"""Opens the logging dashboard"""
@@ -89,8 +97,15 @@ class LoggingDashboard:
 		self.window.title("OSSL2Gif Logging Dashboard" if self.lang == 'en' else "OSSL2Gif Log-Übersicht")
 		self.window.geometry("700x500")
 		
+		notebook = ttk.Notebook(self.window)
+		notebook.pack(fill=tk.BOTH, expand=True)
+		log_tab = ttk.Frame(notebook)
+		notebook.add(log_tab, text="Log")
+		profiler_tab = ttk.Frame(notebook)
+		notebook.add(profiler_tab, text="Profiler")
+		
 		# Toolbar
-		toolbar = ttk.Frame(self.window)
+		toolbar = ttk.Frame(log_tab)
 		toolbar.pack(fill=tk.X, padx=5, pady=5)
 		
 		# Filter level
@@ -117,7 +132,7 @@ class LoggingDashboard:
 		ttk.Button(toolbar, text="Löschen" if self.lang == 'de' else "Clear", command=self._clear_logs).pack(side=tk.LEFT, padx=5)
 		
 		# Text widget with scrollbar
-		frame = ttk.Frame(self.window)
+		frame = ttk.Frame(log_tab)
 		frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 		
 		scrollbar = ttk.Scrollbar(frame)
@@ -143,6 +158,63 @@ class LoggingDashboard:
 		
 		# Initial display
 		self._update_display()
+		
+		self._build_profiler_tab(profiler_tab)
+		self._refresh_profiler()
+	
+	def _build_profiler_tab(self, parent: ttk.Frame) -> None:
+		"""Tables for per-stage latency percentiles and the slowest recent operations"""
+		en = self.lang == 'en'
+		toolbar = ttk.Frame(parent)
+		toolbar.pack(fill=tk.X, padx=5, pady=5)
+		ttk.Button(toolbar, text="Refresh" if en else "Aktualisieren", command=self._update_profiler).pack(side=tk.LEFT, padx=5)
+		ttk.Button(toolbar, text="Clear" if en else "Löschen", command=self._clear_spans).pack(side=tk.LEFT, padx=5)
+		if not get_span_recorder().enabled:
+			ttk.Label(toolbar, text="Tracing disabled (perf_tracing)" if en else "Tracing deaktiviert (perf_tracing)").pack(side=tk.LEFT, padx=5)
+		
+		ttk.Label(parent, text="Stages" if en else "Stufen").pack(anchor="w", padx=5)
+		self.stage_tree = ttk.Treeview(parent, columns=("count", "p50", "p95", "max"), height=8)
+		self.stage_tree.heading("#0", text="Stage" if en else "Stufe")
+		for column, title in (("count", "n"), ("p50", "p50 ms"), ("p95", "p95 ms"), ("max", "max ms")):
+			self.stage_tree.heading(column, text=title)
+			self.stage_tree.column(column, width=80, anchor="e")
+		self.stage_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+		
+		ttk.Label(parent, text="Slowest operations" if en else "Langsamste Operationen").pack(anchor="w", padx=5)
+		self.slowest_tree = ttk.Treeview(parent, columns=("duration", "time", "details"), height=8)
+		self.slowest_tree.heading("#0", text="Operation")
+		self.slowest_tree.heading("duration", text="ms")
+		self.slowest_tree.heading("time", text="Time" if en else "Zeit")
+		self.slowest_tree.heading("details", text="Details")
+		self.slowest_tree.column("duration", width=80, anchor="e")
+		self.slowest_tree.column("time", width=80)
+		self.slowest_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+	
+	def _update_profiler(self) -> None:
+		"""Fills both profiler tables from the SpanRecorder"""
+		if not self.stage_tree or not self.slowest_tree:
+			return
+		recorder = get_span_recorder()
+		self.stage_tree.delete(*self.stage_tree.get_children())
+		for name, stats in recorder.stage_stats().items():
+			self.stage_tree.insert("", tk.END, text=name, values=(stats['count'], f"{stats['p50_ms']:.1f}", f"{stats['p95_ms']:.1f}", f"{stats['max_ms']:.1f}"))
+		self.slowest_tree.delete(*self.slowest_tree.get_children())
+		for span in recorder.slowest(limit=15):
+			details = ", ".join(f"{key}={value}" for key, value in span.attrs.items())
+			timestamp = datetime.fromtimestamp(span.timestamp).strftime("%H:%M:%S")
+			self.slowest_tree.insert("", tk.END, text=span.name, values=(f"{span.duration_ms:.1f}", timestamp, details))
+	
+	def _refresh_profiler(self) -> None:
+		"""Periodic refresh while the dashboard window is open"""
+		if self.window is None or not self.window.winfo_exists():
+			return
+		self._update_profiler()
+		self.window.after(PROFILER_REFRESH_MS, self._refresh_profiler)
+	
+	def _clear_spans(self) -> None:
+		"""Clear recorded spans"""
+		get_span_recorder().clear()
+		self._update_profiler()
 	
 	def _setup_colors(self) -> None:
 		"""Setup text colors for different log levels"""
@@ -10,14 +10,16 @@ from PIL import Image, ImageTk
 import math
 import atexit
 import logging
-from typing import Optional, List, Any
+from typing import Optional, Any, MutableSequence
 from config import load_config, save_config
 from translations import tr
 from gui_layout import build_layout, create_effects_panel, normalize_label_text
 from image_processing import apply_effects, show_gif_frame, show_texture
+from playback import PlaybackEngine
 from file_ops import load_gif, save_gif, save_texture, load_texture, export_lsl
-from events import reset_settings, change_language, on_maxframes_changed, add_selected_frame_to_texture, choose_bg_color, set_transparent_bg, on_bg_transparency_changed, apply_background_from_config
+from events import _get_change_coalescer, reset_settings, change_language, on_maxframes_changed, add_selected_frame_to_texture, choose_bg_color, set_transparent_bg, on_bg_transparency_changed, apply_background_from_config
 from logging_config import get_logger
+from texture_engine import APP_VERSION
 try:
     from tkinterdnd2 import DND_FILES
     TKDND_AVAILABLE = True
@@ -84,7 +86,7 @@ except Exception as e:
     DEFAULT_LANGUAGE = 'unknown'
 
 LANGUAGES = ['de', 'en', 'fr', 'es', 'it', 'ru', 'nl', 'se', 'pl', 'pt', 'uk', 'ja', 'zh']
-Version = "2.3.0"
+Version = APP_VERSION
 
 # ============================================================================
 # FENSTERGRÖSSENEINSTELLUNGEN - HIER KÖNNEN WERTE MANUELL ANGEPASST WERDEN
@@ -109,58 +111,22 @@ WindowsSize = f"{WINDOW_MIN_WIDTH}x{WINDOW_BASE_HEIGHT}"
 class ModernApp:
     def _bind_effects_panel_events(self):
         """Bindet alle Effekt-Einstellungen an ihre jeweiligen Update-Funktionen."""
-        # Hilfsfunktion: Trace auf Variable-Änderung mit sofortiger Aktualisierung
-        def create_trace_callback(effect_type, is_gif=True):
-            def callback(*args):
-                if is_gif:
-                    self._apply_gif_effect(effect_type)
-                else:
-                    self._apply_texture_effect(effect_type)
-            return callback
-        
-        # GIF-Effekte binding
-        for effect in ['grayscale', 'sharpen', 'blur', 'transparency', 'colorintensity_active']:
-            var_name = f'gif_{effect}'
-            if hasattr(self, var_name):
-                var = getattr(self, var_name)
-                var.trace_add('write', create_trace_callback(effect.replace('_active', ''), is_gif=True))
-        
-        # GIF-Wert-Slider binding
-        for effect in ['sharpen_value', 'blur_value', 'transparency_value', 'colorintensity']:
-            var_name = f'gif_{effect}'
-            if hasattr(self, var_name):
-                var = getattr(self, var_name)
-                var.trace_add('write', create_trace_callback(effect, is_gif=True))
-        
-        # Textur-Effekte binding
-        for effect in ['grayscale', 'sharpen', 'blur', 'transparency', 'colorintensity_active']:
-            var_name = f'texture_{effect}'
-            if hasattr(self, var_name):
-                var = getattr(self, var_name)
-                var.trace_add('write', create_trace_callback(effect.replace('_active', ''), is_gif=False))
-        
-        # Textur-Wert-Slider binding
-        for effect in ['sharpen_value', 'blur_value', 'transparency_value', 'colorintensity']:
-            var_name = f'texture_{effect}'
-            if hasattr(self, var_name):
-                var = getattr(self, var_name)
-                var.trace_add('write', create_trace_callback(effect, is_gif=False))
-
-    def _apply_gif_effect(self, effect_type):
-        if not self.gif_frames:
-            return
-        # Effekte werden nur bei der Anzeige angewendet, nicht hier auf den Frames selbst gespeichert
-        self.show_gif_frame()
-        if hasattr(self, 'root') and self.root:
-            self.root.update_idletasks()
+        # Änderungen werden gebündelt: höchstens ein Neuaufbau pro Frame-Intervall,
+        # mit dem dann aktuellen Stand aller Variablen
+        coalescer = _get_change_coalescer(self)
+        # Bereits gebundene Variablen nicht doppelt tracen (Methode läuft auch nach apply_config)
+        bound: set[str] = getattr(self, '_effect_trace_vars', set())
+        self._effect_trace_vars = bound
+        effects = ['grayscale', 'sharpen', 'blur', 'transparency', 'colorintensity_active',
+                   'sharpen_value', 'blur_value', 'transparency_value', 'colorintensity']
+        for prefix in ('gif', 'texture'):
+            for effect in effects:
+                var = getattr(self, f'{prefix}_{effect}', None)
+                if var is None or str(var) in bound:
+                    continue
+                var.trace_add('write', coalescer.trace_callback(prefix))
+                bound.add(str(var))
 
-    def _apply_texture_effect(self, effect_type):
-        if not self.gif_frames:
-            return
-        # Effekte werden nur bei der Anzeige angewendet, nicht hier auf den Frames selbst gespeichert
-        self.show_texture()
-        if hasattr(self, 'root') and self.root:
-            self.root.update_idletasks()
     def import_frames_to_gif(self):
         from file_ops import import_frames_to_gif
         import_frames_to_gif(self)
@@ -205,7 +171,7 @@ class ModernApp:
         self.lang: str = 'de'
         self.lang_var: Optional[tk.StringVar] = None
         self.gif_image: Optional[Image.Image] = None
-        self.gif_frames: List[Image.Image] = []
+        self.gif_frames: MutableSequence[Image.Image] = []  # list oder LazyGifFrames
         self.texture_image: Optional[Image.Image] = None
         self.texture_source_image: Optional[Image.Image] = None
         self.texture_use_source_image: bool = False
@@ -311,6 +277,7 @@ class ModernApp:
         self.media_playrate_label = None  # Für Media-Abspielrate-Label (Tooltip/Übersetzung)
         self.menubar = None  # Menu Bar (Menüleiste oben: File, Edit, View, Groups, Help) - wird in gui_layout.py create_menubar() gesetzt
         self.playing = False
+        self.playback = PlaybackEngine(self)
         
         # BooleanVars für Gruppen-Sichtbarkeit
         self.show_gif_var = tk.BooleanVar(value=True)
@@ -789,36 +756,21 @@ class ModernApp:
         if not self.gif_frames:
             return
         self.playing = True
-        self._run_animation()
-
-    def _run_animation(self):
-        if not self.playing or not self.gif_frames:
-            return
-        self.current_frame = (self.current_frame + 1) % self.frame_count
-        # Frame-Anzeige in Thread auslagern für flüssigere UI
-        import threading
-        threading.Thread(target=lambda: show_gif_frame(self), daemon=True).start()
-        # Media-Play-Geschwindigkeit: Slider aus Media-Bereich bevorzugen
-        delay = 100
-        if hasattr(self, 'media_playrate_var') and self.media_playrate_var is not None:
-            playrate = self.media_playrate_var.get()
-            delay = int(10000 / playrate)  # Konvertiere Prozentatz zu Verzögerung in ms
-        elif self.framerate_var is not None:
-            delay = self.framerate_var.get()
-        self.root.after(delay, self._run_animation)
+        # Fester Takt + vorgerenderter Ringpuffer (kein Thread pro Frame)
+        self.playback.start()
 
     def pause_animation(self):
         self.playing = False
+        self.playback.stop()
         # Play/Pause-Button immer auf "Abspielen" (Play) setzen, auch sprachabhängig
         if self.play_btn is not None:
             self.play_btn.config(text=tr('play', self.lang) or "Play ▶")
 
     def stop_animation(self):
         self.playing = False
+        self.playback.stop()
         self.current_frame = 0
-        # Frame-Anzeige in Thread auslagern für flüssigere UI
-        import threading
-        threading.Thread(target=lambda: show_gif_frame(self), daemon=True).start()
+        show_gif_frame(self)
         # Play/Pause-Button immer auf "Abspielen" (Play) setzen, auch sprachabhängig
         if self.play_btn is not None:
             self.play_btn.config(text=tr('play', self.lang) or "Play ▶")
@@ -827,17 +779,13 @@ class ModernApp:
         if not self.gif_frames:
             return
         self.current_frame = (self.current_frame + 1) % self.frame_count
-        # Frame-Anzeige in Thread auslagern für flüssigere UI
-        import threading
-        threading.Thread(target=lambda: show_gif_frame(self), daemon=True).start()
+        show_gif_frame(self)
 
     def step_backward(self):
         if not self.gif_frames:
             return
         self.current_frame = (self.current_frame - 1) % self.frame_count
-        # Frame-Anzeige in Thread auslagern für flüssigere UI
-        import threading
-        threading.Thread(target=lambda: show_gif_frame(self), daemon=True).start()
+        show_gif_frame(self)
 
 
 
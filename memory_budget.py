@@ -0,0 +1,228 @@
+###
+# memory_budget.py
+# Memory accounting per subsystem and peak-memory budget enforcement for OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Speicherbuchhaltung für Frames, Caches und Texturen.
+
+Jedes Subsystem meldet sich mit einer Messfunktion (aktuelle Bytes) und
+optional einer Freigabefunktion beim `MemoryAccountant` an. Vor großen
+Allokationen (GIF laden, Sheet aufbauen) fragt der Aufrufer `ensure()`; liegt
+die Summe über dem Budget (config 'memory_budget_mb'), werden Caches
+verkleinert und dekodierte Frames verworfen (sie werden bei Bedarf erneut aus
+der Datei dekodiert). Frames, die nur im Speicher existieren, werden statt
+eines MemoryError verkleinert (`fit_frames`).
+
+Gemessen wird nur, was die Subsysteme melden (Pixelbytes) – kein RSS.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+from PIL import Image
+import math
+import threading
+import weakref
+from effect_cache import image_nbytes
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+Probe = Callable[[], int]
+Reclaim = Callable[[int], int]
+
+@dataclass
+class _Registration:
+	subsystem: str
+	probe: Callable[[], Optional[Probe]]
+	reclaim: Optional[Callable[[], Optional[Reclaim]]]
+	priority: int
+
+def _weak(func: Callable) -> Callable[[], Optional[Callable]]:
+	"""Gebundene Methoden nur schwach referenzieren, damit der Besitzer freigegeben werden kann"""
+	if hasattr(func, '__self__') and hasattr(func, '__func__'):
+		return weakref.WeakMethod(func)
+	return lambda: func
+
+class MemoryAccountant:
+	"""
+	Bytes pro Subsystem mit Gesamtbudget.
+
+	Nutzung:
+		accountant = get_memory_accountant()
+		accountant.register("effect_cache", cache.nbytes, cache.shrink, priority=10)
+		accountant.ensure(sheet_bytes)   # verdrängt Caches, bis die Allokation passt
+		accountant.usage()               # {'effect_cache': 123456, 'frames': ...}
+	"""
+
+	def __init__(self, budget_bytes: int):
+		"""
+		Args:
+			budget_bytes: Obergrenze für die Summe aller gemeldeten Bytes
+		"""
+		self.budget_bytes = budget_bytes
+		self.peak_bytes = 0
+		self.reclaimed_bytes = 0
+		self.downscaled_frames = 0
+		# Letztes Ergebnis von stats() – die Statusleiste liest nur dieses, ohne zu messen
+		self.last_stats: Optional[dict[str, Any]] = None
+		self._registrations: list[_Registration] = []
+		self._lock = threading.Lock()
+
+	def register(self, subsystem: str, probe: Probe, reclaim: Optional[Reclaim] = None, priority: int = 0) -> Callable[[], None]:
+		"""
+		Meldet eine Speicherquelle an. Gebundene Methoden werden schwach referenziert
+		und verschwinden mit ihrem Objekt von selbst.
+
+		Args:
+			subsystem: Name für Anzeige und Auswertung (mehrere Quellen pro Name erlaubt)
+			probe: Liefert die aktuell belegten Bytes
+			reclaim: Gibt bis zu n Bytes frei und liefert die tatsächlich freigegebenen (thread-sicher)
+			priority: Niedrigere Priorität wird zuerst verkleinert
+
+		Returns:
+			Funktion zum Abmelden
+		"""
+		registration = _Registration(subsystem, _weak(probe), _weak(reclaim) if reclaim is not None else None, priority)
+		with self._lock:
+			self._registrations.append(registration)
+			self._registrations.sort(key=lambda r: r.priority)
+
+		def unregister() -> None:
+			with self._lock:
+				if registration in self._registrations:
+					self._registrations.remove(registration)
+		return unregister
+
+	def _live(self) -> list[_Registration]:
+		"""Registrierungen mit noch lebendem Besitzer (tote werden entfernt)"""
+		with self._lock:
+			self._registrations = [r for r in self._registrations if r.probe() is not None]
+			return list(self._registrations)
+
+	def usage(self) -> dict[str, int]:
+		"""Belegte Bytes pro Subsystem"""
+		usage: dict[str, int] = {}
+		for registration in self._live():
+			probe = registration.probe()
+			if probe is None:
+				continue
+			try:
+				nbytes = int(probe())
+			except Exception as e:
+				logger.debug(f"Memory probe {registration.subsystem} failed: {type(e).__name__}: {e}")
+				continue
+			usage[registration.subsystem] = usage.get(registration.subsystem, 0) + nbytes
+		total = sum(usage.values())
+		if total > self.peak_bytes:
+			self.peak_bytes = total
+		return usage
+
+	def total(self) -> int:
+		return sum(self.usage().values())
+
+	def available(self) -> int:
+		"""Bytes bis zum Budget (0 wenn bereits darüber)"""
+		return max(0, self.budget_bytes - self.total())
+
+	def reclaim(self, nbytes: int) -> int:
+		"""Gibt bis zu `nbytes` frei (Quellen in Prioritätsreihenfolge) und liefert die freigegebenen Bytes"""
+		freed = 0
+		for registration in self._live():
+			if freed >= nbytes:
+				break
+			reclaim = registration.reclaim() if registration.reclaim is not None else None
+			if reclaim is None:
+				continue
+			try:
+				freed += max(0, int(reclaim(nbytes - freed)))
+			except Exception as e:
+				logger.warning(f"Reclaiming {registration.subsystem} failed: {type(e).__name__}: {e}")
+		if freed:
+			self.reclaimed_bytes += freed
+			logger.info(f"Memory budget: reclaimed {freed / 1048576:.1f} MB")
+		return freed
+
+	def ensure(self, nbytes: int = 0) -> bool:
+		"""
+		Schafft Platz für eine Allokation von `nbytes`.
+
+		Returns:
+			True wenn die Allokation danach ins Budget passt
+		"""
+		excess = self.total() + nbytes - self.budget_bytes
+		if excess <= 0:
+			return True
+		excess -= self.reclaim(excess)
+		if excess > 0:
+			logger.warning(f"Memory budget exceeded by {excess / 1048576:.1f} MB after reclaiming")
+		return excess <= 0
+
+	def fit_frames(self, frames: Sequence[Image.Image]) -> list[Image.Image]:
+		"""
+		Passt Frames, die nur im Speicher existieren (URL, Zwischenablage, Textur-Datei),
+		ins Budget: erst Caches freigeben, dann alle Frames gleichmäßig verkleinern.
+		"""
+		frames = list(frames)
+		needed = sum(image_nbytes(f) for f in frames)
+		if needed == 0 or self.ensure(needed):
+			return frames
+		available = self.available()
+		factor = math.sqrt(available / needed) if available > 0 else 0.0
+		if factor <= 0.0:
+			logger.warning("Memory budget exhausted; keeping frames at full size")
+			return frames
+		logger.warning(f"Memory budget: downscaling {len(frames)} frames by {factor:.2f}")
+		self.downscaled_frames += len(frames)
+		return [
+			f.resize((max(1, int(f.width * factor)), max(1, int(f.height * factor))), Image.Resampling.LANCZOS)
+			for f in frames
+		]
+
+	def frame_window(self, frame_bytes: int, configured: int) -> int:
+		"""Größe des Fensters dekodierter Frames: höchstens `configured`, aber im freien Budget (mindestens 2)"""
+		if frame_bytes <= 0:
+			return configured
+		return max(2, min(configured, self.available() // frame_bytes))
+
+	def stats(self) -> dict[str, Any]:
+		"""Füllstand für Statusleiste und Logging (wird als `last_stats` gemerkt)"""
+		usage = self.usage()
+		self.last_stats = {
+			'usage': usage,
+			'total': sum(usage.values()),
+			'budget': self.budget_bytes,
+			'peak': self.peak_bytes,
+			'reclaimed': self.reclaimed_bytes,
+			'downscaled_frames': self.downscaled_frames,
+		}
+		return self.last_stats
+
+def format_usage(stats: dict[str, Any]) -> tuple[str, str]:
+	"""
+	Text für die Statusleiste und den Tooltip mit der Aufteilung pro Subsystem.
+
+	Returns:
+		("💾 312 / 1024 MB", "frames: 200.0 MB\\neffect_cache: 112.0 MB\\n...")
+	"""
+	mb = 1024 * 1024
+	label = f"💾 {stats['total'] / mb:.0f} / {stats['budget'] / mb:.0f} MB"
+	lines = [f"{name}: {nbytes / mb:.1f} MB" for name, nbytes in sorted(stats['usage'].items(), key=lambda item: -item[1])]
+	lines.append(f"peak: {stats['peak'] / mb:.1f} MB")
+	if stats['reclaimed']:
+		lines.append(f"reclaimed: {stats['reclaimed'] / mb:.1f} MB")
+	return label, "\n".join(lines)
+
+# Global singleton instance
+_accountant_instance: Optional[MemoryAccountant] = None
+
+def get_memory_accountant() -> MemoryAccountant:
+	"""Gibt den globalen MemoryAccountant zurück (Budget aus config 'memory_budget_mb')"""
+	global _accountant_instance
+	if _accountant_instance is None:
+		from config_manager import get_config
+		budget_mb = int(get_config().get('memory_budget_mb'))
+		_accountant_instance = MemoryAccountant(budget_bytes=budget_mb * 1024 * 1024)
+		logger.info(f"MemoryAccountant initialized with {budget_mb} MB budget")
+	return _accountant_instance
@@ -0,0 +1,196 @@
+###
+# perf.py
+# Stage timing for the texture and GIF pipelines in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Zeitmessung pro Pipeline-Stufe (decode, effects, compose, resize, encode).
+
+Ein `StageTimer` gehört zu genau einem Durchlauf (eine Vorschau, ein Export)
+und summiert die Dauer gleichnamiger Stufen. Die Ergebnisse landen als
+`durations_ms` in den Payloads der EventBus-Events.
+
+Zusätzlich sammelt ein `SpanRecorder` die letzten Spans (Operationen und ihre
+Stufen) in einem Ringpuffer; das Profiler-Tab der Log-Übersicht zeigt daraus
+p50/p95 pro Stufe und die langsamsten Operationen. Ist das Tracing aus
+(config 'perf_tracing'), kosten `span()`/`traced()` nur eine Abfrage.
+"""
+
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, ContextManager, Iterator, Optional, TypeVar
+import math
+import threading
+import time
+
+class StageTimer:
+	"""
+	Summiert Laufzeiten pro Stufe (nicht verschachteln – Stufen sind disjunkt).
+
+	Nutzung:
+		timer = StageTimer()
+		with timer.stage("compose"):
+			...
+		timer.as_ms()   # {'compose': 12.3}
+	"""
+
+	def __init__(self, operation: Optional[str] = None) -> None:
+		"""
+		Args:
+			operation: Name des Durchlaufs für den SpanRecorder (z.B. "texture.preview");
+				None = nur messen, nichts aufzeichnen
+		"""
+		self.operation = operation
+		self.durations: dict[str, float] = {}
+		self.started_at = time.perf_counter()
+
+	@contextmanager
+	def stage(self, name: str) -> Iterator[None]:
+		start = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - start
+
+	def elapsed_ms(self) -> float:
+		"""Gesamtzeit seit dem Anlegen in ms (inklusive nicht gemessener Anteile)"""
+		return round((time.perf_counter() - self.started_at) * 1000, 3)
+
+	def as_ms(self) -> dict[str, float]:
+		"""Dauer pro Stufe in ms (gerundet, für Event-Payloads)"""
+		return {name: round(seconds * 1000, 3) for name, seconds in self.durations.items()}
+
+	def record(self, **attrs: Any) -> None:
+		"""Legt den Durchlauf und seine Stufen (summiert) als Spans im SpanRecorder ab"""
+		recorder = get_span_recorder()
+		if self.operation is None or not recorder.enabled:
+			return
+		total = time.perf_counter() - self.started_at
+		recorder.add(Span(self.operation, "operation", total * 1000, attrs))
+		for name, seconds in self.durations.items():
+			recorder.add(Span(name, "stage", seconds * 1000, {'operation': self.operation}))
+
+class _NullTimer(StageTimer):
+	"""Misst nichts – Standard, wenn der Aufrufer keine Zeiten braucht"""
+
+	@contextmanager
+	def stage(self, name: str) -> Iterator[None]:
+		yield
+
+NULL_TIMER: StageTimer = _NullTimer()
+
+@dataclass
+class Span:
+	"""Ein gemessener Abschnitt: Operation (ganzer Durchlauf) oder Stufe"""
+	name: str
+	kind: str  # "operation" | "stage"
+	duration_ms: float
+	attrs: dict[str, Any] = field(default_factory=dict)
+	thread: str = field(default_factory=lambda: threading.current_thread().name)
+	timestamp: float = field(default_factory=time.time)
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+	"""Nearest-Rank-Perzentil einer aufsteigend sortierten Liste (0.0 bei leerer Liste)"""
+	if not sorted_values:
+		return 0.0
+	rank = max(1, math.ceil(len(sorted_values) * fraction))
+	return sorted_values[min(len(sorted_values), rank) - 1]
+
+class SpanRecorder:
+	"""
+	Thread-sicherer Ringpuffer der letzten Spans.
+
+	Nutzung:
+		with span("gif.decode", frames=n):
+			...
+		get_span_recorder().stage_stats()   # {'compose': {'count': .., 'p50_ms': .., 'p95_ms': .., 'max_ms': ..}}
+	"""
+
+	def __init__(self, capacity: int = 2048, enabled: bool = True):
+		self.enabled = enabled
+		# deque.append ist atomar – Lesen kopiert vorher in eine Liste
+		self._spans: deque[Span] = deque(maxlen=capacity)
+
+	def add(self, span: Span) -> None:
+		if self.enabled:
+			self._spans.append(span)
+
+	def spans(self, kind: Optional[str] = None) -> list[Span]:
+		"""Alle gespeicherten Spans (älteste zuerst), optional nach Art gefiltert"""
+		spans = list(self._spans)
+		if kind is not None:
+			spans = [s for s in spans if s.kind == kind]
+		return spans
+
+	def stage_stats(self, kind: str = "stage") -> dict[str, dict[str, float]]:
+		"""Anzahl, p50, p95 und Maximum (ms) pro Span-Name"""
+		by_name: dict[str, list[float]] = {}
+		for s in self.spans(kind):
+			by_name.setdefault(s.name, []).append(s.duration_ms)
+		stats = {}
+		for name, values in sorted(by_name.items()):
+			values.sort()
+			stats[name] = {
+				'count': len(values),
+				'p50_ms': round(percentile(values, 0.50), 3),
+				'p95_ms': round(percentile(values, 0.95), 3),
+				'max_ms': round(values[-1], 3),
+			}
+		return stats
+
+	def slowest(self, limit: int = 10, kind: str = "operation") -> list[Span]:
+		"""Die langsamsten gespeicherten Spans einer Art (langsamste zuerst)"""
+		return sorted(self.spans(kind), key=lambda s: s.duration_ms, reverse=True)[:limit]
+
+	def clear(self) -> None:
+		self._spans.clear()
+
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+@contextmanager
+def _recording_span(recorder: SpanRecorder, name: str, attrs: dict[str, Any]) -> Iterator[None]:
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		recorder.add(Span(name, "operation", (time.perf_counter() - start) * 1000, attrs))
+
+def span(name: str, **attrs: Any) -> ContextManager[None]:
+	"""Misst einen Abschnitt als Operation-Span (ohne Aufzeichnung, wenn das Tracing aus ist)"""
+	recorder = get_span_recorder()
+	if not recorder.enabled:
+		return _NULL_SPAN
+	return _recording_span(recorder, name, attrs)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+def traced(name: str) -> Callable[[F], F]:
+	"""Decorator: jeder Aufruf wird als Operation-Span `name` aufgezeichnet"""
+	def decorator(func: F) -> F:
+		@wraps(func)
+		def wrapper(*args: Any, **kwargs: Any) -> Any:
+			recorder = get_span_recorder()
+			if not recorder.enabled:
+				return func(*args, **kwargs)
+			with _recording_span(recorder, name, {}):
+				return func(*args, **kwargs)
+		return wrapper  # type: ignore[return-value]
+	return decorator
+
+# Global singleton instance
+_recorder_instance: Optional[SpanRecorder] = None
+
+def get_span_recorder() -> SpanRecorder:
+	"""Gibt den globalen SpanRecorder zurück (config 'perf_tracing', 'perf_span_capacity')"""
+	global _recorder_instance
+	if _recorder_instance is None:
+		from config_manager import get_config
+		config = get_config()
+		_recorder_instance = SpanRecorder(
+			capacity=int(config.get('perf_span_capacity')),
+			enabled=bool(config.get('perf_tracing')),
+		)
+	return _recorder_instance
@@ -0,0 +1,217 @@
+###
+# playback.py
+# Playback engine with a pre-rendered frame ring buffer for the GIF preview in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Abspielen der GIF-Vorschau im festen Takt.
+
+Ein Hintergrund-Task rendert die nächsten N Anzeige-Frames (skaliert + Effekte)
+in einen Ringpuffer vor. Der Tk-Takt leitet den fälligen Frame aus der Uhrzeit
+ab und zeigt ihn an, wenn er fertig ist – sonst wird er übersprungen (Drop statt
+Verzögerung). Pro Wiedergabe gibt es genau einen `after`-Timer und höchstens
+einen Render-Task im WorkerPool.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Hashable, Optional
+from PIL import Image
+import threading
+import time
+from image_processing import _get_display_cache, _show_gif_photo, gif_display_variant, render_gif_preview
+from logging_config import get_logger
+from texture_engine import EffectConfig, frame_token
+from worker_pool import TaskPriority, current_token, get_worker_pool
+
+logger = get_logger(__name__)
+
+# Anzahl vorgerenderter Frames vor dem Abspielkopf
+DEFAULT_LOOKAHEAD = 8
+
+def frame_interval_ms(app: Any) -> int:
+	"""Frame-Abstand in ms: Abspielrate-Slider (Prozent) bevorzugt, sonst framerate_var"""
+	playrate_var = getattr(app, 'media_playrate_var', None)
+	if playrate_var is not None:
+		return max(1, int(10000 / max(1, playrate_var.get())))  # Konvertiere Prozentsatz zu Verzögerung in ms
+	framerate_var = getattr(app, 'framerate_var', None)
+	if framerate_var is not None:
+		return max(1, int(framerate_var.get()))
+	return 100
+
+def due_frame(start_frame: int, started_at: float, now: float, interval_s: float) -> int:
+	"""Laufende Frame-Nummer (ohne Modulo), die zum Zeitpunkt `now` angezeigt werden soll"""
+	return start_frame + int((now - started_at) / interval_s)
+
+class FrameRing:
+	"""
+	Thread-sicherer Ringpuffer vorgerenderter Anzeige-Frames.
+
+	Alle Einträge gehören zu einem Render-Schlüssel (Frames, Anzeigegröße, Effekte);
+	ändert sich der Schlüssel, verfallen sie. Gehalten werden nur die Frames im
+	Fenster [Abspielkopf, Abspielkopf + capacity) – mit Wrap-around.
+	"""
+
+	def __init__(self, capacity: int = DEFAULT_LOOKAHEAD):
+		self.capacity = max(1, capacity)
+		self.key: Hashable = None
+		self._frames: "OrderedDict[int, Image.Image]" = OrderedDict()
+		self._lock = threading.Lock()
+
+	def reset(self, key: Hashable) -> None:
+		"""Verwirft alle Frames und setzt einen neuen Render-Schlüssel"""
+		with self._lock:
+			self.key = key
+			self._frames.clear()
+
+	def put(self, key: Hashable, index: int, image: Image.Image) -> bool:
+		"""Legt einen fertigen Frame ab; False wenn der Schlüssel inzwischen veraltet ist"""
+		with self._lock:
+			if key != self.key:
+				return False
+			self._frames[index] = image
+			while len(self._frames) > self.capacity:
+				self._frames.popitem(last=False)
+			return True
+
+	def get(self, index: int) -> Optional[Image.Image]:
+		with self._lock:
+			return self._frames.get(index)
+
+	def window(self, head: int, frame_count: int) -> list[int]:
+		"""Frame-Indizes ab `head` (inklusive), die im Puffer liegen sollen"""
+		return [(head + offset) % frame_count for offset in range(min(self.capacity, frame_count))]
+
+	def advance(self, head: int, frame_count: int) -> list[int]:
+		"""
+		Verwirft Frames außerhalb des Fensters ab `head`.
+
+		Returns:
+			Fehlende Indizes im Fenster, in Abspielreihenfolge
+		"""
+		wanted = self.window(head, frame_count)
+		with self._lock:
+			keep = set(wanted)
+			for index in [i for i in self._frames if i not in keep]:
+				del self._frames[index]
+			return [i for i in wanted if i not in self._frames]
+
+def _render_ahead(ring: FrameRing, key: Hashable, frames: Any, indices: list[int], max_w: int, max_h: int, effects: EffectConfig) -> None:
+	"""Worker: rendert `indices` in den Ring; bricht ab bei neuem Auftrag oder veraltetem Schlüssel"""
+	token = current_token()
+	for index in indices:
+		if token.cancelled or ring.key != key:
+			return
+		if index >= len(frames):
+			continue
+		if not ring.put(key, index, render_gif_preview(frames, index, max_w, max_h, effects)):
+			return
+
+class PlaybackEngine:
+	"""
+	Taktgeber der GIF-Vorschau (läuft im Tk-Thread, rendert im WorkerPool).
+
+	Nutzung:
+		self.playback = PlaybackEngine(self)
+		self.playback.start()   # Play
+		self.playback.stop()    # Pause/Stop
+	"""
+
+	def __init__(self, app: Any, lookahead: int = DEFAULT_LOOKAHEAD):
+		self.app = app
+		self.ring = FrameRing(lookahead)
+		self.dropped_frames = 0
+		self._after_id: Optional[str] = None
+		self._start_frame = 0
+		self._started_at = 0.0
+		self._interval_ms = 100
+		self._shown: Optional[int] = None
+		self._render: Optional[Future] = None
+
+	@property
+	def running(self) -> bool:
+		return self._after_id is not None
+
+	def start(self) -> None:
+		"""Startet die Wiedergabe ab dem Frame nach `current_frame`"""
+		self.stop()
+		self.dropped_frames = 0
+		# Erster Tick zeigt nichts Neues, beauftragt aber das Vorrendern –
+		# der nächste Frame ist erst einen Frame-Abstand später fällig
+		self._shown = self.app.current_frame
+		self._rebase(self.app.current_frame)
+		self._tick()
+
+	def stop(self) -> None:
+		"""Hält den Takt an und bricht das Vorrendern ab (Ring bleibt für den Neustart erhalten)"""
+		if self._after_id is not None:
+			try:
+				self.app.root.after_cancel(self._after_id)
+			except Exception as e:
+				logger.debug(f"Could not cancel playback timer: {type(e).__name__}: {e}")
+			self._after_id = None
+		get_worker_pool().cancel("playback_render")
+		self._render = None
+
+	def _rebase(self, start_frame: int) -> None:
+		self._start_frame = start_frame
+		self._started_at = time.perf_counter()
+		self._interval_ms = frame_interval_ms(self.app)
+
+	def _render_key(self) -> tuple[Hashable, tuple[int, int, EffectConfig]]:
+		frames = self.app.gif_frames
+		variant = gif_display_variant(self.app)
+		return (id(frames), len(frames), variant), variant
+
+	def _tick(self) -> None:
+		app = self.app
+		self._after_id = None
+		if not app.playing or not app.gif_frames:
+			return
+		frames = app.gif_frames
+		frame_count = len(frames)
+		interval_ms = frame_interval_ms(app)
+		if interval_ms != self._interval_ms:
+			# Abspielrate geändert: Takt ab dem aktuellen Frame neu ausrichten
+			self._rebase(app.current_frame)
+		now = time.perf_counter()
+		interval_s = self._interval_ms / 1000.0
+		due = due_frame(self._start_frame, self._started_at, now, interval_s)
+		index = due % frame_count
+		key, variant = self._render_key()
+		if key != self.ring.key:
+			self.ring.reset(key)
+			self._render = None
+		display_cache = _get_display_cache(app)
+		if index != self._shown:
+			# Bereits angezeigte Frames kommen als fertiges PhotoImage aus dem DisplayCache
+			token = frame_token(frames, index)
+			photo = display_cache.get(token, variant)
+			if photo is None:
+				image = self.ring.get(index)
+				if image is not None:
+					photo = display_cache.put(token, variant, image)
+			if photo is not None:
+				_show_gif_photo(app, photo)
+				self._shown = index
+			else:
+				# Nicht rechtzeitig fertig: überspringen statt warten
+				self.dropped_frames += 1
+			app.current_frame = index
+		missing = [
+			i for i in self.ring.advance((index + 1) % frame_count, frame_count)
+			if not display_cache.contains(frame_token(frames, i), variant)
+		]
+		# Ein laufender Render-Task füllt sein Fenster zu Ende; erst danach neu beauftragen
+		if missing and (self._render is None or self._render.done()):
+			max_w, max_h, effects = variant
+			self._render = get_worker_pool().submit(
+				"playback_render", _render_ahead,
+				self.ring, key, frames, missing, max_w, max_h, effects,
+				priority=TaskPriority.NORMAL,
+			)
+		# Nächster Tick zum nächsten Frame-Termin (driftfrei, aus der Startzeit berechnet)
+		next_at = self._started_at + (due + 1 - self._start_frame) * interval_s
+		delay = max(1, int((next_at - time.perf_counter()) * 1000))
+		self._after_id = app.root.after(delay, self._tick)
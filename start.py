@@ -219,4 +219,7 @@ def main():
 		logger.info("Application closed")
 
 if __name__ == "__main__":
+	# TilePool startet Worker-Prozesse – in der gepackten EXE nötig, damit sie nicht die GUI starten
+	import multiprocessing
+	multiprocessing.freeze_support()
 	main()
@@ -0,0 +1,50 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from PIL import Image
+import batch_convert
+from texture_engine import EffectConfig
+
+class TestBatchConvert(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        frames = [Image.new("RGBA", (16, 16), (i * 40, 0, 0, 255)) for i in range(4)]
+        self.gif = os.path.join(self.tmp.name, "Feuer.gif")
+        frames[0].save(self.gif, save_all=True, append_images=frames[1:], loop=0, duration=100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_collect_inputs_accepts_dirs_and_globs_without_duplicates(self):
+        found = batch_convert.collect_inputs([self.tmp.name, os.path.join(self.tmp.name, "*.gif")])
+        self.assertEqual(found, [os.path.normpath(self.gif)])
+
+    def test_convert_gif_writes_scaled_texture(self):
+        job = batch_convert.BatchJob(
+            source=self.gif, output_dir=None, width=64, height=64, export_format="JPG",
+            bg_rgba=(0, 0, 0, 0), effects=EffectConfig(),
+        )
+        result = batch_convert.convert_gif(job)
+        self.assertIsNone(result.error)
+        self.assertEqual((result.tiles_x, result.tiles_y, result.frame_count), (2, 2, 4))
+        self.assertTrue(result.texture_path.endswith("Feuer.jpg"))
+        with Image.open(result.texture_path) as img:
+            self.assertEqual(img.size, (64, 64))
+            self.assertEqual(img.mode, "RGB")
+
+    def test_cli_writes_notecard_without_gui_modules(self):
+        # Eigener Interpreter: andere Tests haben tkinter evtl. schon geladen
+        code = (
+            "import sys, batch_convert; "
+            f"batch_convert.main([{self.gif!r}, '--format', 'PNG', '--jobs', '1']); "
+            "print(sorted(m for m in ('tkinter', 'PIL.ImageTk', 'file_ops', 'main') if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(batch_convert.__file__)), check=True)
+        self.assertEqual(out.stdout.strip().splitlines()[-1], "[]")
+        with open(os.path.join(self.tmp.name, "Feuer.notecard"), encoding="utf-8") as f:
+            self.assertIn("columns=2", f.read())
+
+if __name__ == "__main__":
+    unittest.main()
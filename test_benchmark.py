@@ -0,0 +1,41 @@
+import json
+import unittest
+from io import StringIO
+from unittest import mock
+import benchmark
+from benchmark import BenchCase, build_cases, compare, run_case, synthetic_frames
+
+class TestBenchmark(unittest.TestCase):
+    def test_synthetic_frames_are_reproducible(self):
+        a = synthetic_frames(2, 16, alpha=True, seed=1)
+        b = synthetic_frames(2, 16, alpha=True, seed=1)
+        self.assertEqual([f.tobytes() for f in a], [f.tobytes() for f in b])
+        self.assertEqual(a[0].getchannel("A").getpixel((0, 0)), 0)
+        self.assertEqual(synthetic_frames(1, 16, alpha=False)[0].getchannel("A").getpixel((0, 0)), 255)
+
+    def test_build_cases_skips_oversized_inputs(self):
+        cases, skipped = build_cases("full", max_input_mb=64)
+        self.assertTrue(all(c.input_bytes <= 64 * 1024 * 1024 for c in cases))
+        self.assertIn("sheet_save/n256/2048px/rgba", [c.case_id for c in skipped])
+
+    def test_run_case_reports_throughput(self):
+        for case in (BenchCase("apply_effects", 1, 32, True, "all"), BenchCase("zip_export", 2, 32), BenchCase("encode", 2, 32, False, "JPG")):
+            result = run_case(case, repeat=2)
+            self.assertEqual(result.case_id, case.case_id)
+            self.assertEqual(result.repeat, 2)
+            self.assertGreater(result.megapixels_per_second, 0)
+            self.assertLessEqual(result.seconds_min, result.seconds_median)
+
+    def test_main_emits_json_and_flags_regressions(self):
+        argv = ["--only", "calculate_optimal_grid", "--repeat", "1", "--in-process", "--json", "-"]
+        with mock.patch("sys.stdout", new=StringIO()) as out, mock.patch("sys.stderr", new=StringIO()):
+            self.assertEqual(benchmark.main(argv), 0)
+        report = json.loads(out.getvalue())
+        self.assertEqual(report["schema"], benchmark.SCHEMA_VERSION)
+        self.assertEqual([r["name"] for r in report["results"]], ["calculate_optimal_grid"])
+        fast = {'results': [dict(report["results"][0], seconds_min=report["results"][0]["seconds_min"] / 10)]}
+        self.assertEqual(len(compare(report["results"], fast, tolerance=0.2)), 1)
+        self.assertEqual(compare(report["results"], report, tolerance=0.2), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from PIL import Image
+import numpy as np
+from disk_cache import DiskCache, file_digest, frames_digest, frames_key, load_sheet, sheet_key, store_sheet
+from frame_store import LazyGifFrames
+from texture_engine import EffectConfig, SheetSpec, load_gif_frames
+from worker_pool import get_worker_pool
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = DiskCache(os.path.join(self.tmpdir.name, "cache"), max_bytes=1024 * 1024)
+        self.path = os.path.join(self.tmpdir.name, "anim.gif")
+        frames = [Image.new("RGBA", (12, 8), (i * 40, 100, 50, 255)) for i in range(5)]
+        frames[0].save(self.path, save_all=True, append_images=frames[1:], duration=40, loop=0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_store_lookup_and_lru_eviction(self):
+        cache = DiskCache(os.path.join(self.tmpdir.name, "small"), max_bytes=100)
+        for i, key in enumerate(("a", "b")):
+            cache.store(key, {'n': i}, lambda f: f.write(b"x" * 40))
+            os.utime(os.path.join(cache.directory, key + ".json"), (1000 + i, 1000 + i))
+        hit = cache.lookup("a")
+        assert hit is not None
+        blob, meta = hit
+        self.assertEqual((meta['n'], meta['nbytes']), (0, 40))
+        with open(blob, "rb") as f:
+            self.assertEqual(f.read(), b"x" * 40)
+        # "a" wurde zuletzt benutzt – "b" muss für "c" weichen
+        cache.store("c", {}, lambda f: f.write(b"y" * 40))
+        self.assertIsNone(cache.lookup("b"))
+        self.assertIsNotNone(cache.lookup("a"))
+        self.assertEqual(cache.stats()['entries'], 2)
+        # Größer als das Budget: gar nicht erst speichern
+        self.assertIsNone(cache.store("big", {}, lambda f: f.write(b"z" * 200)))
+        self.assertEqual(sorted(os.listdir(cache.directory)), ["a.bin", "a.json", "c.bin", "c.json"])
+
+    def test_reopen_maps_cached_frames_without_decoding(self):
+        eager = load_gif_frames(self.path)
+        pool = get_worker_pool()
+        key = frames_key(file_digest(self.path))
+        # Unter der Auslagerungsschwelle wird nichts im Cache abgelegt
+        small = LazyGifFrames.open(self.path, disk_cache=self.cache)
+        self.assertTrue(pool.wait_all(timeout=5))
+        small_source = small.token(0).source
+        assert small_source is not None
+        self.assertFalse(small_source.spilled)
+        list(small)
+        self.assertTrue(pool.wait_all(timeout=5))
+        self.assertIsNone(self.cache.lookup(key))
+
+        # Ausgelagert: der Eintrag entsteht aus der Datei, sobald der letzte Frame dekodiert ist
+        first = LazyGifFrames.open(self.path, spill_mb=0, disk_cache=self.cache)
+        self.assertTrue(pool.wait_all(timeout=5))
+        source = first.token(0).source
+        assert source is not None
+        self.assertEqual(source.content_hash, file_digest(self.path))
+        list(first)
+        self.assertTrue(pool.wait_all(timeout=5))
+        self.assertIsNotNone(self.cache.lookup(key))
+
+        again = LazyGifFrames.open(self.path, disk_cache=self.cache)
+        self.assertTrue(pool.wait_all(timeout=5))
+        cached_source = again.token(0).source
+        assert cached_source is not None
+        self.assertTrue(cached_source.spilled)
+        self.assertTrue(all(cached_source.is_decoded(i) for i in range(5)))
+        self.assertEqual(len(again), 5)
+        # Frames aus einer gehashten Datei werden für den Sheet-Schlüssel nicht dekodiert
+        self.assertEqual(frames_digest(again), frames_digest(first))
+        self.assertEqual(cached_source.decoded_count, 0)
+        for i in range(5):
+            self.assertTrue(np.array_equal(np.array(again[i]), np.array(eager[i].convert("RGBA"))))
+
+    def test_sheet_round_trip_keyed_by_frames_and_settings(self):
+        frames = [Image.new("RGBA", (4, 4), (255, 0, 0, 255)), Image.new("RGBA", (4, 4), (0, 255, 0, 128))]
+        spec = SheetSpec.for_frames(frames)
+        key = sheet_key(frames_digest(frames), spec, EffectConfig(), (8, 4))
+        self.assertNotEqual(key, sheet_key(frames_digest(frames), spec, EffectConfig(grayscale=True), (8, 4)))
+        self.assertNotEqual(key, sheet_key(frames_digest(frames[::-1]), spec, EffectConfig(), (8, 4)))
+        # Werte inaktiver Effekte ändern den Schlüssel nicht
+        self.assertEqual(key, sheet_key(frames_digest(frames), spec, EffectConfig(blur_value=9.0), (8, 4)))
+        self.assertIsNone(load_sheet(self.cache, key))
+        sheet = Image.new("RGBA", (8, 4), (1, 2, 3, 4))
+        store_sheet(self.cache, key, sheet)
+        self.assertTrue(np.array_equal(np.array(load_sheet(self.cache, key)), np.array(sheet)))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+if __name__ == "__main__":
+    unittest.main()
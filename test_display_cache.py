@@ -0,0 +1,48 @@
+import unittest
+from PIL import Image
+from display_cache import DisplayCache
+from texture_engine import EffectConfig
+
+class TestDisplayCache(unittest.TestCase):
+    def setUp(self):
+        self.made: list[Image.Image] = []
+        def factory(img):
+            self.made.append(img)
+            return ("photo", img.size)
+        self.cache = DisplayCache(max_bytes=3 * 10 * 10 * 4, factory=factory)
+        self.frames = [Image.new("RGBA", (10, 10), (i, 0, 0, 255)) for i in range(4)]
+        self.variant = (10, 10, EffectConfig().normalized())
+
+    def test_second_loop_only_hits(self):
+        for frame in self.frames[:2]:
+            self.assertIsNone(self.cache.get(frame, self.variant))
+            self.cache.put(frame, self.variant, frame)
+        for frame in self.frames[:2]:
+            self.assertIsNotNone(self.cache.get(frame, self.variant))
+        self.assertEqual(len(self.made), 2)
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_variant_change_invalidates(self):
+        self.cache.put(self.frames[0], self.variant, self.frames[0])
+        resized = (20, 10, self.variant[2])
+        self.assertFalse(self.cache.contains(self.frames[0], resized))
+        self.assertIsNone(self.cache.get(self.frames[0], resized))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_stale_put_is_dropped_without_invalidating(self):
+        self.cache.put(self.frames[0], self.variant, self.frames[0])
+        stale = (20, 10, self.variant[2])
+        self.assertIsNotNone(self.cache.put(self.frames[1], stale, self.frames[1]))
+        self.assertEqual(len(self.cache), 1)
+        self.assertTrue(self.cache.contains(self.frames[0], self.variant))
+        self.assertFalse(self.cache.contains(self.frames[1], stale))
+
+    def test_byte_budget_evicts_oldest(self):
+        for frame in self.frames:
+            self.cache.put(frame, self.variant, frame)
+        self.assertEqual(len(self.cache), 3)
+        self.assertFalse(self.cache.contains(self.frames[0], self.variant))
+        self.assertTrue(self.cache.contains(self.frames[3], self.variant))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from PIL import Image
+from effect_cache import EffectCache, image_nbytes
+from texture_engine import EffectConfig, SheetSpec, compose_sheet
+
+class TestEffectCache(unittest.TestCase):
+    def setUp(self):
+        self.frame = Image.new("RGBA", (8, 8), (255, 0, 0, 255))
+        self.effects = EffectConfig(grayscale=True)
+
+    def test_hit_after_miss_and_normalized_key(self):
+        cache = EffectCache(max_bytes=1024 * 1024)
+        calls = []
+        def compute():
+            calls.append(1)
+            return self.frame.convert("L").convert("RGBA")
+        first = cache.get_or_compute(self.frame, self.effects, compute)
+        # Inaktiver Blur-Wert darf den Schlüssel nicht verändern
+        second = cache.get_or_compute(self.frame, EffectConfig(grayscale=True, blur_value=9.0), compute)
+        self.assertIs(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction_respects_byte_budget(self):
+        size = image_nbytes(self.frame)
+        cache = EffectCache(max_bytes=2 * size)
+        frames = [self.frame.copy() for _ in range(3)]
+        for f in frames:
+            cache.put(f, self.effects, f.copy())
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(frames[0], self.effects))
+        self.assertIsNotNone(cache.get(frames[2], self.effects))
+        self.assertLessEqual(cache.stats()['bytes'], 2 * size)
+
+    def test_compose_sheet_reuses_cached_frames(self):
+        cache = EffectCache(max_bytes=1024 * 1024)
+        frames = [self.frame, self.frame.copy()]
+        spec = SheetSpec.for_frames(frames)
+        compose_sheet(frames, spec, self.effects, cache=cache)
+        # Nur Hintergrund geändert -> keine neue Effektberechnung
+        compose_sheet(frames, SheetSpec.for_frames(frames, (0, 0, 255, 255)), self.effects, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+if __name__ == "__main__":
+    unittest.main()
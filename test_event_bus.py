@@ -0,0 +1,72 @@
+import threading
+import unittest
+from event_bus import EventBus, EventType
+from threading_utils import DISPATCH_EVENT, UiDispatcher
+from test_threading_utils import FakeRoot
+
+class TestEventBus(unittest.TestCase):
+    def test_history_is_a_bounded_ring(self):
+        bus = EventBus(max_history=5)
+        for i in range(12):
+            bus.publish(EventType.SETTINGS_CHANGED, data=i)
+        history = bus.get_history(limit=100)
+        self.assertEqual([e.data for e in history], [7, 8, 9, 10, 11])
+        self.assertEqual([e.data for e in bus.get_history(EventType.SETTINGS_CHANGED, limit=2)], [10, 11])
+
+    def test_unsubscribe_during_publish_uses_snapshot(self):
+        bus = EventBus()
+        calls = []
+        def first(event):
+            calls.append("first")
+            bus.unsubscribe(EventType.TEXTURE_GENERATED, second)
+        def second(event):
+            calls.append("second")
+        bus.subscribe(EventType.TEXTURE_GENERATED, first)
+        bus.subscribe(EventType.TEXTURE_GENERATED, second)
+        bus.publish(EventType.TEXTURE_GENERATED)
+        bus.publish(EventType.TEXTURE_GENERATED)
+        self.assertEqual(calls, ["first", "second", "first"])
+        self.assertEqual(bus.get_subscriber_count(EventType.TEXTURE_GENERATED), 1)
+
+    def test_concurrent_publish_and_subscribe(self):
+        bus = EventBus()
+        received = []
+        lock = threading.Lock()
+        def on_event(event):
+            with lock:
+                received.append(event.data)
+        bus.subscribe(EventType.GIF_FRAME_LOADED, on_event)
+        def publisher(base):
+            for i in range(200):
+                bus.publish(EventType.GIF_FRAME_LOADED, data=base + i)
+        def churn():
+            for _ in range(200):
+                bus.subscribe(EventType.GIF_FRAME_LOADED, print)()
+        threads = [threading.Thread(target=publisher, args=(n * 1000,)) for n in range(4)] + [threading.Thread(target=churn)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(received), 800)
+        self.assertEqual(bus.get_subscriber_count(EventType.GIF_FRAME_LOADED), 1)
+
+    def test_executor_routes_callbacks_to_tk_thread(self):
+        root = FakeRoot()
+        dispatcher = UiDispatcher(root)
+        bus = EventBus()
+        received = []
+        bus.subscribe(EventType.TEXTURE_GENERATED, lambda e: received.append(e.data), executor=dispatcher.call_soon)
+        def publish_all():
+            for i in range(3):
+                bus.publish(EventType.TEXTURE_GENERATED, data=i)
+        worker = threading.Thread(target=publish_all)
+        worker.start()
+        worker.join()
+        # Nichts läuft im Worker-Thread; im Tk-Thread kommen alle Events in Reihenfolge an
+        self.assertEqual(received, [])
+        self.assertEqual(root.wakeups, 1)
+        root.bindings[DISPATCH_EVENT](None)
+        self.assertEqual(received, [0, 1, 2])
+
+if __name__ == "__main__":
+    unittest.main()
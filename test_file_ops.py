@@ -3,8 +3,10 @@ from unittest.mock import MagicMock, patch
 from typing import Any, Optional
 import os
 import tempfile
+import threading
 from PIL import Image
 import file_ops
+from worker_pool import get_worker_pool
 
 class DummyApp:
     def __init__(self):
@@ -21,6 +23,8 @@ class DummyApp:
         self.texture_image = Image.new("RGBA", (32, 32), (255, 0, 0, 255))
         self.gif_image: Optional[Any] = None
         self.status = MagicMock()
+        self.root = MagicMock()
+        self._ui_dispatcher: Any = None
         self.maxframes_var = MagicMock()
         self.lsl_effect_loop_var = MagicMock(get=MagicMock(return_value=True))
         self.lsl_effect_smooth_var = MagicMock(get=MagicMock(return_value=True))
@@ -33,6 +37,10 @@ class DummyApp:
         self.play_btn = MagicMock()
         self.texture_canvas = MagicMock()
         self.gif_canvas = MagicMock()
+        # Effekt-Variablen der Textur (alle aus), wie von EffectConfig.from_app gelesen
+        for name, value in (('grayscale', False), ('sharpen', False), ('sharpen_value', 1.0), ('blur', False), ('blur_value', 0.0),
+                            ('transparency', False), ('transparency_value', 0.0), ('colorintensity_active', False), ('colorintensity', 0.5)):
+            setattr(self, f'texture_{name}', MagicMock(get=MagicMock(return_value=value)))
     def _update_status(self):
         pass
     def _update_preview(self):
@@ -101,11 +109,36 @@ class TestFileOps(unittest.TestCase):
         app.framerate_var = MagicMock(get=MagicMock(return_value=10))
         with tempfile.TemporaryDirectory() as tmpdir:
             texture_path = os.path.join(tmpdir, "bildname2.png")
-            with patch("file_ops.filedialog.asksaveasfilename", return_value=texture_path):
+            # Ohne Festplatten-Cache, damit der Test nichts im Benutzer-Cache ablegt
+            with patch("file_ops.filedialog.asksaveasfilename", return_value=texture_path), patch("image_processing.get_disk_cache", return_value=None):
                 file_ops.save_texture(app)
+                self.assertTrue(get_worker_pool().wait_all(timeout=10))
+            app._ui_dispatcher.drain()
+            self.assertIn("bildname2.notecard", app.status.config.call_args.kwargs["text"])
             self.assertTrue(os.path.exists(texture_path))
+            self.assertEqual(Image.open(texture_path).getpixel((0, 0)), (255, 0, 0, 255))
             self.assertTrue(os.path.exists(os.path.join(tmpdir, "bildname2.notecard")))
 
+    def test_save_texture_composes_off_the_tk_thread(self):
+        app = DummyApp()
+        release = threading.Event()
+        compose_threads = []
+        def slow_compose(*args, **kwargs):
+            compose_threads.append(threading.current_thread())
+            release.wait(10)
+            return Image.new("RGBA", (32, 32), (0, 255, 0, 255))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            texture_path = os.path.join(tmpdir, "hintergrund.png")
+            with patch("file_ops.filedialog.asksaveasfilename", return_value=texture_path), patch("file_ops.create_smart_scaled_texture", side_effect=slow_compose):
+                file_ops.save_texture(app)
+                # save_texture kehrt zurück, während das Sheet noch gebaut wird
+                self.assertFalse(os.path.exists(texture_path))
+                release.set()
+                self.assertTrue(get_worker_pool().wait_all(timeout=10))
+            self.assertEqual(len(compose_threads), 1)
+            self.assertIsNot(compose_threads[0], threading.main_thread())
+            self.assertEqual(Image.open(texture_path).getpixel((0, 0)), (0, 255, 0, 255))
+
     def test_export_lsl_does_not_create_notecard(self):
         app = DummyApp()
         app.framerate_var = MagicMock(get=MagicMock(return_value=10))
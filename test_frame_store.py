@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from PIL import Image
+import numpy as np
+from frame_store import LazyGifFrames, MappedFrameFile
+from texture_engine import frame_tokens, load_gif_frames
+
+class TestFrameStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "anim.gif")
+        frames = []
+        for i in range(10):
+            im = Image.new("RGBA", (24, 16), (0, 0, 0, 0))
+            im.paste((i * 25, 80, 200, 255), (i * 2, i, i * 2 + 6, i + 5))
+            frames.append(im)
+        frames[0].save(self.path, save_all=True, append_images=frames[1:], disposal=[1, 2] * 5, duration=40, loop=0)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_random_access_matches_eager_loader_with_bounded_window(self):
+        eager = load_gif_frames(self.path)
+        lazy = LazyGifFrames.open(self.path, max_decoded=3)
+        self.assertEqual(len(lazy), len(eager))
+        for i in (7, 2, 9, 0, 5, 5, 1):
+            self.assertTrue(np.array_equal(np.array(lazy[i].convert("RGBA")), np.array(eager[i].convert("RGBA"))))
+        source = lazy.token(0).source
+        assert source is not None
+        self.assertLessEqual(source.decoded_count, 3)
+
+    def test_list_operations_keep_stable_tokens(self):
+        lazy = LazyGifFrames.open(self.path)
+        tokens = frame_tokens(lazy)
+        head = lazy[:4]
+        self.assertIsInstance(head, LazyGifFrames)
+        self.assertEqual(frame_tokens(head), tokens[:4])
+        extra = Image.new("RGBA", (24, 16), (1, 2, 3, 255))
+        head.append(extra)
+        del head[0]
+        self.assertEqual(len(head), 4)
+        self.assertIs(head[-1], extra)
+        self.assertIs(head.token(0), tokens[1])
+
+    def test_spilled_frames_are_zero_copy_views_decoded_once(self):
+        eager = load_gif_frames(self.path)
+        lazy = LazyGifFrames.open(self.path, max_decoded=2, spill_mb=0, spill_dir=self.tmpdir.name)
+        source = lazy.token(0).source
+        assert source is not None
+        self.assertTrue(source.spilled)
+        for i in (7, 2, 9, 0, 5, 1, 3, 4, 6, 8):
+            self.assertTrue(np.array_equal(np.array(lazy[i]), np.array(eager[i].convert("RGBA"))))
+        spill = source._spill
+        assert spill is not None
+        self.assertEqual(spill.written_count, 10)
+        self.assertEqual(source.decoded_bytes(), 0)
+        # Kein erneutes Dekodieren: der Decoder wird nicht mehr gebraucht
+        source._decoder = None
+        self.assertTrue(np.array_equal(np.array(lazy[3]), np.array(eager[3].convert("RGBA"))))
+        # Bild und Datei teilen sich den Speicher
+        img = lazy[0]
+        spill.view(0)[0, 0] = (1, 2, 3, 4)
+        self.assertEqual(img.getpixel((0, 0)), (1, 2, 3, 4))
+        source.close()
+
+    def test_mapped_frame_file_round_trip(self):
+        spill = MappedFrameFile((4, 3), 2)
+        self.assertEqual(spill.stride, 48)
+        src = Image.new("RGB", (4, 3), (10, 20, 30))
+        spill.write(1, src)
+        self.assertFalse(spill.is_written(0))
+        out = spill.image(1)
+        self.assertEqual(out.getpixel((3, 2)), (10, 20, 30, 255))
+        self.assertEqual(out.resize((2, 2)).getpixel((0, 0)), (10, 20, 30, 255))
+        del out
+        spill.close()
+
+if __name__ == "__main__":
+    unittest.main()
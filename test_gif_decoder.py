@@ -0,0 +1,50 @@
+import io
+import unittest
+from PIL import Image
+import numpy as np
+from gif_decoder import GifDecoder, GifFormatError, decode_gif
+
+def _make_gif(disposal, transparent=True, count=6):
+    frames = []
+    for i in range(count):
+        arr = np.zeros((20, 30, 4), dtype=np.uint8)
+        if not transparent:
+            arr[..., :3] = (10, 20, 30)
+            arr[..., 3] = 255
+        arr[i * 2:i * 2 + 6, i * 4:i * 4 + 8] = (40 * i, 200, 90, 255)
+        frames.append(Image.fromarray(arr))
+    buf = io.BytesIO()
+    frames[0].save(buf, format="GIF", save_all=True, append_images=frames[1:], disposal=disposal, duration=40, loop=0)
+    return buf.getvalue(), frames
+
+class TestGifDecoder(unittest.TestCase):
+    def assertSameVisible(self, decoded, source):
+        a, b = np.array(decoded), np.array(source)
+        self.assertTrue(np.array_equal(a[..., 3] > 0, b[..., 3] > 0))
+        self.assertTrue(np.array_equal(a[a[..., 3] > 0], b[b[..., 3] > 0]))
+
+    def test_frames_match_source_for_each_disposal(self):
+        for disposal, transparent in ((1, False), (2, True), (3, True)):
+            data, source = _make_gif(disposal, transparent)
+            decoded = decode_gif(data)
+            self.assertEqual(len(decoded), len(source))
+            for out, src in zip(decoded, source):
+                self.assertEqual(out.mode, "RGBA")
+                self.assertSameVisible(out, src)
+
+    def test_random_access_equals_sequential(self):
+        data, _ = _make_gif(2)
+        sequential = [np.array(f) for f in GifDecoder(data)]
+        decoder = GifDecoder(data)
+        self.assertEqual(decoder.frames[1].duration, 40)
+        for i in (4, 1, 5, 0, 3):
+            self.assertTrue(np.array_equal(np.array(decoder.frame(i)), sequential[i]))
+
+    def test_rejects_non_gif_data(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buf, format="PNG")
+        with self.assertRaises(GifFormatError):
+            GifDecoder(buf.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
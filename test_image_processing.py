@@ -1,9 +1,14 @@
 import unittest
+from unittest import mock
 from PIL import Image
 import numpy as np
-from image_processing import apply_effects, calculate_optimal_grid
+from image_processing import apply_effects, calculate_optimal_grid, checkerboard_image, create_smart_scaled_texture, render_gif_preview
+from exceptions import TextureGenerationError
+from event_bus import Event, EventType, get_event_bus
+from texture_engine import EffectConfig
+from app_types import ModernAppProtocol
 
-from typing import Any, Optional
+from typing import Any, Optional, cast
 
 class TestImageProcessing(unittest.TestCase):
     def setUp(self):
@@ -66,5 +71,42 @@ class TestImageProcessing(unittest.TestCase):
         self.assertEqual(calculate_optimal_grid(5, prefer_single_row_odd=True), (5, 1))
         self.assertEqual(calculate_optimal_grid(5, prefer_single_row_odd=False), (3, 2))
 
+    def test_checkerboard_matches_pattern_and_is_cached(self):
+        board = checkerboard_image((19, 11), 4)
+        self.assertIs(board, checkerboard_image((19, 11), 4))
+        arr = np.array(board)
+        for y in range(11):
+            for x in range(19):
+                light = ((x // 4) + (y // 4)) % 2 == 0
+                self.assertEqual(tuple(arr[y, x]), (200, 200, 200, 255) if light else (255, 255, 255, 255))
+
+    def test_render_gif_preview_publishes_stage_timings(self):
+        events: list[Event] = []
+        unsubscribe = get_event_bus().subscribe(EventType.GIF_FRAME_LOADED, events.append)
+        try:
+            frames = [Image.new("RGBA", (40, 20), (0, 0, 255, 255))]
+            effects = EffectConfig(grayscale=True)
+            render_gif_preview(frames, 0, 16, 16, effects)
+            render_gif_preview(frames, 0, 16, 16, effects)
+        finally:
+            unsubscribe()
+        first, second = (e.data for e in events)
+        self.assertEqual((first['index'], first['frame_count'], first['display_size']), (0, 1, (16, 16)))
+        self.assertFalse(first['cached'])
+        self.assertEqual(set(first['durations_ms']), {'decode', 'resize', 'effects'})
+        # Zweiter Aufruf kommt aus dem EffectCache: keine Stufen
+        self.assertTrue(second['cached'])
+        self.assertEqual(second['durations_ms'], {})
+
+    def test_save_failure_raises_instead_of_blank_texture(self):
+        from benchmark import HeadlessApp
+        app = cast(ModernAppProtocol, HeadlessApp([Image.new("RGBA", (8, 8), (255, 0, 0, 255))] * 2))
+        with mock.patch("image_processing.EffectConfig.from_app", side_effect=RuntimeError("boom")):
+            # Vorschau: leere Ersatz-Textur, Speichern: Fehler an den Aufrufer
+            preview = create_smart_scaled_texture(app, 16, 8, (0, 0, 0, 0), preview_mode=True)
+            self.assertEqual(preview.getchannel("A").getextrema(), (0, 0))
+            with self.assertRaises(TextureGenerationError):
+                create_smart_scaled_texture(app, 16, 8, (0, 0, 0, 0), preview_mode=False)
+
 if __name__ == "__main__":
     unittest.main()
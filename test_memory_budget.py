@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from PIL import Image
+import memory_budget
+from effect_cache import EffectCache
+from frame_store import LazyGifFrames
+from memory_budget import MemoryAccountant, format_usage
+from texture_engine import EffectConfig
+
+class TestMemoryBudget(unittest.TestCase):
+    def setUp(self):
+        self._saved = memory_budget._accountant_instance
+        self.accountant = memory_budget._accountant_instance = MemoryAccountant(budget_bytes=64 * 1024)
+
+    def tearDown(self):
+        memory_budget._accountant_instance = self._saved
+
+    def test_usage_per_subsystem_and_weak_registration(self):
+        cache = EffectCache(max_bytes=1024 * 1024)
+        frame = Image.new("RGBA", (16, 16))
+        cache.put(frame, EffectConfig(), frame.copy())
+        self.accountant.register("effect_cache", cache.nbytes, cache.shrink)
+        unregister = self.accountant.register("texture", lambda: 100)
+        self.assertEqual(self.accountant.usage(), {'effect_cache': 1024, 'texture': 100})
+        unregister()
+        del cache
+        # Gebundene Methoden halten den Cache nicht am Leben
+        self.assertEqual(self.accountant.usage(), {})
+        self.assertIsNone(self.accountant.last_stats)
+        stats = self.accountant.stats()
+        # Die Statusleiste liest nur den gemerkten Stand
+        self.assertIs(self.accountant.last_stats, stats)
+        label, details = format_usage(stats)
+        self.assertEqual(label, "💾 0 / 0 MB")
+        self.assertIn("peak:", details)
+
+    def test_ensure_reclaims_in_priority_order(self):
+        cache = EffectCache(max_bytes=1024 * 1024)
+        frames = [Image.new("RGBA", (64, 64)) for _ in range(3)]
+        for frame in frames:
+            cache.put(frame, EffectConfig(), frame.copy())
+        reclaimed: list[int] = []
+        def reclaim_frames(n: int) -> int:
+            reclaimed.append(n)
+            return 0
+        self.accountant.register("frames", lambda: 0, reclaim_frames, priority=20)
+        self.accountant.register("effect_cache", cache.nbytes, cache.shrink, priority=10)
+        self.assertEqual(cache.nbytes(), 3 * 16384)
+        # 48 KB belegt, 32 KB gewünscht, Budget 64 KB: ein Eintrag (16 KB) muss weichen
+        self.assertTrue(self.accountant.ensure(32 * 1024))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(reclaimed, [])
+        self.assertEqual(self.accountant.reclaimed_bytes, 16384)
+        # Mehr als das Budget: alle Quellen werden gefragt, Ergebnis False
+        self.assertFalse(self.accountant.ensure(128 * 1024))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(len(reclaimed), 1)
+
+    def test_fit_frames_downscales_instead_of_failing(self):
+        frames = [Image.new("RGBA", (64, 64), (255, 0, 0, 255)) for _ in range(8)]
+        fitted = self.accountant.fit_frames(frames)
+        self.assertEqual(len(fitted), 8)
+        self.assertLessEqual(sum(f.width * f.height * 4 for f in fitted), 64 * 1024)
+        self.assertEqual(fitted[0].getpixel((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(self.accountant.downscaled_frames, 8)
+        small = [Image.new("RGBA", (8, 8))]
+        self.assertIs(self.accountant.fit_frames(small)[0], small[0])
+
+    def test_frame_store_window_follows_budget_and_spills(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "anim.gif")
+            frames = [Image.new("RGBA", (32, 32), (i * 20, 0, 0, 255)) for i in range(10)]
+            frames[0].save(path, save_all=True, append_images=frames[1:], duration=40, loop=0)
+            # 64 KB Budget / 4 KB pro Frame: 16 Frames, begrenzt durch die Konfiguration (6)
+            lazy = LazyGifFrames.open(path, max_decoded=6)
+            source = lazy.token(0).source
+            assert source is not None
+            self.assertEqual(source.max_decoded, 6)
+            for i in range(6):
+                lazy[i]
+            self.assertEqual(self.accountant.usage()['frames'], 6 * 4096)
+            freed = self.accountant.reclaim(3 * 4096)
+            self.assertEqual(freed, 3 * 4096)
+            self.assertEqual(source.decoded_count, 3)
+            self.assertEqual(source.max_decoded, 3)
+            # Verworfene Frames werden erneut dekodiert
+            self.assertEqual(lazy[0].getpixel((0, 0)), (0, 0, 0, 255))
+            with mock.patch.object(self.accountant, 'available', return_value=5000):
+                small = LazyGifFrames.open(path, max_decoded=6).token(0).source
+                assert small is not None
+                self.assertEqual(small.max_decoded, 2)
+
+if __name__ == "__main__":
+    unittest.main()
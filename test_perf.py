@@ -0,0 +1,54 @@
+import unittest
+import perf
+from perf import SpanRecorder, StageTimer, percentile, span, traced
+
+class TestPerf(unittest.TestCase):
+    def setUp(self):
+        self._saved = perf._recorder_instance
+        self.recorder = perf._recorder_instance = SpanRecorder(capacity=16)
+
+    def tearDown(self):
+        perf._recorder_instance = self._saved
+
+    def test_percentile_nearest_rank(self):
+        values = [float(v) for v in range(1, 21)]
+        self.assertEqual(percentile(values, 0.50), 10.0)
+        self.assertEqual(percentile(values, 0.95), 19.0)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+    def test_stage_timer_records_operation_and_stages(self):
+        timer = StageTimer("texture.preview")
+        for _ in range(3):
+            with timer.stage("compose"):
+                pass
+        with timer.stage("resize"):
+            pass
+        timer.record(frames=4)
+        operations = self.recorder.spans("operation")
+        self.assertEqual([(s.name, s.attrs) for s in operations], [("texture.preview", {'frames': 4})])
+        stats = self.recorder.stage_stats()
+        # Gleichnamige Stufen eines Durchlaufs werden zu einem Span summiert
+        self.assertEqual(sorted(stats), ["compose", "resize"])
+        self.assertEqual(stats["compose"]["count"], 1)
+
+    def test_span_ring_is_bounded_and_sorted_by_duration(self):
+        for i in range(20):
+            self.recorder.add(perf.Span(f"op{i}", "operation", float(i)))
+        self.assertEqual(len(self.recorder.spans()), 16)
+        self.assertEqual([s.name for s in self.recorder.slowest(limit=2)], ["op19", "op18"])
+
+    def test_disabled_tracing_records_nothing(self):
+        self.recorder.enabled = False
+        @traced("decorated")
+        def work():
+            return 42
+        with span("block"):
+            self.assertEqual(work(), 42)
+        StageTimer("op").record()
+        self.assertEqual(self.recorder.spans(), [])
+        self.recorder.enabled = True
+        self.assertEqual(work(), 42)
+        self.assertEqual([s.name for s in self.recorder.spans()], ["decorated"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from PIL import Image
+from playback import FrameRing, _render_ahead, due_frame
+from texture_engine import EffectConfig
+
+class TestPlayback(unittest.TestCase):
+    def test_ring_keeps_only_window_ahead_with_wraparound(self):
+        ring = FrameRing(capacity=3)
+        ring.reset("k")
+        for i in range(5):
+            ring.put("k", i, Image.new("RGBA", (1, 1)))
+        self.assertEqual(ring.window(4, 5), [4, 0, 1])
+        missing = ring.advance(4, 5)
+        self.assertEqual(missing, [0, 1])
+        self.assertIsNotNone(ring.get(4))
+        self.assertIsNone(ring.get(2))
+
+    def test_stale_key_is_rejected(self):
+        ring = FrameRing()
+        ring.reset("old")
+        ring.reset("new")
+        self.assertFalse(ring.put("old", 0, Image.new("RGBA", (1, 1))))
+        self.assertIsNone(ring.get(0))
+
+    def test_due_frame_skips_ahead_instead_of_lagging(self):
+        self.assertEqual(due_frame(3, 10.0, 10.05, 0.1), 3)
+        self.assertEqual(due_frame(3, 10.0, 10.45, 0.1), 7)
+
+    def test_render_ahead_fills_ring_with_display_frames(self):
+        frames = [Image.new("RGBA", (40, 20), (i * 50, 0, 0, 255)) for i in range(4)]
+        ring = FrameRing(capacity=4)
+        ring.reset("k")
+        _render_ahead(ring, "k", frames, [1, 2], 20, 20, EffectConfig())
+        rendered = ring.get(1)
+        assert rendered is not None
+        self.assertEqual(rendered.size, (20, 20))
+        self.assertIsNone(ring.get(0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+from PIL import Image, ImageEnhance
+import numpy as np
+from texture_engine import EffectConfig, SheetSpec, apply_effect_config, compose_sheet, parse_bg_color, SheetCompositor, desaturation_lut, transparency_lut
+
+class TestTextureEngine(unittest.TestCase):
+    def setUp(self):
+        self.red = Image.new("RGBA", (8, 4), (255, 0, 0, 255))
+        self.green = Image.new("RGBA", (8, 4), (0, 255, 0, 255))
+
+    def test_effect_config_from_app_reads_prefixed_vars(self):
+        class V:
+            def __init__(self, value):
+                self.value = value
+            def get(self):
+                return self.value
+        class App:
+            pass
+        app = App()
+        defaults = EffectConfig()
+        for name in EffectConfig.__dataclass_fields__:
+            setattr(app, f"texture_{name}", V(getattr(defaults, name)))
+        setattr(app, "texture_blur", V(1))
+        setattr(app, "texture_blur_value", V(2))
+        config = EffectConfig.from_app(app, "texture")
+        self.assertTrue(config.blur)
+        self.assertEqual(config.blur_value, 2.0)
+        self.assertFalse(config.is_identity)
+
+    def test_normalized_ignores_values_of_inactive_effects(self):
+        a = EffectConfig(blur=False, blur_value=7.0)
+        b = EffectConfig(blur=False, blur_value=1.0)
+        self.assertEqual(a.normalized(), b.normalized())
+        self.assertEqual(hash(a.normalized()), hash(b.normalized()))
+
+    def test_apply_effect_config_does_not_mutate_input(self):
+        src = self.red.copy()
+        out = apply_effect_config(src, EffectConfig(transparency=True, transparency_value=0.5))
+        self.assertEqual(src.getpixel((0, 0)), (255, 0, 0, 255))
+        self.assertEqual(out.getchannel("A").getpixel((0, 0)), 127)
+
+    def test_fused_pointwise_effects_match_pillow_reference(self):
+        rng = np.random.default_rng(3)
+        src = Image.fromarray(rng.integers(0, 256, (16, 16, 4), dtype=np.uint8))
+        effects = EffectConfig(grayscale=True, transparency=True, transparency_value=0.3,
+                               colorintensity_active=True, colorintensity=0.8)
+        out = apply_effect_config(src, effects)
+        gray = src.convert("L").convert("RGBA")
+        gray.putalpha(src.split()[-1].point(lambda p: int(p * 0.3)))
+        expected = ImageEnhance.Color(gray).enhance(1.0 + (0.8 - 0.5) * 2)
+        self.assertTrue(np.array_equal(np.array(out), np.array(expected)))
+
+    def test_pointwise_luts_are_cached_and_exact(self):
+        lut = transparency_lut(0.3)
+        self.assertIs(lut, transparency_lut(0.3))
+        self.assertEqual(lut.tolist(), [int(p * 0.3) for p in range(256)])
+        src = Image.new("RGBA", (4, 4), (200, 100, 0, 255))
+        out = apply_effect_config(src, EffectConfig(colorintensity_active=True, colorintensity=0.2))
+        factor = 0.4
+        expected = tuple(int(min(255, c * factor + 255 * (1 - factor))) for c in (200, 100, 0))
+        self.assertEqual(out.getpixel((0, 0)), expected + (255,))
+        self.assertIs(desaturation_lut(0.2), desaturation_lut(0.2))
+
+    def test_compose_sheet_places_frames_in_grid_order(self):
+        frames = [self.red, self.green, self.red]
+        spec = SheetSpec.for_frames(frames, (0, 0, 255, 255))
+        self.assertEqual((spec.tiles_x, spec.tiles_y), (3, 1))
+        sheet = compose_sheet(frames, spec, EffectConfig())
+        self.assertEqual(sheet.size, (24, 4))
+        arr = np.array(sheet)
+        self.assertEqual(tuple(arr[0, 0]), (255, 0, 0, 255))
+        self.assertEqual(tuple(arr[0, 8]), (0, 255, 0, 255))
+        self.assertEqual(tuple(arr[0, 16]), (255, 0, 0, 255))
+
+    def test_atlas_blend_matches_pillow_alpha_composite(self):
+        rng = np.random.default_rng(7)
+        binary = rng.integers(0, 256, (6, 5, 4), dtype=np.uint8)
+        binary[..., 3] = np.where(binary[..., 3] > 128, 255, 0)
+        edges = binary.copy()
+        edges[0, :, 3] = 90
+        dense = rng.integers(0, 256, (6, 5, 4), dtype=np.uint8)
+        frames = [Image.fromarray(a) for a in (binary, edges, dense)]
+        for bg in ((0, 0, 0, 0), (30, 60, 90, 200), (9, 9, 9, 255), (255, 0, 0, 0)):
+            spec = SheetSpec.for_frames(frames, bg)
+            sheet = np.array(compose_sheet(frames, spec, EffectConfig()))
+            for idx, frame in enumerate(frames):
+                x, y = spec.cell_origin(idx)
+                expected = np.array(Image.alpha_composite(Image.new("RGBA", frame.size, bg), frame))
+                self.assertTrue(np.array_equal(sheet[y:y + spec.frame_h, x:x + spec.frame_w], expected), (bg, idx))
+
+    def test_compositor_repaints_only_changed_cells(self):
+        frames = [self.red, self.green, self.red.copy(), self.green.copy()]
+        effects = EffectConfig(grayscale=True)
+        compositor = SheetCompositor()
+        spec = SheetSpec.for_frames(frames, (0, 0, 255, 255))
+        first = compositor.compose(frames, spec, effects)
+        self.assertEqual(compositor.last_dirty_cells, 4)
+        self.assertIs(compositor.compose(frames, spec, effects), first)
+        self.assertEqual(compositor.last_dirty_cells, 0)
+        # Gleiches Raster, ein Frame ersetzt: nur eine Kachel, altes Sheet unverändert
+        frames = frames[:1] + [self.red.copy()] + frames[2:]
+        compositor.compose(frames, spec, effects)
+        self.assertEqual(compositor.last_dirty_cells, 1)
+        self.assertEqual(first.getpixel((8, 0)), self.green.convert("L").convert("RGBA").getpixel((0, 0)))
+        for sheet_frames in (frames, frames[:3], [self.green] + frames):
+            spec = SheetSpec.for_frames(sheet_frames, (0, 0, 255, 255))
+            expected = compose_sheet(sheet_frames, spec, effects)
+            self.assertTrue(np.array_equal(np.array(compositor.compose(sheet_frames, spec, effects)), np.array(expected)))
+
+    def test_compositor_reuses_tiles_on_grid_change(self):
+        from effect_cache import EffectCache
+        cache = EffectCache(max_bytes=1024 * 1024)
+        compositor = SheetCompositor(cache=cache)
+        effects = EffectConfig(grayscale=True)
+        frames = [self.red, self.green, self.red.copy(), self.green.copy()]
+        compositor.compose(frames, SheetSpec.for_frames(frames), effects)
+        frames = frames + [self.red.copy()]
+        compositor.compose(frames, SheetSpec.for_frames(frames), effects)
+        # Nur der neue Frame wird bearbeitet, die übrigen Kacheln kommen aus dem Cache
+        self.assertEqual((cache.hits, cache.misses), (4, 5))
+
+    def test_compositor_preview_composes_at_display_size(self):
+        from effect_cache import EffectCache
+        cache = EffectCache(max_bytes=1024 * 1024)
+        compositor = SheetCompositor(cache=cache)
+        effects = EffectConfig(grayscale=True)
+        frames = [Image.new("RGBA", (64, 64), (255, 0, 0, 255)), Image.new("RGBA", (64, 64), (0, 255, 0, 255))]
+        spec = SheetSpec.for_frames(frames, (0, 0, 255, 255))
+        preview = compositor.compose(frames, spec, effects, display_size=(40, 40))
+        thumb = spec.fit_within(40, 40)
+        self.assertEqual(preview.size, thumb.size)
+        self.assertLessEqual(max(preview.size), 40)
+        x, y = thumb.cell_origin(1)
+        expected = apply_effect_config(frames[1], effects).getpixel((0, 0))
+        self.assertEqual(preview.getpixel((x + thumb.frame_w // 2, y + thumb.frame_h // 2)), expected)
+        # Verkleinerte Kacheln kommen beim nächsten Aufbau aus dem Cache
+        compositor.reset()
+        compositor.compose(frames, spec, effects, display_size=(40, 40))
+        self.assertEqual(cache.hits, 2)
+        # Nie größer als das volle Sheet
+        self.assertEqual(spec.fit_within(1000, 1000), spec)
+
+    def test_draft_compositor_prefers_cached_thumbnails(self):
+        from effect_cache import EffectCache
+        cache = EffectCache(max_bytes=1024 * 1024)
+        rng = np.random.default_rng(5)
+        frames = [Image.fromarray(rng.integers(0, 256, (32, 32, 4), dtype=np.uint8)) for _ in range(2)]
+        spec = SheetSpec.for_frames(frames, (0, 0, 0, 255))
+        effects = EffectConfig(grayscale=True)
+        draft = SheetCompositor(cache=cache, draft=True).compose(frames, spec, effects, display_size=(20, 20))
+        fine = SheetCompositor(cache=cache).compose(frames, spec, effects, display_size=(20, 20))
+        self.assertEqual(draft.size, fine.size)
+        self.assertFalse(np.array_equal(np.array(draft), np.array(fine)))
+        # Nach dem genauen Durchgang nimmt ein neuer Entwurf dessen Kacheln
+        redraft = SheetCompositor(cache=cache, draft=True).compose(frames, spec, EffectConfig(transparency=True), display_size=(20, 20))
+        expected = SheetCompositor().compose(frames, spec, EffectConfig(transparency=True), display_size=(20, 20))
+        self.assertTrue(np.array_equal(np.array(redraft), np.array(expected)))
+
+    def test_parse_bg_color_formats(self):
+        self.assertEqual(parse_bg_color("#10203040"), (16, 32, 48, 64))
+        self.assertEqual(parse_bg_color("#102030"), (16, 32, 48, 255))
+        self.assertEqual(parse_bg_color("invalid"), (0, 0, 0, 0))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import threading
+import unittest
+from typing import Any
+from threading_utils import DISPATCH_EVENT, DISPATCH_POLL_MS, ChangeCoalescer, UiDispatcher, tcl_is_threaded
+
+class FakeTcl:
+    def __init__(self, threaded):
+        self.threaded = threaded
+
+    def call(self, *args):
+        if args == ("info", "exists", "tcl_platform(threaded)"):
+            return int(self.threaded)
+        if args == ("set", "tcl_platform(threaded)"):
+            return "1"
+        if args == ("info", "tclversion"):
+            return "8.6"
+        raise ValueError(args)
+
+class FakeRoot:
+    """Minimaler Tk-Ersatz: event_generate merkt sich Weckrufe statt sie auszuführen"""
+    def __init__(self, threaded=True):
+        self.tk = FakeTcl(threaded)
+        self.bindings: dict[str, Any] = {}
+        self.wakeups = 0
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def event_generate(self, sequence, when=None):
+        self.wakeups += 1
+
+    def after(self, ms, func):
+        self.delay = ms
+        self.scheduled = func
+        return "after#1"
+
+    def after_cancel(self, after_id):
+        self.scheduled = None
+
+class TestUiDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.dispatcher = UiDispatcher(self.root)
+        self.received: list[Any] = []
+        self.dispatcher.register("texture_preview", self.received.append)
+
+    def test_latest_result_wins_with_single_wakeup(self):
+        self.dispatcher.post("texture_preview", "old")
+        self.dispatcher.post("texture_preview", "new")
+        self.assertEqual(self.root.wakeups, 1)
+        self.root.bindings[DISPATCH_EVENT](None)
+        self.assertEqual(self.received, ["new"])
+
+    def test_post_after_drain_wakes_again(self):
+        self.dispatcher.post("texture_preview", 1)
+        self.dispatcher.drain()
+        self.dispatcher.post("texture_preview", 2)
+        self.dispatcher.drain()
+        self.assertEqual(self.root.wakeups, 2)
+        self.assertEqual(self.received, [1, 2])
+
+    def test_posts_from_worker_threads_are_delivered_once_per_channel(self):
+        gif_frames: list[int] = []
+        self.dispatcher.register("gif_frame", gif_frames.append)
+        threads = [threading.Thread(target=self.dispatcher.post, args=("gif_frame", i)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.dispatcher.drain()
+        self.assertEqual(len(gif_frames), 1)
+        self.assertEqual(self.root.wakeups, 1)
+
+    def test_unthreaded_tcl_is_polled_instead_of_woken(self):
+        root = FakeRoot(threaded=False)
+        dispatcher = UiDispatcher(root)
+        received: list[Any] = []
+        dispatcher.register("texture_preview", received.append)
+        self.assertNotIn(DISPATCH_EVENT, root.bindings)
+        worker = threading.Thread(target=dispatcher.post, args=("texture_preview", "sheet"))
+        worker.start()
+        worker.join()
+        # Worker rühren Tk nicht an; die after-Schleife liefert aus und plant sich neu
+        self.assertEqual(root.wakeups, 0)
+        self.assertEqual(root.delay, DISPATCH_POLL_MS)
+        root.scheduled()
+        self.assertEqual(received, ["sheet"])
+        root.scheduled()
+        self.assertEqual(received, ["sheet"])
+
+    def test_detects_threaded_tcl(self):
+        self.assertTrue(tcl_is_threaded(FakeRoot()))
+        self.assertFalse(tcl_is_threaded(FakeRoot(threaded=False)))
+        self.assertFalse(tcl_is_threaded(object()))
+
+class TestChangeCoalescer(unittest.TestCase):
+    def test_many_writes_trigger_one_update_per_target(self):
+        root = FakeRoot()
+        coalescer = ChangeCoalescer(root)
+        calls = []
+        coalescer.register("gif", lambda: calls.append("gif"))
+        coalescer.register("texture", lambda: calls.append("texture"))
+        callback = coalescer.trace_callback("texture")
+        for _ in range(20):
+            callback("PY_VAR0", "", "write")
+        coalescer.mark("gif")
+        root.scheduled()
+        self.assertEqual(calls, ["gif", "texture"])
+        self.assertEqual(coalescer.flushes, 1)
+        # Nach dem Auslösen plant die nächste Änderung wieder neu
+        coalescer.mark("texture")
+        coalescer.discard("texture")
+        root.scheduled()
+        self.assertEqual(calls, ["gif", "texture"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from typing import cast
+from unittest import mock
+from PIL import Image
+import numpy as np
+from texture_engine import EffectConfig, SheetSpec, compose_sheet
+from app_types import ModernAppProtocol
+from tile_pool import TilePool, _chunks
+
+class TestTilePool(unittest.TestCase):
+    pool: TilePool
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = TilePool(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_parallel_sheet_matches_serial_compose(self):
+        rng = np.random.default_rng(11)
+        frames = []
+        for _ in range(10):
+            arr = rng.integers(0, 256, (12, 10, 4), dtype=np.uint8)
+            arr[..., 3] = np.where(arr[..., 3] > 100, 255, 0)
+            frames.append(Image.fromarray(arr))
+        spec = SheetSpec.for_frames(frames, (10, 20, 30, 255))
+        effects = EffectConfig(grayscale=True, blur=True, blur_value=1.0)
+        expected = compose_sheet(frames, spec, effects)
+        sheet = self.pool.compose(frames, spec, effects)
+        self.assertEqual(sheet.size, spec.size)
+        self.assertTrue(np.array_equal(np.array(sheet), np.array(expected)))
+
+    def test_lazy_frames_are_copied_one_at_a_time(self):
+        import os
+        import tempfile
+        from benchmark import synthetic_gif
+        from frame_store import LazyGifFrames
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "long.gif")
+            with open(path, "wb") as handle:
+                handle.write(synthetic_gif(12, 16, alpha=True))
+            frames = LazyGifFrames.open(path, max_decoded=2, prefetch_count=0)
+            source = frames.token(0).source
+            assert source is not None
+            try:
+                self.assertEqual(frames.frame_size(5), (16, 16))
+                self.assertEqual(source.decoded_count, 0)
+                spec = SheetSpec.for_frames(frames, (0, 0, 0, 0))
+                sheet = self.pool.compose(frames, spec, EffectConfig())
+                self.assertLessEqual(source.decoded_count, 2)
+                expected = compose_sheet([frames[i] for i in range(len(frames))], spec, EffectConfig())
+                self.assertTrue(np.array_equal(np.array(sheet), np.array(expected)))
+            finally:
+                source.close()
+
+    def test_gui_save_composes_through_tile_pool(self):
+        from benchmark import HeadlessApp, synthetic_frames
+        from image_processing import create_smart_scaled_texture
+        frames = synthetic_frames(9, 16, alpha=True, seed=3)
+        spec = SheetSpec.for_frames(frames, (0, 0, 0, 0))
+        with mock.patch("image_processing.get_tile_pool", return_value=self.pool), \
+                mock.patch.object(self.pool, "compose", wraps=self.pool.compose) as compose:
+            sheet = create_smart_scaled_texture(cast(ModernAppProtocol, HeadlessApp(frames)), spec.size[0], spec.size[1], (0, 0, 0, 0), preview_mode=False)
+        compose.assert_called_once()
+        self.assertTrue(np.array_equal(np.array(sheet), np.array(compose_sheet(frames, spec, EffectConfig()))))
+
+    def test_small_sheets_stay_in_process(self):
+        frames = [Image.new("RGBA", (4, 4), (255, 0, 0, 255))] * 2
+        spec = SheetSpec.for_frames(frames)
+        pool = TilePool(max_workers=2)
+        sheet = pool.compose(frames, spec, EffectConfig())
+        self.assertEqual(sheet.getpixel((5, 0)), (255, 0, 0, 255))
+        self.assertIsNone(pool._executor)
+
+    def test_chunks_cover_all_tiles_in_order(self):
+        tiles = [(i, i * 16, 2, 2) for i in range(10)]
+        chunks = _chunks(tiles, 4)
+        self.assertLessEqual(len(chunks), 4)
+        self.assertEqual([t for c in chunks for t in c], tiles)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+from exceptions import TaskCancelledError
+from worker_pool import TaskPriority, WorkerPool, current_token
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(max_workers=1)
+        self.gate = threading.Event()
+        self.blocker = self.pool.submit("blocker", self.gate.wait, 5)
+
+    def tearDown(self):
+        self.gate.set()
+        self.pool.shutdown()
+
+    def test_latest_wins_replaces_queued_task(self):
+        old = self.pool.submit("preview", lambda: "old")
+        new = self.pool.submit("preview", lambda: "new")
+        self.gate.set()
+        self.assertEqual(new.result(timeout=5), "new")
+        self.assertTrue(old.cancelled())
+
+    def test_replace_false_keeps_existing_task(self):
+        first = self.pool.submit("prefetch", lambda: 1)
+        second = self.pool.submit("prefetch", lambda: 2, replace=False)
+        self.assertIs(first, second)
+
+    def test_interactive_runs_before_background(self):
+        order: list[str] = []
+        self.pool.submit("export", order.append, "export", priority=TaskPriority.BACKGROUND)
+        done = self.pool.submit("preview", order.append, "preview", priority=TaskPriority.INTERACTIVE)
+        self.gate.set()
+        done.result(timeout=5)
+        self.pool.wait_all(timeout=5)
+        self.assertEqual(order, ["preview", "export"])
+
+    def test_running_task_is_cancelled_cooperatively(self):
+        started = threading.Event()
+        def work():
+            started.set()
+            token = current_token()
+            while not token.cancelled:
+                time.sleep(0.01)
+            token.raise_if_cancelled()
+        self.gate.set()
+        running = self.pool.submit("preview", work)
+        self.assertTrue(started.wait(5))
+        latest = self.pool.submit("preview", lambda: "latest")
+        with self.assertRaises(TaskCancelledError):
+            running.result(timeout=5)
+        self.assertEqual(latest.result(timeout=5), "latest")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,725 @@
+###
+# texture_engine.py
+# Headless sprite-sheet engine for OSSL2Gif (no Tk dependencies)
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Reine Bildverarbeitungs-Engine ohne GUI-Abhängigkeiten.
+
+Frames + unveränderliche Einstellungen (EffectConfig, SheetSpec) rein,
+PIL-Image raus. Wird von der GUI (image_processing.py), Batch-Jobs und
+Tests gleichermaßen genutzt und kann in Worker-Prozessen laufen.
+"""
+
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Literal, Optional, Sequence
+from PIL import Image, ImageColor, ImageEnhance, ImageFilter
+import math
+import threading
+import numpy as np
+from app_types import RGBAColor
+from gif_decoder import GifFormatError, decode_gif
+from perf import NULL_TIMER, StageTimer
+
+if TYPE_CHECKING:
+	from effect_cache import EffectCache
+
+EffectPrefix = Literal["gif", "texture"]
+
+# Programmversion (main.Version) – hier, damit auch der Batch-Modus sie ohne GUI-Import kennt
+APP_VERSION = "2.3.0"
+
+@dataclass(frozen=True)
+class EffectConfig:
+	"""Unveränderliche Effekt-Einstellungen für einen Vorschau-Bereich (gif/texture)."""
+	grayscale: bool = False
+	sharpen: bool = False
+	sharpen_value: float = 2.5
+	blur: bool = False
+	blur_value: float = 3.5
+	transparency: bool = False
+	transparency_value: float = 0.5
+	colorintensity_active: bool = False
+	colorintensity: float = 0.5
+
+	@classmethod
+	def from_app(cls, app: Any, prefix: EffectPrefix) -> "EffectConfig":
+		"""
+		Liest die Tk-Variablen einer App-Instanz genau einmal aus.
+
+		Args:
+			app: Objekt mit `<prefix>_grayscale`, `<prefix>_sharpen_value`, ... Variablen
+			prefix: "gif" oder "texture"
+		"""
+		values = app.__dict__
+		return cls(
+			grayscale=bool(values[f'{prefix}_grayscale'].get()),
+			sharpen=bool(values[f'{prefix}_sharpen'].get()),
+			sharpen_value=float(values[f'{prefix}_sharpen_value'].get()),
+			blur=bool(values[f'{prefix}_blur'].get()),
+			blur_value=float(values[f'{prefix}_blur_value'].get()),
+			transparency=bool(values[f'{prefix}_transparency'].get()),
+			transparency_value=float(values[f'{prefix}_transparency_value'].get()),
+			colorintensity_active=bool(values[f'{prefix}_colorintensity_active'].get()),
+			colorintensity=float(values[f'{prefix}_colorintensity'].get()),
+		)
+
+	def normalized(self) -> "EffectConfig":
+		"""
+		Gibt eine Kopie zurück, bei der Werte inaktiver Effekte auf Defaults stehen.
+		Zwei Konfigurationen mit identischem Ergebnis sind danach gleich (und gleich gehasht).
+		"""
+		defaults = EffectConfig()
+		return EffectConfig(
+			grayscale=self.grayscale,
+			sharpen=self.sharpen,
+			sharpen_value=self.sharpen_value if self.sharpen else defaults.sharpen_value,
+			blur=self.blur,
+			blur_value=self.blur_value if self.blur else defaults.blur_value,
+			transparency=self.transparency,
+			transparency_value=self.transparency_value if self.transparency else defaults.transparency_value,
+			colorintensity_active=self.colorintensity_active,
+			colorintensity=self.colorintensity if self.colorintensity_active else defaults.colorintensity,
+		)
+
+	def scaled(self, factor: float) -> "EffectConfig":
+		"""
+		Für verkleinerte Vorschauen: Weichzeichner-Radius (Pixelmaß) mitskalieren,
+		damit das Ergebnis wie das herunterskalierte Original aussieht.
+		"""
+		if factor == 1.0 or not self.blur:
+			return self
+		return replace(self, blur_value=self.blur_value * factor)
+
+	@property
+	def is_identity(self) -> bool:
+		"""True wenn keine Effekte das Bild verändern würden."""
+		return not (
+			self.grayscale
+			or self.sharpen
+			or (self.blur and self.blur_value > 0)
+			or self.transparency
+			or (self.colorintensity_active and self.colorintensity != 0.5)
+		)
+
+@dataclass(frozen=True)
+class SheetSpec:
+	"""Unveränderliche Beschreibung eines Sprite-Sheets (Raster, Kachelgröße, Hintergrund)."""
+	tiles_x: int
+	tiles_y: int
+	frame_w: int
+	frame_h: int
+	bg_rgba: RGBAColor = (0, 0, 0, 0)
+
+	@classmethod
+	def for_frames(cls, frames: Sequence[Image.Image], bg_rgba: RGBAColor = (0, 0, 0, 0), prefer_single_row_odd: bool = True) -> "SheetSpec":
+		"""Berechnet Raster und Kachelgröße für eine Frame-Liste (Größe des ersten Frames)."""
+		tiles_x, tiles_y = calculate_optimal_grid(len(frames), prefer_single_row_odd=prefer_single_row_odd)
+		if len(frames) > 0:
+			frame_w, frame_h = frames[0].size
+		else:
+			frame_w, frame_h = 256, 256
+		return cls(tiles_x, tiles_y, frame_w, frame_h, bg_rgba)
+
+	@property
+	def size(self) -> tuple[int, int]:
+		"""Optimale Sheet-Größe (ohne Ränder)"""
+		return (self.tiles_x * self.frame_w, self.tiles_y * self.frame_h)
+
+	def cell_origin(self, index: int) -> tuple[int, int]:
+		"""Linke obere Ecke der Kachel mit Index `index`."""
+		return ((index % self.tiles_x) * self.frame_w, (index // self.tiles_x) * self.frame_h)
+
+	def fit_within(self, max_w: int, max_h: int) -> "SheetSpec":
+		"""
+		Gleiches Raster mit verkleinerten Kacheln, sodass das Sheet höchstens
+		`max_w` x `max_h` groß ist (Stufe der Vorschau-Pyramide). Nie größer als das Original.
+		"""
+		frame_w = max(1, min(self.frame_w, max_w // self.tiles_x))
+		frame_h = max(1, min(self.frame_h, max_h // self.tiles_y))
+		return SheetSpec(self.tiles_x, self.tiles_y, frame_w, frame_h, self.bg_rgba)
+
+def calculate_optimal_grid(frame_count: int, prefer_single_row_odd: bool = True) -> tuple[int, int]:
+	"""
+	Berechnet optimale Raster-Aufteilung für Frames.
+	Bevorzugt Layouts ohne Verschwendung (leere Zellen) und möglichst quadratische Form.
+
+	Beispiele:
+	- 10 Frames: 5x2 (besser als 4x3 mit 2 leeren Zellen)
+	- 16 Frames: 4x4 (perfekt quadratisch)
+	- 15 Frames: 5x3 (besser als 4x4 mit 1 leerer Zelle)
+
+	Returns:
+		(tiles_x, tiles_y) - Anzahl Spalten und Zeilen
+	"""
+	if frame_count <= 0:
+		return (1, 1)
+	if frame_count == 1:
+		return (1, 1)
+
+	# Finde beste Faktorisierung
+	best_x, best_y = 1, frame_count
+	best_waste = frame_count - 1  # Maximal mögliche Verschwendung
+	best_ratio = float('inf')
+
+	# Prüfe alle möglichen Aufteilungen bis sqrt(frame_count)
+	# Wir müssen nur bis sqrt prüfen, da darüber hinaus die Faktoren sich wiederholen
+	max_check = int(math.sqrt(frame_count * 2)) + 1  # Etwas Puffer für nicht-perfekte Quadrate
+
+	for x in range(1, max_check + 1):
+		y = math.ceil(frame_count / x)
+		total_cells = x * y
+		waste = total_cells - frame_count
+		ratio = max(x, y) / min(x, y)  # Seitenverhältnis (>=1)
+
+		# Entscheidungskriterien (Priorität absteigend):
+		# 1. Minimiere Verschwendung (leere Zellen)
+		# 2. Bei gleicher Verschwendung: bevorzuge quadratischere Form
+		is_better = False
+		if waste < best_waste:
+			is_better = True
+		elif waste == best_waste and ratio < best_ratio:
+			is_better = True
+
+		if is_better:
+			best_x, best_y = x, y
+			best_waste = waste
+			best_ratio = ratio
+
+	# Optional: Bei ungerader Frame-Zahl nicht einreihig anordnen.
+	# Beispiel: 5 Frames -> 3x2 statt 5x1
+	if not prefer_single_row_odd and frame_count > 3 and frame_count % 2 == 1 and min(best_x, best_y) == 1:
+		compact_x = math.ceil(math.sqrt(frame_count))
+		compact_y = math.ceil(frame_count / compact_x)
+		best_x, best_y = compact_x, compact_y
+
+	# Stelle sicher, dass tiles_x >= tiles_y (mehr Spalten als Zeilen)
+	if best_x < best_y:
+		best_x, best_y = best_y, best_x
+
+	return (best_x, best_y)
+
+def parse_bg_color(bg_color: Any) -> RGBAColor:
+	"""
+	Parst eine Hintergrundfarbe im Format #RRGGBBAA oder #RRGGBB.
+	Ungültige Werte ergeben vollständig transparentes Schwarz.
+	"""
+	try:
+		if isinstance(bg_color, str) and len(bg_color) == 9 and bg_color.startswith('#'):
+			# Format: #RRGGBBAA
+			return (int(bg_color[1:3], 16), int(bg_color[3:5], 16), int(bg_color[5:7], 16), int(bg_color[7:9], 16))
+		if isinstance(bg_color, str) and len(bg_color) == 7 and bg_color.startswith('#'):
+			# Format: #RRGGBB (vollständig undurchsichtig)
+			color_result = ImageColor.getcolor(bg_color, "RGBA")
+			if isinstance(color_result, tuple) and len(color_result) >= 3:
+				return (int(color_result[0]), int(color_result[1]), int(color_result[2]), 255)
+	except Exception:
+		pass
+	return (0, 0, 0, 0)
+
+# Pillow-Gewichte für RGB -> L (ITU-R 601-2, 16-Bit-Festkomma wie in Convert.c)
+_L_WEIGHTS = (19595, 38470, 7471)
+_L_ROUND = 0x8000
+
+def _luminance(arr: np.ndarray, out: Optional[np.ndarray] = None, scratch: Optional[np.ndarray] = None) -> np.ndarray:
+	"""
+	Berechnet die Pillow-Luminanz eines RGBA-Arrays bitgenau (uint32, 0-255).
+
+	Args:
+		arr: uint8-Array (H, W, 4)
+		out/scratch: Optionale wiederverwendbare uint32-Puffer (H, W)
+	"""
+	if out is None:
+		out = np.empty(arr.shape[:2], dtype=np.uint32)
+	if scratch is None:
+		scratch = np.empty(arr.shape[:2], dtype=np.uint32)
+	np.multiply(arr[..., 0], _L_WEIGHTS[0], out=out, dtype=np.uint32)
+	np.multiply(arr[..., 1], _L_WEIGHTS[1], out=scratch, dtype=np.uint32)
+	out += scratch
+	np.multiply(arr[..., 2], _L_WEIGHTS[2], out=scratch, dtype=np.uint32)
+	out += scratch
+	out += _L_ROUND
+	out >>= 16
+	return out
+
+def _apply_grayscale_inplace(arr: np.ndarray) -> None:
+	"""Graustufen wie `convert("L")`, Alpha bleibt unverändert."""
+	lum = _luminance(arr)
+	for channel in range(3):
+		np.copyto(arr[..., channel], lum, casting='unsafe')
+
+@lru_cache(maxsize=64)
+def transparency_lut(value: float) -> np.ndarray:
+	"""
+	256-Einträge-LUT für die Alpha-Skalierung `int(p * value)`.
+	Pro Reglerwert nur einmal berechnet; das Array ist schreibgeschützt (geteilt).
+	"""
+	lut = np.clip(np.arange(256, dtype=np.float64) * value, 0, 255).astype(np.uint8)
+	lut.setflags(write=False)
+	return lut
+
+@lru_cache(maxsize=64)
+def desaturation_lut(colorint: float) -> np.ndarray:
+	"""
+	256-Einträge-LUT für Farbintensität < 0.5: `c * f + 255 * (1 - f)` mit f = colorint * 2.
+	Gleiche float64-Rundung wie die frühere Ganzbild-Rechnung, aber nur 256 Werte.
+	"""
+	factor = colorint * 2
+	lut = np.clip(np.arange(256, dtype=np.float64) * factor + 255 * (1 - factor), 0, 255).astype(np.uint8)
+	lut.setflags(write=False)
+	return lut
+
+def _apply_pointwise_inplace(arr: np.ndarray, effects: EffectConfig) -> None:
+	"""
+	Transparenz und Farbintensität in einem Durchgang über ein RGBA-Array.
+	Reine Wertabbildungen laufen über gecachte LUTs, nur die Sättigung braucht float32.
+	"""
+	if effects.transparency:
+		alpha = arr[..., 3]
+		np.take(transparency_lut(effects.transparency_value), alpha, out=alpha)
+	if not (effects.colorintensity_active and effects.colorintensity != 0.5):
+		return
+	colorint = effects.colorintensity
+	rgb = arr[..., :3]
+	if colorint < 0.5:
+		# Entsättigen Richtung Weiß
+		np.take(desaturation_lut(colorint), rgb, out=rgb)
+		return
+	# Wie ImageEnhance.Color: blend(Graustufen, Bild, f) = L + f * (c - L)
+	factor = np.float32(1.0 + (colorint - 0.5) * 2)
+	work = rgb.astype(np.float32)
+	lum = _luminance(arr).astype(np.float32)[..., None]
+	work -= lum
+	work *= factor
+	work += lum
+	np.clip(work, 0, 255, out=work)
+	np.copyto(rgb, work, casting='unsafe')
+
+def apply_effect_config(img: Image.Image, effects: EffectConfig) -> Image.Image:
+	"""
+	Wendet Effekte (Graustufen, Schärfe, Weichzeichnen, Transparenz, Farbintensität) auf ein Bild an.
+	Ergebnis ist immer RGBA. Das Eingabebild wird nicht verändert.
+
+	Punktweise Effekte laufen fusioniert auf einem einzigen uint8-RGBA-Array;
+	nur Schärfe/Weichzeichnen (Nachbarschaftsfilter) bleiben bei Pillow.
+	"""
+	if img.mode != "RGBA":
+		img = img.convert("RGBA")
+	if effects.is_identity:
+		return img
+	needs_filter = effects.sharpen or (effects.blur and effects.blur_value > 0)
+	# np.array kopiert – das Eingabebild bleibt unangetastet
+	arr = np.array(img)
+	if effects.grayscale:
+		_apply_grayscale_inplace(arr)
+	if needs_filter:
+		if effects.grayscale:
+			img = Image.fromarray(arr)
+		if effects.sharpen:
+			img = ImageEnhance.Sharpness(img).enhance(effects.sharpen_value)
+		if effects.blur and effects.blur_value > 0:
+			img = img.filter(ImageFilter.GaussianBlur(effects.blur_value))
+		arr = np.array(img)
+	_apply_pointwise_inplace(arr, effects)
+	return Image.fromarray(arr)
+
+def process_frame(frame: Image.Image, effects: EffectConfig, cache: Optional["EffectCache"] = None) -> Image.Image:
+	"""Wendet Effekte auf einen Frame an, über den Cache falls vorhanden (Ergebnis nicht verändern!)."""
+	if cache is None or effects.is_identity:
+		return apply_effect_config(frame, effects)
+	return cache.get_or_compute(frame, effects, lambda: apply_effect_config(frame, effects))
+
+def compose_sheet(frames: Iterable[Image.Image], spec: SheetSpec, effects: EffectConfig, cache: Optional["EffectCache"] = None, timer: StageTimer = NULL_TIMER) -> Image.Image:
+	"""
+	Setzt alle Frames (mit Effekten, in Originalgröße) in ein Sheet in optimaler Größe.
+
+	Args:
+		frames: Frames in Abspielreihenfolge
+		spec: Raster/Kachelgröße/Hintergrund
+		effects: Anzuwendende Effekte
+		cache: Optionaler EffectCache für bereits bearbeitete Frames
+		timer: Optional – misst die Stufen "effects" und "compose"
+
+	Returns:
+		RGBA-Sheet in Größe `spec.size`
+	"""
+	atlas = new_atlas(spec)
+	for idx, frame in enumerate(frames):
+		with timer.stage("effects"):
+			tile = process_frame(frame, effects, cache)
+		with timer.stage("compose"):
+			blend_cell(atlas, spec, idx, tile)
+	return atlas_to_image(atlas)
+
+def thumbnail_tile(frame: Image.Image, spec: SheetSpec, thumb: SheetSpec, effects: EffectConfig, resample: Image.Resampling = Image.Resampling.LANCZOS) -> Image.Image:
+	"""
+	Kachel für ein verkleinertes Sheet: Frame auf die Originalzelle beschneiden/auffüllen
+	(wie `blend_cell`), auf die Zelle von `thumb` verkleinern, dann Effekte anwenden.
+
+	Args:
+		resample: LANCZOS für die endgültige Vorschau, BOX/NEAREST für Entwürfe
+	"""
+	if frame.mode != "RGBA":
+		frame = frame.convert("RGBA")
+	if frame.size != (spec.frame_w, spec.frame_h):
+		# crop() außerhalb des Bildes füllt transparent auf
+		frame = frame.crop((0, 0, spec.frame_w, spec.frame_h))
+	if (thumb.frame_w, thumb.frame_h) != (spec.frame_w, spec.frame_h):
+		frame = frame.resize((thumb.frame_w, thumb.frame_h), resample)
+	return apply_effect_config(frame, effects.scaled(thumb.frame_w / spec.frame_w))
+
+def new_atlas(spec: SheetSpec, buffer: Any = None) -> np.ndarray:
+	"""
+	Vorbelegter (H, W, 4) uint8-Atlas, mit der Hintergrundfarbe gefüllt.
+
+	Args:
+		spec: Raster/Kachelgröße/Hintergrund
+		buffer: Optionaler Puffer (z.B. SharedMemory.buf), sonst neu alloziert
+	"""
+	width, height = spec.size
+	if buffer is None:
+		atlas = np.empty((height, width, 4), dtype=np.uint8)
+	else:
+		atlas = np.ndarray((height, width, 4), dtype=np.uint8, buffer=buffer)
+	# Füllen über die uint32-Sicht: ein Wert pro Pixel statt Broadcast über 4 Kanäle
+	atlas.view(np.uint32).fill(_pack_rgba(spec.bg_rgba))
+	return atlas
+
+def atlas_to_image(atlas: np.ndarray) -> Image.Image:
+	"""
+	Macht aus dem Atlas ein PIL-Image ohne Kopie (Pillow mappt den Puffer).
+	Der Atlas darf danach nicht mehr verändert werden.
+	"""
+	return Image.fromarray(atlas)
+
+# Alpha-Byte eines gepackten RGBA-Pixels (unabhängig von der Byte-Reihenfolge)
+_ALPHA_MASK32 = np.array([0, 0, 0, 255], dtype=np.uint8).view(np.uint32)[0]
+
+# Ab diesem Anteil teiltransparenter Pixel (1/N) wird die ganze Zelle von Pillow gemischt
+_SPARSE_BLEND_RATIO = 16
+
+def _pack_rgba(rgba: RGBAColor) -> np.uint32:
+	"""RGBA-Farbe als ein uint32 mit derselben Byte-Reihenfolge wie ein Atlas-Pixel"""
+	packed: np.uint32 = np.array(rgba, dtype=np.uint8).view(np.uint32)[0]
+	return packed
+
+def _rgba32(arr: np.ndarray) -> np.ndarray:
+	"""(H, W, 4) uint8 als (H, W) uint32-View (letzte Achse muss zusammenhängend sein)"""
+	return arr.view(np.uint32)[..., 0]
+
+@lru_cache(maxsize=16)
+def _blend_luts(bg_rgba: RGBAColor) -> tuple[np.ndarray, np.ndarray]:
+	"""
+	Ergebnis von `Image.alpha_composite(Hintergrund, Pixel)` für alle (Alpha, Kanalwert)-Paare:
+	Farb-LUT (3, 256 * 256) indiziert mit `alpha << 8 | wert` und Alpha-LUT (256).
+	Nachgebildet ist Pillows Ganzzahl-Variante (7 Bit Zusatzpräzision, SHIFTFORDIV255).
+	"""
+	src_a = np.arange(256, dtype=np.uint32)[:, None]
+	value = np.arange(256, dtype=np.uint32)[None, :]
+	out_a255 = src_a * 255 + bg_rgba[3] * (255 - src_a)
+	coef1 = (src_a * (255 * 255 * 128)) // np.maximum(out_a255, 1)
+	coef2 = 255 * 128 - coef1
+	color = np.empty((3, 256, 256), dtype=np.uint8)
+	for channel in range(3):
+		tmp = value * coef1 + bg_rgba[channel] * coef2 + (0x80 << 7)
+		color[channel] = (((tmp >> 8) + tmp) >> 8) >> 7
+	tmp = out_a255[:, 0] + 0x80
+	alpha = (((tmp >> 8) + tmp) >> 8).astype(np.uint8)
+	# Alpha 0: Hintergrund bleibt stehen
+	color[:, 0, :] = np.array(bg_rgba[:3], dtype=np.uint8)[:, None]
+	alpha[0] = bg_rgba[3]
+	lut = color.reshape(3, 256 * 256)
+	lut.setflags(write=False)
+	alpha.setflags(write=False)
+	return lut, alpha
+
+def alpha_over_background(src: np.ndarray, bg_rgba: RGBAColor, out: np.ndarray) -> None:
+	"""
+	Blendet ein RGBA-Array über eine einfarbige Fläche, bitgenau wie `Image.alpha_composite`,
+	direkt in `out` (darf eine View in den Atlas sein).
+
+	Deckende Pixel werden übernommen, voll transparente durch den Hintergrund ersetzt
+	(ein uint32-Select pro Pixel); vereinzelte teiltransparente Pixel (Kanten) laufen
+	über die Blend-LUTs, überwiegend teiltransparente Kacheln über Pillow selbst.
+	"""
+	src32 = _rgba32(src)
+	src_alpha32 = src32 & _ALPHA_MASK32
+	count = 0
+	if bg_rgba[3] != 0:
+		# Über transparentem Hintergrund bleibt jeder sichtbare Pixel unverändert,
+		# sonst müssen teiltransparente Pixel gemischt werden
+		partial = (src_alpha32 != 0) & (src_alpha32 != _ALPHA_MASK32)
+		count = int(np.count_nonzero(partial))
+		if count > partial.size // _SPARSE_BLEND_RATIO:
+			# Überwiegend teiltransparent (z.B. Transparenz-Effekt): Pillows C-Routine auf die Zelle
+			h, w = src.shape[:2]
+			background = Image.new("RGBA", (w, h), tuple(bg_rgba))
+			out[...] = np.asarray(Image.alpha_composite(background, Image.fromarray(np.ascontiguousarray(src))))
+			return
+	# Bitmaske 0xFFFFFFFF für voll transparente Pixel, sonst 0 – verzweigungsfreier Select
+	select = np.negative((src_alpha32 == 0).astype(np.uint32))
+	np.bitwise_or(src32 & ~select, _pack_rgba(bg_rgba) & select, out=_rgba32(out))
+	if count == 0:
+		return
+	color, alpha = _blend_luts(tuple(bg_rgba))
+	ys, xs = np.nonzero(partial)
+	pixels = src[ys, xs]
+	index = pixels[:, 3].astype(np.intp) << 8
+	for channel in range(3):
+		out[ys, xs, channel] = color[channel][index + pixels[:, channel]]
+	out[ys, xs, 3] = alpha[pixels[:, 3]]
+
+def blend_cell(atlas: np.ndarray, spec: SheetSpec, index: int, tile: Optional[Image.Image]) -> None:
+	"""
+	Schreibt Kachel `index` direkt in den Atlas (über eine Array-View):
+	Hintergrund + `tile` darüber, oder nur Hintergrund wenn `tile` None ist.
+	Abweichende Kachelgrößen werden auf die Zelle beschnitten.
+	"""
+	x, y = spec.cell_origin(index)
+	cell = atlas[y:y + spec.frame_h, x:x + spec.frame_w]
+	if tile is None:
+		_rgba32(cell)[...] = _pack_rgba(spec.bg_rgba)
+		return
+	src = np.asarray(tile if tile.mode == "RGBA" else tile.convert("RGBA"))
+	h, w = min(src.shape[0], cell.shape[0]), min(src.shape[1], cell.shape[1])
+	if (h, w) != cell.shape[:2]:
+		_rgba32(cell)[...] = _pack_rgba(spec.bg_rgba)
+	alpha_over_background(src[:h, :w], spec.bg_rgba, cell[:h, :w])
+
+def frame_token(frames: Sequence[Image.Image], index: int) -> Any:
+	"""Stabile Identität von Frame `index` (siehe `frame_tokens`)"""
+	token = getattr(frames, 'token', None)
+	if token is not None:
+		return token(index)
+	return frames[index]
+
+def frame_tokens(frames: Sequence[Image.Image]) -> list[Any]:
+	"""
+	Stabile Identitäten der Frames für Caches.
+	Lazy Frame-Stores liefern eigene Tokens (ohne zu dekodieren), sonst die Bilder selbst.
+	"""
+	tokens = getattr(frames, 'tokens', None)
+	if tokens is not None:
+		result: list[Any] = tokens()
+		return result
+	return list(frames)
+
+class SheetCompositor:
+	"""
+	Zustandsbehafteter Sheet-Aufbau für die GUI.
+
+	Merkt sich pro Kachel den platzierten Frame (über `frame_tokens`) und baut bei
+	gleichem Raster nur geänderte Kacheln neu. Bei Rasterwechsel wird das Sheet
+	neu gesetzt; bearbeitete Kacheln kommen dabei aus dem EffectCache, Frames
+	werden nur bei einem Cache-Miss dekodiert. Zurückgegebene Sheets werden nie
+	nachträglich verändert.
+
+	Mit `display_size` entsteht eine Vorschau-Stufe: das Sheet wird direkt in
+	Anzeigegröße aus verkleinerten Kacheln gesetzt (Aufwand unabhängig von der
+	Größe des Quell-GIFs). Das volle Sheet entsteht erst beim Speichern.
+	Verkleinerte Frames werden ohne Effekte gecacht, sodass Effektänderungen nur
+	die kleinen Kacheln neu bearbeiten.
+
+	Ein Entwurfs-Compositor (`draft=True`) verkleinert mit BOX statt LANCZOS und
+	nimmt bereits gecachte LANCZOS-Kacheln, wo vorhanden – für die Sofort-Vorschau,
+	bevor der genaue Durchgang fertig ist.
+	"""
+
+	def __init__(self, cache: Optional["EffectCache"] = None, draft: bool = False):
+		self.cache = cache
+		self.draft = draft
+		self.last_dirty_cells = 0
+		self._sheet: Optional[Image.Image] = None
+		self._atlas: Optional[np.ndarray] = None
+		self._spec: Optional[SheetSpec] = None
+		self._full: Optional[SheetSpec] = None
+		self._effects: Optional[EffectConfig] = None
+		self._cells: list[Any] = []
+		self._lock = threading.Lock()
+
+	def _tile_for(self, frames: Sequence[Image.Image], index: int, token: Any, effects: EffectConfig, full: SheetSpec, spec: SheetSpec, timer: StageTimer) -> Image.Image:
+		def frame() -> Image.Image:
+			# Lazy Frame-Stores dekodieren erst beim Zugriff
+			with timer.stage("decode"):
+				return frames[index]
+
+		def with_effects(img: Image.Image, config: EffectConfig) -> Image.Image:
+			with timer.stage("effects"):
+				return apply_effect_config(img, config)
+
+		cache = self.cache
+		if spec == full:
+			compute = lambda: with_effects(frame(), effects)
+			if cache is None or effects.is_identity:
+				return compute()
+			return cache.get_or_compute(token, effects, compute)
+		# Vorschau-Stufe: erst der verkleinerte Frame (ohne Effekte, gecacht), dann Effekte darauf
+		resample = Image.Resampling.BOX if self.draft else Image.Resampling.LANCZOS
+		plain = EffectConfig()
+		scaled = effects.scaled(spec.frame_w / full.frame_w)
+
+		def shrink() -> Image.Image:
+			source = frame()
+			with timer.stage("resize"):
+				return thumbnail_tile(source, full, spec, plain, resample)
+
+		if cache is None:
+			return with_effects(shrink(), scaled)
+		variant = ("thumb", full.frame_w, full.frame_h, spec.frame_w, spec.frame_h)
+		draft_variant = variant + ("draft",)
+
+		def thumbnail() -> Image.Image:
+			if self.draft:
+				fine = cache.get(token, plain, variant)
+				if fine is not None:
+					return fine
+				return cache.get_or_compute(token, plain, shrink, draft_variant)
+			return cache.get_or_compute(token, plain, shrink, variant)
+
+		if effects.is_identity:
+			return thumbnail()
+		return cache.get_or_compute(token, effects, lambda: with_effects(thumbnail(), scaled), draft_variant if self.draft else variant)
+
+	def compose(self, frames: Sequence[Image.Image], spec: SheetSpec, effects: EffectConfig, check_cancelled: Optional[Callable[[], None]] = None, display_size: Optional[tuple[int, int]] = None, timer: StageTimer = NULL_TIMER) -> Image.Image:
+		"""
+		Liefert das Sheet für `frames`; nur geänderte Kacheln werden neu gesetzt.
+
+		Args:
+			check_cancelled: Wird zwischen den Kacheln aufgerufen und darf eine Exception
+				werfen (kooperativer Abbruch); der bisherige Zustand bleibt dann erhalten
+			display_size: Optionale Maximalgröße (Breite, Höhe) für die Vorschau;
+				das Sheet wird dann mit `spec.fit_within` verkleinert gesetzt
+			timer: Optional – misst die Stufen "decode", "resize", "effects" und "compose"
+
+		Returns:
+			RGBA-Sheet in Größe `spec.size` bzw. der verkleinerten Größe
+			(neues Objekt, falls sich etwas geändert hat)
+		"""
+		full = spec
+		if display_size is not None:
+			spec = full.fit_within(*display_size)
+		tokens = frame_tokens(frames)
+		effects = effects.normalized()
+		with self._lock:
+			if self._atlas is None or self._sheet is None or spec != self._spec or full != self._full or effects != self._effects:
+				atlas = new_atlas(spec)
+				dirty: Sequence[int] = range(len(tokens))
+			else:
+				old = self._cells
+				dirty = [
+					i for i in range(max(len(tokens), len(old)))
+					if i >= len(tokens) or i >= len(old) or tokens[i] is not old[i]
+				]
+				if not dirty:
+					self.last_dirty_cells = 0
+					return self._sheet
+				# Copy-on-write: bereits ausgelieferte Sheets teilen sich den alten Atlas
+				atlas = self._atlas.copy()
+			for idx in dirty:
+				if check_cancelled is not None:
+					check_cancelled()
+				tile = self._tile_for(frames, idx, tokens[idx], effects, full, spec, timer) if idx < len(tokens) else None
+				with timer.stage("compose"):
+					blend_cell(atlas, spec, idx, tile)
+			sheet = atlas_to_image(atlas)
+			self.last_dirty_cells = len(dirty)
+			self._sheet, self._atlas, self._spec, self._full, self._effects, self._cells = sheet, atlas, spec, full, effects, tokens
+			return sheet
+
+	def reset(self) -> None:
+		"""Verwirft das Sheet (nächster Aufruf baut komplett neu)."""
+		with self._lock:
+			self._sheet = None
+			self._atlas = None
+			self._spec = None
+			self._full = None
+			self._cells = []
+
+def scale_sheet(sheet: Image.Image, target_w: int, target_h: int) -> Image.Image:
+	"""Skaliert ein Sheet mit LANCZOS auf die Zielgröße (no-op bei gleicher Größe)."""
+	if sheet.size == (target_w, target_h):
+		return sheet
+	return sheet.resize((target_w, target_h), Image.Resampling.LANCZOS)
+
+def render_sheet(frames: Sequence[Image.Image], spec: SheetSpec, effects: EffectConfig, target_size: Optional[tuple[int, int]] = None) -> Image.Image:
+	"""Komfort-Funktion: Sheet komponieren und optional auf `target_size` skalieren."""
+	sheet = compose_sheet(frames, spec, effects)
+	if target_size is not None:
+		sheet = scale_sheet(sheet, target_size[0], target_size[1])
+	return sheet
+
+def load_gif_frames(path: str, max_frames: Optional[int] = None) -> list[Image.Image]:
+	"""
+	Lädt alle Frames einer GIF-Datei (wie der GUI-Loader, aber ohne App-Zustand).
+
+	Args:
+		path: Pfad zur GIF-Datei
+		max_frames: Optional maximale Anzahl Frames
+
+	Returns:
+		Liste fertiger RGBA-Frames (Datei ist danach geschlossen)
+	"""
+	try:
+		with open(path, "rb") as f:
+			return decode_gif(f.read(), max_frames=max_frames)
+	except GifFormatError:
+		pass
+	# Kein GIF (z.B. APNG/WebP): Pillow-Sequenz
+	frames: list[Image.Image] = []
+	with Image.open(path) as gif:
+		try:
+			while max_frames is None or len(frames) < max_frames:
+				frames.append(gif.convert("RGBA"))
+				gif.seek(len(frames))
+		except EOFError:
+			pass
+	return frames
+
+def prepare_for_export(img: Image.Image, fmt: str) -> tuple[Image.Image, str]:
+	"""
+	Bereitet ein Sheet für das Speichern im Zielformat vor.
+
+	Args:
+		img: Fertiges Sheet
+		fmt: Export-Format aus der GUI ("PNG", "JPG", "BMP", ...)
+
+	Returns:
+		(Bild, Pillow-Formatname) – JPEG wird auf weißen Hintergrund gelegt, PNG bleibt RGBA
+	"""
+	fmt = fmt.upper()
+	if fmt == "JPG":
+		fmt = "JPEG"
+	if fmt == "JPEG":
+		# JPG-Konvertierung (keine Transparenz möglich): weißer Hintergrund
+		if img.mode == 'RGBA':
+			background = Image.new('RGB', img.size, (255, 255, 255))
+			background.paste(img, mask=img.split()[3])
+			return background, fmt
+		return img.convert('RGB'), fmt
+	if fmt == "PNG" and img.mode != 'RGBA':
+		# PNG: Stelle sicher RGBA Mode (für Alpha-Kanal)
+		return img.convert('RGBA'), fmt
+	return img, fmt
+
+def generate_lsl_notecard(name: str, tiles_x: int, tiles_y: int, speed: float, effect_tokens: list[str], movement_token: str) -> str:
+	"""Inhalt der `<texturname>.notecard` für das LSL-Script (GUI-Export und Batch-Modus)"""
+	created_at = datetime.now().strftime("%Y-%m-%d")
+	effects = ", ".join(effect_tokens) if effect_tokens else "LOOP"
+	movement = movement_token if movement_token in {"SLIDE", "ROTATE", "SCALE"} else "SLIDE"
+	return f'''# OSSL2Gif {APP_VERSION}
+# Copyright (c) 2026 Manfred Zainhofer
+# Generated: {created_at}
+# Texture Notecard: {name}.notecard
+
+columns={tiles_x}
+rows={tiles_y}
+fps={speed}
+start=0.0
+effects={effects}
+movement={movement}
+face=ALL_SIDES
+animOn=TRUE
+'''
@@ -10,7 +10,8 @@ from PIL import Image, ImageTk
 import math
 from typing import Any, Optional
 from translations import tr
-from image_processing import calculate_optimal_grid, apply_effects
+from image_processing import calculate_optimal_grid
+from texture_engine import EffectConfig, apply_effect_config, parse_bg_color
 from logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -128,15 +129,7 @@ class TexturePreviewWindow:
 			)
 			
 			# Textur generieren (wie beim Export)
-			bg_color = self.app.bg_color
-			if bg_color.startswith('#'):
-				if len(bg_color) == 9:  # #RRGGBBAA
-					bg_rgba = tuple(int(bg_color[i:i+2], 16) for i in (1, 3, 5, 7))
-				else:  # #RRGGBB
-					rgb = tuple(int(bg_color[i:i+2], 16) for i in (1, 3, 5))
-					bg_rgba = rgb + (255,)
-			else:
-				bg_rgba = (0, 0, 0, 0)
+			bg_rgba = parse_bg_color(self.app.bg_color)
 			
 			# Erstelle Textur-Sheet
 			frame_size = 512 // max(self.tiles_x, self.tiles_y)
@@ -145,13 +138,14 @@ class TexturePreviewWindow:
 			
 			self.texture_image = Image.new("RGBA", (sheet_w, sheet_h), bg_rgba)
 			
-			# Frames platzieren
+			# Frames platzieren (Effekt-Einstellungen einmal lesen)
+			effects = EffectConfig.from_app(self.app, "texture")
 			for idx, frame in enumerate(self.app.gif_frames):
 				tx = idx % self.tiles_x
 				ty = idx // self.tiles_x
 				
 				# Frame mit Effekten
-				f = apply_effects(self.app, frame, prefix="texture")
+				f = apply_effect_config(frame, effects)
 				f = f.resize((frame_size, frame_size), Image.Resampling.LANCZOS)
 				
 				if f.mode != "RGBA":
@@ -4,15 +4,211 @@
 # OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
 ###
 
+from collections import deque
+from typing import Any, Callable
 import threading
-import queue
 import logging
 
 # Logging-Konfiguration für Threads (optional, falls nicht global gesetzt)
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s][Thread] %(message)s')
 
-# Globale Queues für Thread-Kommunikation
-frame_queue = queue.Queue()
-gif_queue = queue.Queue()      # Für GIF-Frame-Verarbeitung
-texture_queue = queue.Queue()  # Für Texture-Sheet-Verarbeitung
+logger = logging.getLogger(__name__)
 
+# Virtuelles Tk-Event, mit dem Worker den UI-Thread wecken
+DISPATCH_EVENT = "<<OSSL2GifDispatch>>"
+
+# Abfrageintervall, wenn Tcl ohne Thread-Unterstützung gebaut ist (kein Wecken aus Workern)
+DISPATCH_POLL_MS = 15
+
+def tcl_is_threaded(root: Any) -> bool:
+	"""True wenn der Tcl-Interpreter von `root` threaded gebaut ist (nur dann ist `event_generate` aus Workern sicher)"""
+	try:
+		tk = root.tk
+		if tk.call("info", "exists", "tcl_platform(threaded)"):
+			return bool(int(tk.call("set", "tcl_platform(threaded)")))
+		# Tcl 9 ist immer threaded und setzt die Variable nicht mehr
+		return float(tk.call("info", "tclversion")) >= 9
+	except Exception:
+		return False
+
+class UiDispatcher:
+	"""
+	Liefert Worker-Ergebnisse an den Tk-Thread – bei threaded Tcl ohne Polling.
+
+	Pro Kanal gibt es einen Slot mit dem jeweils neuesten Ergebnis (ältere,
+	noch nicht angezeigte werden überschrieben). Der erste `post()` nach einer
+	Auslieferung weckt den Tk-Thread genau einmal über ein virtuelles Event;
+	dort ruft `drain()` die Handler aller gefüllten Kanäle auf. Ist Tcl nicht
+	threaded gebaut, rufen Worker Tk gar nicht auf: dann prüft eine einzige
+	`after`-Schleife im Tk-Thread alle `DISPATCH_POLL_MS`, ob etwas ansteht.
+
+	`call_soon()` reiht dagegen beliebige Aufrufe verlustfrei (FIFO) ein – z.B.
+	als Executor für EventBus-Subscriber, die im Tk-Thread laufen müssen.
+
+	Nutzung:
+		dispatcher = UiDispatcher(self.root)                 # im Tk-Thread
+		dispatcher.register("texture_preview", on_preview)   # im Tk-Thread
+		dispatcher.post("texture_preview", image)            # aus beliebigem Thread
+	"""
+
+	def __init__(self, root: Any):
+		"""
+		Args:
+			root: Tk-Root (oder Widget) für das Weck-Event; muss im Tk-Thread erzeugt werden
+		"""
+		self.root = root
+		self._handlers: dict[str, Callable[[Any], None]] = {}
+		self._slots: dict[str, Any] = {}
+		self._calls: deque[Callable[[], Any]] = deque()
+		self._wakeup_pending = False
+		self._lock = threading.Lock()
+		self.threaded = tcl_is_threaded(root)
+		if self.threaded:
+			root.bind(DISPATCH_EVENT, self.drain, add="+")
+		else:
+			logger.info(f"Tcl is not threaded, polling UI dispatch every {DISPATCH_POLL_MS} ms")
+			root.after(DISPATCH_POLL_MS, self._poll)
+
+	def register(self, channel: str, handler: Callable[[Any], None]) -> None:
+		"""Setzt den Handler eines Kanals (wird im Tk-Thread mit dem Ergebnis aufgerufen)"""
+		with self._lock:
+			self._handlers[channel] = handler
+
+	def post(self, channel: str, value: Any) -> None:
+		"""
+		Legt `value` als neuestes Ergebnis von `channel` ab und weckt den Tk-Thread,
+		falls noch kein Wecken aussteht. Thread-sicher.
+		"""
+		with self._lock:
+			self._slots[channel] = value
+			if self._wakeup_pending:
+				return
+			self._wakeup_pending = True
+		self._wakeup()
+
+	def call_soon(self, func: Callable[[], Any]) -> None:
+		"""Führt `func` im Tk-Thread aus (Reihenfolge bleibt erhalten, nichts wird verworfen). Thread-sicher."""
+		with self._lock:
+			self._calls.append(func)
+			if self._wakeup_pending:
+				return
+			self._wakeup_pending = True
+		self._wakeup()
+
+	def _wakeup(self) -> None:
+		if not self.threaded:
+			# Die after-Schleife im Tk-Thread holt das Ergebnis ab
+			return
+		try:
+			# event_generate ist der thread-sichere Weg in die Tk-Ereignisschleife
+			self.root.event_generate(DISPATCH_EVENT, when="tail")
+		except Exception as e:
+			# Fenster geschlossen / Mainloop beendet – Ergebnis verfällt
+			logger.debug(f"UI dispatch wakeup failed: {type(e).__name__}: {e}")
+			with self._lock:
+				self._wakeup_pending = False
+
+	def _poll(self) -> None:
+		"""after-Schleife ohne Thread-Unterstützung in Tcl (Tk-Thread)"""
+		with self._lock:
+			pending = self._wakeup_pending
+		if pending:
+			self.drain()
+		try:
+			self.root.after(DISPATCH_POLL_MS, self._poll)
+		except Exception as e:
+			# Fenster geschlossen / Mainloop beendet
+			logger.debug(f"UI dispatch polling stopped: {type(e).__name__}: {e}")
+
+	def drain(self, event: Any = None) -> None:
+		"""Führt eingereihte Aufrufe aus und ruft für jeden gefüllten Kanal den Handler mit dem neuesten Ergebnis auf (Tk-Thread)."""
+		with self._lock:
+			slots, self._slots = self._slots, {}
+			calls, self._calls = self._calls, deque()
+			self._wakeup_pending = False
+			handlers = dict(self._handlers)
+		for func in calls:
+			try:
+				func()
+			except Exception as e:
+				logger.error(f"UI dispatch call failed: {type(e).__name__}: {e}", exc_info=True)
+		for channel, value in slots.items():
+			handler = handlers.get(channel)
+			if handler is None:
+				continue
+			try:
+				handler(value)
+			except Exception as e:
+				logger.error(f"UI dispatch handler for '{channel}' failed: {type(e).__name__}: {e}", exc_info=True)
+
+# Sammelfenster für Einstellungs-Änderungen (ca. ein Anzeige-Frame)
+DEFAULT_COALESCE_MS = 33
+
+class ChangeCoalescer:
+	"""
+	Bündelt Einstellungs-Änderungen zu einem Neuaufbau pro Frame-Intervall.
+
+	Tk-Variablen-Traces markieren nur Ziele ("gif", "texture"); die erste Markierung
+	plant einen einzigen `after`-Aufruf, alle weiteren innerhalb des Intervalls
+	werden mitgenommen. Beim Auslösen läuft jeder Handler höchstens einmal und
+	liest den dann aktuellen (zusammengeführten) Zustand der Variablen. Ein
+	Slider-Zug löst so höchstens einen Neuaufbau pro Intervall aus.
+
+	Nutzung:
+		coalescer = ChangeCoalescer(self.root)
+		coalescer.register("texture", self.show_texture)
+		var.trace_add('write', coalescer.trace_callback("texture"))
+
+	Nur im Tk-Thread verwenden.
+	"""
+
+	def __init__(self, root: Any, interval_ms: int = DEFAULT_COALESCE_MS):
+		self.root = root
+		self.interval_ms = interval_ms
+		self.flushes = 0
+		self._handlers: dict[str, Callable[[], None]] = {}
+		self._pending: set[str] = set()
+		self._after_id: Any = None
+
+	def register(self, target: str, handler: Callable[[], None]) -> None:
+		"""Setzt den Handler eines Ziels (Reihenfolge der Registrierung = Ausführungsreihenfolge)"""
+		self._handlers[target] = handler
+
+	def mark(self, *targets: str) -> None:
+		"""Merkt Ziele für den nächsten Neuaufbau vor und plant ihn, falls noch keiner ansteht"""
+		self._pending.update(targets)
+		if self._after_id is None:
+			self._after_id = self.root.after(self.interval_ms, self.flush)
+
+	def trace_callback(self, *targets: str) -> Callable[..., None]:
+		"""Callback für `Variable.trace_add('write', ...)`"""
+		return lambda *args: self.mark(*targets)
+
+	def discard(self, *targets: str) -> None:
+		"""Verwirft vorgemerkte Ziele (z.B. wenn sie gerade direkt aktualisiert wurden)"""
+		self._pending.difference_update(targets)
+
+	def flush(self) -> None:
+		"""Ruft die Handler aller vorgemerkten Ziele je einmal auf"""
+		self._after_id = None
+		pending, self._pending = self._pending, set()
+		if not pending:
+			return
+		self.flushes += 1
+		for target, handler in list(self._handlers.items()):
+			if target not in pending:
+				continue
+			try:
+				handler()
+			except Exception as e:
+				logger.error(f"Settings update for '{target}' failed: {type(e).__name__}: {e}", exc_info=True)
+
+	def cancel(self) -> None:
+		"""Verwirft alle vorgemerkten Ziele und den geplanten Aufruf"""
+		self._pending.clear()
+		if self._after_id is not None:
+			try:
+				self.root.after_cancel(self._after_id)
+			except Exception as e:
+				logger.debug(f"Could not cancel settings update: {type(e).__name__}: {e}")
+			self._after_id = None
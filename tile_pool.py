@@ -0,0 +1,197 @@
+###
+# tile_pool.py
+# Process pool for parallel tile processing with shared-memory frame transfer in OSSL2Gif
+# OSSL2Gif Version 2.0.0 © 2026 by Manfred Zainhofer
+###
+
+"""
+Verteilt die Kachel-Arbeit (Effekte + Einblenden in den Atlas) eines Sheets
+auf alle Kerne – beim Speichern aus der GUI (`get_tile_pool()`) und im
+Batch-Modus.
+
+Die Frames liegen in einem SharedMemory-Block, der Atlas in einem zweiten;
+Worker-Prozesse bekommen nur Namen, Offsets und die (kleinen, picklebaren)
+Einstellungen und schreiben ihre Kacheln direkt in den gemeinsamen Atlas.
+Kein Bild wird gepickelt. Jede Kachel gehört genau einem Worker, daher ist
+kein Locking nötig.
+
+Nutzung:
+	pool = TilePool(max_workers=32)
+	sheet = pool.compose(frames, spec, effects)
+	pool.shutdown()
+"""
+
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import multiprocessing
+from typing import Optional, Sequence
+from PIL import Image
+import os
+import threading
+import numpy as np
+from texture_engine import EffectConfig, SheetSpec, apply_effect_config, atlas_to_image, blend_cell, compose_sheet, new_atlas
+from effect_cache import EffectCache
+from perf import NULL_TIMER, StageTimer
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Unterhalb dieser Frame-Zahl lohnt sich der Prozess-Overhead nicht
+MIN_PARALLEL_TILES = 8
+
+# Aufträge pro Worker (kleinere Pakete gleichen ungleich teure Frames aus)
+CHUNKS_PER_WORKER = 4
+
+# (Kachel-Index, Byte-Offset im Frame-Block, Breite, Höhe)
+TileSlot = tuple[int, int, int, int]
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+	"""
+	Öffnet einen vorhandenen SharedMemory-Block ohne eigene Tracker-Anmeldung –
+	aufräumen (unlink) darf nur der Besitzer im Hauptprozess.
+	"""
+	try:
+		return shared_memory.SharedMemory(name=name, track=False)
+	except TypeError:
+		# Python < 3.13: Worker teilen sich den Resource-Tracker des Hauptprozesses,
+		# die doppelte Anmeldung ist dort harmlos
+		return shared_memory.SharedMemory(name=name)
+
+def _blend_tiles(src_buf: memoryview, atlas_buf: memoryview, spec: SheetSpec, effects: EffectConfig, tiles: Sequence[TileSlot]) -> None:
+	# Eigene Funktion: alle Views auf die Puffer sind beim Rücksprung freigegeben
+	width, height = spec.size
+	atlas = np.ndarray((height, width, 4), dtype=np.uint8, buffer=atlas_buf)
+	for index, offset, w, h in tiles:
+		src = np.ndarray((h, w, 4), dtype=np.uint8, buffer=src_buf, offset=offset)
+		blend_cell(atlas, spec, index, apply_effect_config(Image.fromarray(src), effects))
+
+def _compose_tiles(src_name: str, atlas_name: str, spec: SheetSpec, effects: EffectConfig, tiles: Sequence[TileSlot]) -> int:
+	"""Worker: bearbeitet `tiles` und schreibt sie in den gemeinsamen Atlas"""
+	src_shm = _attach(src_name)
+	try:
+		atlas_shm = _attach(atlas_name)
+		try:
+			src_buf, atlas_buf = src_shm.buf, atlas_shm.buf
+			assert src_buf is not None and atlas_buf is not None
+			_blend_tiles(src_buf, atlas_buf, spec, effects, tiles)
+		finally:
+			atlas_shm.close()
+	finally:
+		src_shm.close()
+	return len(tiles)
+
+def _frame_size(frames: Sequence[Image.Image], index: int) -> tuple[int, int]:
+	"""Frame-Größe, bei `LazyGifFrames` ohne zu dekodieren"""
+	frame_size = getattr(frames, 'frame_size', None)
+	if frame_size is not None:
+		size: tuple[int, int] = frame_size(index)
+		return size
+	return frames[index].size
+
+def _chunks(tiles: list[TileSlot], count: int) -> list[list[TileSlot]]:
+	"""Teilt die Kacheln in `count` zusammenhängende Pakete (benachbarte Zellen = benachbarter Speicher)"""
+	size = max(1, -(-len(tiles) // count))
+	return [tiles[i:i + size] for i in range(0, len(tiles), size)]
+
+class TilePool:
+	"""
+	Prozess-Pool für die Sheet-Komposition.
+
+	Der Executor wird beim ersten parallelen Auftrag gestartet; kleine Sheets
+	laufen ohne Prozesswechsel über `compose_sheet`.
+	"""
+
+	def __init__(self, max_workers: Optional[int] = None):
+		"""
+		Args:
+			max_workers: Anzahl Worker-Prozesse (Standard: alle Kerne)
+		"""
+		self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+		self._executor: Optional[ProcessPoolExecutor] = None
+		self._lock = threading.Lock()
+
+	def _get_executor(self) -> ProcessPoolExecutor:
+		with self._lock:
+			if self._executor is None:
+				# "spawn" statt fork(): der Pool startet im GUI-Prozess, dessen Threads
+				# (Tk, WorkerPool, Prefetch) beim Fork gehaltene Locks vererben würden
+				self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+				logger.info(f"TilePool started with {self.max_workers} processes")
+			return self._executor
+
+	def compose(self, frames: Sequence[Image.Image], spec: SheetSpec, effects: EffectConfig, cache: Optional[EffectCache] = None, timer: StageTimer = NULL_TIMER) -> Image.Image:
+		"""
+		Wie `compose_sheet`, aber Kacheln werden parallel in Worker-Prozessen bearbeitet.
+
+		Args:
+			cache: Nur für kleine Sheets im eigenen Prozess (wie `compose_sheet`)
+			timer: Optional – misst "decode" (Frames laden) und "compose" (parallele Kacheln)
+
+		Returns:
+			RGBA-Sheet in Größe `spec.size` (bitgleich zu `compose_sheet`)
+		"""
+		if self.max_workers < 2 or len(frames) < MIN_PARALLEL_TILES:
+			return compose_sheet(frames, spec, effects, cache=cache, timer=timer)
+		# Slots nur aus den Größen planen – dekodiert wird erst beim Kopieren,
+		# Frame für Frame (Lazy-/mmap-Store bleibt bei langen GIFs wirksam)
+		tiles: list[TileSlot] = []
+		offset = 0
+		for idx in range(len(frames)):
+			w, h = _frame_size(frames, idx)
+			tiles.append((idx, offset, w, h))
+			offset += w * h * 4
+		width, height = spec.size
+		src_shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+		try:
+			atlas_shm = shared_memory.SharedMemory(create=True, size=max(width * height * 4, 1))
+			try:
+				with timer.stage("decode"):
+					for idx, start, w, h in tiles:
+						frame = frames[idx]
+						slot = np.ndarray((h, w, 4), dtype=np.uint8, buffer=src_shm.buf, offset=start)
+						slot[...] = np.asarray(frame if frame.mode == "RGBA" else frame.convert("RGBA"))
+						del frame, slot
+				new_atlas(spec, atlas_shm.buf)
+				executor = self._get_executor()
+				chunks = _chunks(tiles, self.max_workers * CHUNKS_PER_WORKER)
+				with timer.stage("compose"):
+					futures = [executor.submit(_compose_tiles, src_shm.name, atlas_shm.name, spec, effects, chunk) for chunk in chunks]
+					wait(futures)
+					for future in futures:
+						future.result()
+					logger.debug(f"TilePool composed {len(tiles)} tiles in {len(chunks)} chunks")
+					# Kopie heraus, danach kann der gemeinsame Block freigegeben werden
+					atlas = np.ndarray((height, width, 4), dtype=np.uint8, buffer=atlas_shm.buf).copy()
+				return atlas_to_image(atlas)
+			finally:
+				atlas_shm.close()
+				atlas_shm.unlink()
+		finally:
+			src_shm.close()
+			src_shm.unlink()
+
+	def shutdown(self, wait: bool = True) -> None:
+		"""Beendet die Worker-Prozesse (falls gestartet)."""
+		with self._lock:
+			executor, self._executor = self._executor, None
+		if executor is not None:
+			logger.info(f"Shutting down TilePool (wait={wait})")
+			executor.shutdown(wait=wait)
+
+# Global singleton instance
+_tile_pool_instance: Optional[TilePool] = None
+
+def get_tile_pool() -> TilePool:
+	"""Gibt den globalen TilePool zurück (Prozesse aus config 'tile_workers', 0 = alle Kerne)"""
+	global _tile_pool_instance
+	if _tile_pool_instance is None:
+		from config_manager import get_config
+		_tile_pool_instance = TilePool(max_workers=int(get_config().get('tile_workers')) or None)
+	return _tile_pool_instance
+
+def shutdown_tile_pool() -> None:
+	"""Beendet die Worker-Prozesse des globalen TilePool (beim Programmende)"""
+	global _tile_pool_instance
+	if _tile_pool_instance is not None:
+		_tile_pool_instance.shutdown(wait=True)
+		_tile_pool_instance = None
@@ -5,102 +5,266 @@
 ###
 
 from typing import Callable, Optional, Any
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from enum import IntEnum
+import heapq
+import itertools
+import threading
 import logging
+from exceptions import TaskCancelledError
 
 logger = logging.getLogger(__name__)
 
+class TaskPriority(IntEnum):
+	"""Prioritäts-Spuren – kleinere Werte laufen zuerst"""
+	INTERACTIVE = 0   # Vorschau, direkte Reaktion auf Benutzereingaben
+	NORMAL = 1
+	BACKGROUND = 2    # Export, Prefetch – darf nie alle Worker belegen
+
+class CancellationToken:
+	"""
+	Kooperatives Abbruch-Signal einer Task.
+	Die Task prüft es zwischen Arbeitsschritten (z.B. zwischen Frames).
+	"""
+
+	def __init__(self) -> None:
+		self._event = threading.Event()
+
+	def cancel(self) -> None:
+		self._event.set()
+
+	@property
+	def cancelled(self) -> bool:
+		return self._event.is_set()
+
+	def raise_if_cancelled(self) -> None:
+		"""Wirft TaskCancelledError, wenn abgebrochen wurde"""
+		if self._event.is_set():
+			raise TaskCancelledError("Task cancelled")
+
+# Token für Code außerhalb des Pools (wird nie abgebrochen)
+_NEVER_CANCELLED = CancellationToken()
+_current = threading.local()
+
+def current_token() -> CancellationToken:
+	"""Abbruch-Token der Task, die im aktuellen Worker-Thread läuft"""
+	return getattr(_current, 'token', _NEVER_CANCELLED)
+
+@dataclass(order=True)
+class _Task:
+	priority: int
+	seq: int
+	name: str = field(compare=False)
+	func: Callable = field(compare=False)
+	args: tuple = field(compare=False)
+	kwargs: dict = field(compare=False)
+	future: Future = field(compare=False)
+	token: CancellationToken = field(compare=False)
+
 class WorkerPool:
 	"""
-	Effiziente Thread-Pool für Worker-Tasks.
+	Effiziente Thread-Pool für Worker-Tasks mit Prioritäten und Latest-Wins.
 	Vermeidet ständiges Erstellen/Löschen von neuen Threads.
-	
+
+	- Pro Task-Name läuft höchstens eine Task; eine neue Task ersetzt eine noch
+	  wartende ältere und bricht eine laufende kooperativ ab (`replace=True`)
+	- Höhere Priorität läuft zuerst; BACKGROUND-Tasks lassen immer einen Worker frei
+	- Laufende Tasks prüfen `current_token()` zwischen Arbeitsschritten
+
 	Nutzung:
 		pool = WorkerPool(max_workers=2)
-		future = pool.submit(_process_gif_frame_worker, self, frame_idx, ...)
+		future = pool.submit('texture_preview', _process_texture_worker, self, canvas_size, priority=TaskPriority.INTERACTIVE)
 		# Später abfragen: future.result(timeout=0.1)  # Non-blocking
 	"""
-	
+
 	def __init__(self, max_workers: int = 2):
 		"""
 		Args:
 			max_workers: Maximale Anzahl gleichzeitiger Worker-Threads
 		"""
 		self.max_workers = max_workers
-		self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="OSSL2Gif-Worker")
 		self.active_futures: dict[str, Future] = {}
+		self._queue: list[_Task] = []
+		self._pending: dict[str, _Task] = {}
+		self._running: dict[str, _Task] = {}
+		self._seq = itertools.count()
+		self._cond = threading.Condition()
+		self._shutdown = False
+		self._threads = [
+			threading.Thread(target=self._worker_loop, name=f"OSSL2Gif-Worker_{i}", daemon=True)
+			for i in range(max_workers)
+		]
+		for thread in self._threads:
+			thread.start()
 		logger.info(f"WorkerPool initialized with {max_workers} workers")
-	
-	def submit(self, task_name: str, func: Callable, *args: Any, **kwargs: Any) -> Future:
+
+	def submit(self, task_name: str, func: Callable, *args: Any, priority: int = TaskPriority.NORMAL, replace: bool = True, **kwargs: Any) -> Future:
 		"""
 		Submittet eine Task zum Pool.
-		
+
 		Args:
 			task_name: Eindeutiger Name für die Task (z.B. 'gif_frame_0', 'texture_preview')
 			func: Die zu execagutierende Funktion
+			priority: TaskPriority-Spur
+			replace: True = neueste Task gewinnt (ältere wartende wird verworfen,
+				laufende abgebrochen); False = bestehende Task behalten und zurückgeben
 			*args, **kwargs: Argumente für die Funktion
-		
+
 		Returns:
 			Future-Objekt zum Abfragen des Ergebnisses
 		"""
-		# Wenn bereits eine Task mit diesem Namen läuft, ignorieren (Rate-Limiting)
-		if task_name in self.active_futures:
-			existing = self.active_futures[task_name]
-			if not existing.done():
-				logger.debug(f"Task '{task_name}' already running, skipping")
-				return existing
-			else:
-				# Task ist fertig, kann gelöscht werden
-				del self.active_futures[task_name]
-		
-		future = self.executor.submit(func, *args, **kwargs)
-		self.active_futures[task_name] = future
-		logger.debug(f"Task '{task_name}' submitted to pool")
-		
-		# Cleanup wenn fertig
-		def cleanup(f):
-			if task_name in self.active_futures:
-				del self.active_futures[task_name]
-				logger.debug(f"Task '{task_name}' completed and cleaned up")
-		
-		future.add_done_callback(cleanup)
-		return future
-	
+		with self._cond:
+			if self._shutdown:
+				raise RuntimeError("WorkerPool is shut down")
+			queued = self._pending.get(task_name)
+			running = self._running.get(task_name)
+			if not replace:
+				existing = queued or running
+				if existing is not None:
+					logger.debug(f"Task '{task_name}' already scheduled, skipping")
+					return existing.future
+			if queued is not None:
+				# Wartende ältere Task verwerfen (bleibt als Leiche im Heap, wird übersprungen)
+				queued.future.cancel()
+				logger.debug(f"Task '{task_name}' replaced while queued")
+			if running is not None:
+				running.token.cancel()
+				logger.debug(f"Task '{task_name}' superseded while running, cancellation requested")
+			task = _Task(int(priority), next(self._seq), task_name, func, args, kwargs, Future(), CancellationToken())
+			self._pending[task_name] = task
+			self.active_futures[task_name] = task.future
+			heapq.heappush(self._queue, task)
+			self._cond.notify()
+		logger.debug(f"Task '{task_name}' submitted to pool (priority {priority})")
+		return task.future
+
+	def cancel(self, task_name: str) -> bool:
+		"""
+		Bricht eine wartende oder laufende Task ab.
+
+		Returns:
+			True wenn es eine Task mit diesem Namen gab
+		"""
+		with self._cond:
+			queued = self._pending.pop(task_name, None)
+			running = self._running.get(task_name)
+			if queued is not None:
+				queued.future.cancel()
+				self._forget(queued)
+			if running is not None:
+				running.token.cancel()
+			return queued is not None or running is not None
+
+	def _forget(self, task: _Task) -> None:
+		# Nur entfernen, wenn kein neueres Future unter dem Namen steht
+		if self.active_futures.get(task.name) is task.future:
+			del self.active_futures[task.name]
+
+	def _next_task(self) -> Optional[_Task]:
+		"""Nächste startbare Task (unter Lock): Name nicht belegt, Background-Limit beachtet"""
+		background_running = sum(1 for t in self._running.values() if t.priority >= TaskPriority.BACKGROUND)
+		background_limit = max(1, self.max_workers - 1)
+		blocked: list[_Task] = []
+		found: Optional[_Task] = None
+		while self._queue:
+			task = heapq.heappop(self._queue)
+			if task.future.cancelled():
+				continue
+			if task.name in self._running or (task.priority >= TaskPriority.BACKGROUND and background_running >= background_limit):
+				blocked.append(task)
+				continue
+			found = task
+			break
+		for task in blocked:
+			heapq.heappush(self._queue, task)
+		return found
+
+	def _worker_loop(self) -> None:
+		while True:
+			with self._cond:
+				task = self._next_task()
+				while task is None:
+					if self._shutdown:
+						return
+					self._cond.wait()
+					task = self._next_task()
+				if self._pending.get(task.name) is task:
+					del self._pending[task.name]
+				self._running[task.name] = task
+			if task.future.set_running_or_notify_cancel():
+				_current.token = task.token
+				try:
+					result = task.func(*task.args, **task.kwargs)
+				except TaskCancelledError as e:
+					logger.debug(f"Task '{task.name}' cancelled")
+					task.future.set_exception(e)
+				except BaseException as e:
+					task.future.set_exception(e)
+				else:
+					task.future.set_result(result)
+				finally:
+					_current.token = _NEVER_CANCELLED
+			with self._cond:
+				if self._running.get(task.name) is task:
+					del self._running[task.name]
+				self._forget(task)
+				logger.debug(f"Task '{task.name}' completed and cleaned up")
+				# Blockierte Tasks (gleicher Name, Background-Limit) können jetzt starten
+				self._cond.notify_all()
+
 	def wait_all(self, timeout: Optional[float] = None) -> bool:
 		"""
 		Wartet darauf, dass alle aktiven Tasks fertig sind.
-		
+
 		Args:
 			timeout: Maximalzeit zum Warten in Sekunden
-		
+
 		Returns:
 			True wenn all Tasks fertig, False bei Timeout
 		"""
-		if not self.active_futures:
+		# Worker ändern active_futures beim Start/Ende einer Task – nur unter Lock kopieren
+		with self._cond:
+			futures = list(self.active_futures.values())
+		if not futures:
 			return True
-		
+
 		try:
 			from concurrent.futures import wait, ALL_COMPLETED
-			futures = list(self.active_futures.values())
 			done, not_done = wait(futures, timeout=timeout, return_when=ALL_COMPLETED)
 			return len(not_done) == 0
 		except Exception as e:
 			logger.error(f"Error waiting for tasks: {e}", exc_info=False)
 			return False
-	
+
 	def shutdown(self, wait: bool = True) -> None:
 		"""
 		Sauberer Shutdown des Pools.
-		
+		Wartende Tasks werden verworfen, laufende kooperativ abgebrochen.
+
 		Args:
 			wait: Wenn True, warten bis alle Tasks fertig sind
 		"""
 		logger.info(f"Shutting down WorkerPool (wait={wait})")
-		self.executor.shutdown(wait=wait)
-	
+		with self._cond:
+			self._shutdown = True
+			for task in self._queue:
+				task.future.cancel()
+			self._queue.clear()
+			self._pending.clear()
+			for task in self._running.values():
+				task.token.cancel()
+			self._cond.notify_all()
+		if wait:
+			for thread in self._threads:
+				if thread is not threading.current_thread():
+					thread.join()
+
 	def get_active_count(self) -> int:
 		"""Returns number of currently active tasks"""
-		return len([f for f in self.active_futures.values() if not f.done()])
+		with self._cond:
+			futures = list(self.active_futures.values())
+		return len([f for f in futures if not f.done()])
 
 # Global singleton instance
 _pool_instance: Optional[WorkerPool] = None